@@ -0,0 +1,55 @@
+import logging
+from typing import Optional, Union
+from uuid import UUID
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.api.auth.models import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+# Columns needed to authorize a request; the password hash is never cached
+CACHED_USER_COLUMNS = ("id", "email", "role", "phone_number", "full_name", "fcm_token", "is_active")
+
+
+class UserCache:
+    """Short-lived cache of authenticated users so token checks don't hit the database."""
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+        self.key_prefix = "users:"
+        self.ttl = 120  # Keep short: role changes only take effect once the entry expires or is invalidated
+
+    async def get_user(self, user_id: Union[str, UUID]) -> Optional[User]:
+        """Get a detached User from cache; Redis errors are treated as a miss."""
+        try:
+            data = await self.redis.get(f"{self.key_prefix}{user_id}")
+        except RedisError:
+            logger.warning("User cache unavailable", exc_info=True)
+            return None
+
+        if not data:
+            return None
+
+        values = orjson.loads(data)
+        values["id"] = UUID(values["id"])
+        values["role"] = UserRole(values["role"])
+        return User(**values)
+
+    async def set_user(self, user: User, ttl: Optional[int] = None) -> None:
+        """Store the user's auth columns in cache."""
+        # orjson writes UUIDs and str enums natively
+        values = {column: getattr(user, column) for column in CACHED_USER_COLUMNS}
+        try:
+            await self.redis.set(f"{self.key_prefix}{user.id}", orjson.dumps(values), ex=ttl or self.ttl)
+        except RedisError:
+            logger.warning("User cache unavailable", exc_info=True)
+
+    async def invalidate_user(self, user_id: Union[str, UUID]) -> None:
+        """Remove a user from cache after it changes."""
+        try:
+            await self.redis.delete(f"{self.key_prefix}{user_id}")
+        except RedisError:
+            logger.warning("Failed to invalidate cached user %s", user_id, exc_info=True)
@@ -1,42 +1,114 @@
+from functools import wraps
+import inspect
+from typing import TYPE_CHECKING
+from uuid import UUID
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import security
+from app.api.auth.cache import CACHED_USER_COLUMNS, UserCache
+from app.api.auth.exceptions import InactiveUserError, InvalidTokenError
+from app.api.auth.models import User, UserRole
+from app.api.shared.database import get_db
+from app.api.shared.utils.cache import get_async_redis_client
 
-from app.api.auth.models import User
+if TYPE_CHECKING:
+    from app.api.auth.service import AuthService
 
 # OAuth2 scheme for token-based authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+async def get_auth_service(db: AsyncSession = Depends(get_db)) -> "AuthService":
+    """Get AuthService instance."""
+    # Imported here so modules that only need the current user don't pull in the auth service
+    from app.api.auth.service import AuthService
+
+    return AuthService(db)
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> User:
     """
     Dependency to get the current authenticated user from the token.
 
-    This is a placeholder implementation. In a real application, this would:
-    1. Validate the JWT token
-    2. Extract the user ID from the token
-    3. Fetch the user from the database
-    4. Return the user object
-
-    For now, this returns a mock user for demonstration.
+    The user is served from a short-lived Redis cache keyed by the token subject, so
+    most authenticated requests skip the ``users`` lookup entirely. Either way the
+    result is a detached ``User`` carrying only the auth columns (no password hash).
     """
-    # In a real implementation, this would validate the token and get the user
-    # For now, returning a placeholder user
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Not authenticated",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
     if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
+        raise credentials_exception
+
+    try:
+        payload = security.decode_token(token, security.ACCESS_TOKEN_TYPE)
+        user_id = UUID(payload["sub"])
+    except (InvalidTokenError, KeyError, ValueError):
+        raise credentials_exception
+
+    user_cache = UserCache(get_async_redis_client())
+    user = await user_cache.get_user(user_id)
+    if user is None:
+        # Core select of the cached columns: no password hash, no identity-map bookkeeping
+        result = await db.execute(
+            select(*(getattr(User, column) for column in CACHED_USER_COLUMNS)).where(User.id == user_id)
         )
+        row = result.mappings().one_or_none()
+        if row is None:
+            raise credentials_exception
+        user = User(**row)
+        await user_cache.set_user(user)
+
+    if not user.is_active:
+        raise InactiveUserError
+
+    return user
+
+
+# get_current_user already rejects deactivated accounts; routes that spell out the
+# requirement depend on this name
+get_current_active_user = get_current_user
+
+
+def check_permissions(*roles: UserRole):
+    """
+    Restrict an endpoint to users holding one of ``roles``.
+
+    The wrapped endpoint gains a ``current_user`` dependency, so it doesn't have to
+    declare one itself just to be authorized.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        needs_user = "current_user" in signature.parameters
+
+        @wraps(func)
+        async def wrapper(*args, current_user: User, **kwargs):
+            if current_user.role not in roles:
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+            if needs_user:
+                kwargs["current_user"] = current_user
+            return await func(*args, **kwargs)
+
+        if not needs_user:
+            # Expose current_user to FastAPI as a keyword-only dependency ahead of any **kwargs
+            parameters = [p for p in signature.parameters.values() if p.kind != inspect.Parameter.VAR_KEYWORD]
+            parameters.append(
+                inspect.Parameter(
+                    "current_user",
+                    inspect.Parameter.KEYWORD_ONLY,
+                    default=Depends(get_current_active_user),
+                    annotation=User,
+                )
+            )
+            parameters.extend(p for p in signature.parameters.values() if p.kind == inspect.Parameter.VAR_KEYWORD)
+            wrapper.__signature__ = signature.replace(parameters=parameters)
+        return wrapper
 
-    # This would be replaced by actual token validation and user lookup
-    # from uuid import uuid4
-    # from app.api.auth.models import User, UserRole
-    # return User(
-    #     id=uuid4(),
-    #     email="user@example.com",
-    #     full_name="Test User",
-    #     role=UserRole.CLIENT
-    # )
-
-    # For now, raise an exception to indicate this needs implementation
-    raise NotImplementedError("Authentication not implemented yet")
+    return decorator
@@ -1,8 +1,10 @@
+from datetime import UTC, datetime
 from enum import Enum
 from uuid import uuid4
 
-from sqlalchemy import Column, Enum as SQLAEnum, String
+from sqlalchemy import Boolean, Column, DateTime, Enum as SQLAEnum, ForeignKey, Integer, String
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import relationship
 
 from app.api.storage.base import Base
 
@@ -26,7 +28,37 @@ class User(Base):
     role = Column(SQLAEnum(UserRole), nullable=False, default=UserRole.CLIENT)
     phone_number = Column(String(20), nullable=True)
     full_name = Column(String(255), nullable=False)
+    fcm_token = Column(String(255), nullable=True)  # Firebase Cloud Messaging device token
+    firebase_uid = Column(String, unique=True, nullable=True)
+    is_active = Column(Boolean, nullable=True, default=True)
+    is_verified = Column(Boolean, nullable=True, default=False)
+    profile_photo = Column(String, nullable=True)
+    last_login = Column(DateTime, nullable=True)
 
-    # Relationships to be added in related models to prevent circular imports
-    # client_jobs - defined in Job model
-    # cleaner_jobs - defined in Job model
+    # Never loaded implicitly: touching these without selectinload(User.client_jobs) etc.
+    # raises instead of silently issuing a query per user
+    client_jobs = relationship("Job", foreign_keys="Job.client_id", back_populates="client", lazy="raise_on_sql")
+    cleaner_jobs = relationship("Job", foreign_keys="Job.cleaner_id", back_populates="cleaner", lazy="raise_on_sql")
+    notifications = relationship("Notification", back_populates="user", lazy="raise_on_sql")
+    payments = relationship("Payment", back_populates="user", lazy="raise_on_sql")
+    locations = relationship("Location", back_populates="user", lazy="raise_on_sql")
+    routes = relationship("Route", back_populates="user", lazy="raise_on_sql")
+
+
+class RefreshToken(Base):
+    """Issued refresh token, revoked once it has been exchanged."""
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    token = Column(String, unique=True, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    user_id = Column(PGUUID, ForeignKey("users.id", ondelete="CASCADE"))
+    is_revoked = Column(Boolean, default=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
+        nullable=False,
+    )
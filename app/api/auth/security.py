@@ -1,4 +1,7 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import time
 from typing import Dict, Optional, Union
 
 from firebase_admin import auth as firebase_auth
@@ -8,7 +11,19 @@ from passlib.context import CryptContext
 from app.api.auth.exceptions import InvalidTokenError
 from app.api.shared.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Values of the "type" claim
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+EMAIL_VERIFY_TOKEN_TYPE = "email_verify"
+PASSWORD_RESET_TOKEN_TYPE = "password_reset"
+_SESSION_TOKEN_TYPES = frozenset({ACCESS_TOKEN_TYPE, REFRESH_TOKEN_TYPE})
+
+# Token lifetimes in seconds; "exp" is written as an integer NumericDate
+_ACCESS_TOKEN_TTL_SECONDS = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_REFRESH_TOKEN_TTL_SECONDS = settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+# Existing hashes carry their own cost factor and keep verifying; new hashes use BCRYPT_ROUNDS
+pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=settings.BCRYPT_ROUNDS, deprecated="auto")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -21,33 +36,37 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password against hash in a worker thread; bcrypt would otherwise block the event loop."""
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Create password hash in a worker thread; bcrypt would otherwise block the event loop."""
+    return await asyncio.to_thread(get_password_hash, password)
+
+
 def create_access_token(
     subject: Union[str, int],
     role: str,
-    token_type: str = "access",
+    token_type: str = ACCESS_TOKEN_TYPE,
     firebase_uid: Optional[str] = None,
     expires_delta: Optional[timedelta] = None,
 ) -> Dict[str, str]:
     """Create JWT access token."""
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-
+    ttl = int(expires_delta.total_seconds()) if expires_delta else _ACCESS_TOKEN_TTL_SECONDS
     to_encode = {
         "sub": str(subject),
         "role": role,
         "type": token_type,
-        "exp": expire,
+        "exp": int(time.time()) + ttl,
     }
     if firebase_uid:
         to_encode["firebase_uid"] = firebase_uid
 
-    encoded_token = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
-
     return {
-        "token": encoded_token,
-        "expires_in": int((expire - datetime.now(timezone.utc)).total_seconds()),
+        "token": jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM),
+        "expires_in": ttl,
     }
 
 
@@ -57,40 +76,59 @@ def create_refresh_token(
     expires_delta: Optional[timedelta] = None,
 ) -> Dict[str, str]:
     """Create JWT refresh token."""
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-
+    ttl = int(expires_delta.total_seconds()) if expires_delta else _REFRESH_TOKEN_TTL_SECONDS
     to_encode = {
         "sub": str(subject),
         "role": role,
-        "type": "refresh",
-        "exp": expire,
+        "type": REFRESH_TOKEN_TYPE,
+        "exp": int(time.time()) + ttl,
     }
 
-    encoded_token = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
-
     return {
-        "token": encoded_token,
-        "expires_in": int((expire - datetime.now(timezone.utc)).total_seconds()),
+        "token": jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM),
+        "expires_in": ttl,
     }
 
 
-def decode_token(token: str) -> Dict:
-    """Decode and verify JWT token."""
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+@lru_cache(maxsize=4096)
+def _verify_signature(token: str) -> Dict:
+    """
+    Verify a token's signature once per token string.
 
-        if payload.get("type") not in ["access", "refresh"]:
-            raise InvalidTokenError("Invalid token type")
+    Expiry is deliberately not checked here so a cached payload can't outlive
+    its token; decode_token compares ``exp`` against the clock on every call.
+    """
+    return jwt.decode(
+        token,
+        settings.SECRET_KEY,
+        algorithms=[settings.JWT_ALGORITHM],
+        options={"verify_exp": False, "require": ["exp"]},
+    )
 
-        return payload
-    except jwt.ExpiredSignatureError:
-        raise InvalidTokenError("Token has expired")
+
+def decode_token(token: str, token_type: Optional[str] = None) -> Dict:
+    """
+    Decode and verify JWT token.
+
+    Args:
+        token: Encoded JWT
+        token_type: Required "type" claim; any session (access or refresh) token when omitted
+    """
+    try:
+        payload = dict(_verify_signature(token))
     except jwt.InvalidTokenError:
         raise InvalidTokenError("Invalid token")
 
+    if payload["exp"] <= time.time():
+        raise InvalidTokenError("Token has expired")
+    if token_type is None:
+        if payload.get("type") not in _SESSION_TOKEN_TYPES:
+            raise InvalidTokenError("Invalid token type")
+    elif payload.get("type") != token_type:
+        raise InvalidTokenError("Invalid token type")
+
+    return payload
+
 
 async def verify_firebase_token(token: str) -> dict:
     """Verify Firebase ID token."""
@@ -120,12 +158,12 @@ def get_token_data(token: str) -> Dict:
 def create_email_verification_token(email: str) -> str:
     """Create token for email verification."""
     expire = datetime.now(timezone.utc) + timedelta(hours=24)
-    to_encode = {"sub": email, "type": "email_verify", "exp": expire}
+    to_encode = {"sub": email, "type": EMAIL_VERIFY_TOKEN_TYPE, "exp": expire}
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
 
 def create_password_reset_token(email: str) -> str:
     """Create token for password reset."""
     expire = datetime.now(timezone.utc) + timedelta(hours=1)
-    to_encode = {"sub": email, "type": "password_reset", "exp": expire}
+    to_encode = {"sub": email, "type": PASSWORD_RESET_TOKEN_TYPE, "exp": expire}
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
@@ -2,9 +2,11 @@ from datetime import datetime, timedelta, timezone
 from typing import Dict, Optional, Tuple
 
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth import models, schemas, security
+from app.api.auth.cache import UserCache
 from app.api.auth.exceptions import (
     InactiveUserError,
     InvalidCredentialsError,
@@ -13,35 +15,45 @@ from app.api.auth.exceptions import (
     UserNotFoundError,
 )
 from app.api.shared.config import settings
-from app.api.shared.utils.cache import CacheManager
+from app.api.shared.database import violated_constraint
+from app.api.shared.utils.cache import CacheManager, get_async_redis_client
+
+USERS_EMAIL_INDEX = "ix_users_email"  # Unique index on users.email (migration 9b900a086fe3)
 
 
 class AuthService:
-    def __init__(self, db: AsyncSession, cache_manager: Optional[CacheManager] = None):
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache_manager: Optional[CacheManager] = None,
+        user_cache: Optional[UserCache] = None,
+    ):
         self.db = db
         self.cache = cache_manager
+        self.user_cache = user_cache or UserCache(get_async_redis_client())
 
     async def create_user(self, user_data: schemas.UserCreate, is_firebase_user: bool = False) -> models.User:
         """Create a new user."""
-        # Check if email already exists
-        if await self.get_user_by_email(str(user_data.email)):
-            raise UserAlreadyExistsError(str(user_data.email))
-
-        # Create new user
         user = models.User(**user_data.model_dump(exclude={"password"}))
         if not is_firebase_user:
-            user.hashed_password = security.get_password_hash(user_data.password)
+            user.hashed_password = await security.get_password_hash_async(user_data.password)
 
         self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
+        try:
+            # The unique email index rejects duplicates, so no pre-check SELECT is needed
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            if violated_constraint(e) == USERS_EMAIL_INDEX:
+                raise UserAlreadyExistsError(str(user_data.email)) from e
+            raise
         return user
 
     async def authenticate_user(self, email: str, password: str) -> models.User:
         """Authenticate user with email and password."""
         user = await self.get_user_by_email(str(email))
 
-        if not user or not security.verify_password(password, user.hashed_password):
+        if not user or not await security.verify_password_async(password, user.hashed_password):
             raise InvalidCredentialsError
 
         if not user.is_active:
@@ -110,9 +122,7 @@ class AuthService:
         """Refresh access token using refresh token."""
         try:
             # Verify and decode refresh token
-            payload = security.decode_token(refresh_token)
-            if payload.get("type") != "refresh":
-                raise InvalidTokenError("Invalid token type")
+            payload = security.decode_token(refresh_token, security.REFRESH_TOKEN_TYPE)
 
             # Get stored refresh token
             token_model = await self.get_refresh_token(refresh_token)
@@ -186,5 +196,6 @@ class AuthService:
             setattr(user, field, value)
 
         await self.db.commit()
-        await self.db.refresh(user)
+        # Authenticated requests read users from cache; drop the stale copy
+        await self.user_cache.invalidate_user(user_id)
         return user
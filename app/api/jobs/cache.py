@@ -1,4 +1,3 @@
-import json
 from typing import Optional
 from uuid import UUID
 
@@ -24,8 +23,7 @@ class JobCache:
             return None
 
         try:
-            job_dict = json.loads(data)
-            return JobResponse.model_validate(job_dict)
+            return JobResponse.model_validate_json(data)
         except Exception:
             # If deserialization fails, remove the invalid cache entry
             await self.redis.delete(key)
@@ -34,10 +32,9 @@ class JobCache:
     async def set_job(self, job: Job, ttl: Optional[int] = None) -> None:
         """Store a job in cache."""
         key = f"{self.key_prefix}{job.id}"
-        job_data = JobResponse.model_validate(job).model_dump()
-
-        # Store as JSON string
-        await self.redis.set(key, json.dumps(job_data), ex=ttl or self.ttl)
+        # Pydantic writes compact JSON and handles UUID/datetime fields; SET ... EX is one command
+        job_data = JobResponse.model_validate(job).model_dump_json()
+        await self.redis.set(key, job_data, ex=ttl or self.ttl)
 
     async def invalidate_job(self, job_id: UUID) -> None:
         """Remove a job from cache."""
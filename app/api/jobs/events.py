@@ -1,11 +1,15 @@
+import asyncio
 from enum import Enum
-from typing import Any, Dict, Optional
+import logging
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
 from app.api.jobs.models import JobStatus
 
+logger = logging.getLogger(__name__)
+
 
 class JobEventType(str, Enum):
     CREATED = "job_created"
@@ -118,61 +122,51 @@ class JobEventPublisher:
         2. WebSockets for real-time client updates
         3. Push notifications for mobile clients
 
+        The channels are independent, so they are delivered concurrently, and the
+        client and cleaner share a single multicast push instead of one send each.
+
         This implementation is a placeholder. In a real application,
         these would be implemented with actual external services.
         """
-        event_data = event.model_dump()
+        recipients = [event.client_id] + ([event.cleaner_id] if event.cleaner_id else [])
 
-        # Publish to Redis channel if available
+        deliveries = []
         if self.redis_client:
-            channel = f"jobs:{event.event_type}"
-            try:
-                await self.redis_client.publish(channel, event_data)
-            except Exception as e:
-                print(f"Error publishing to Redis: {e}")
-
-        # Send to WebSocket connections if available
+            deliveries.append(self._publish_to_redis(event))
         if self.websocket_manager:
-            try:
-                # Send to specific client connection
-                await self.websocket_manager.send_to_user(user_id=str(event.client_id), message=event_data)
+            deliveries.append(self._publish_to_websockets(event, recipients))
+        if self.notification_service:
+            deliveries.append(self._publish_push(event, recipients))
+        await asyncio.gather(*deliveries)
 
-                # If there's a cleaner, send to them too
-                if event.cleaner_id:
-                    await self.websocket_manager.send_to_user(user_id=str(event.cleaner_id), message=event_data)
-            except Exception as e:
-                print(f"Error sending WebSocket message: {e}")
+        logger.debug("Job Event: %s - Job: %s", event.event_type, event.job_id)
 
-        # Send push notification if service available
-        if self.notification_service:
-            try:
-                # Map event types to notification priorities
-                priority = (
-                    "high"
-                    if event.event_type in [JobEventType.STARTED, JobEventType.COMPLETED, JobEventType.CANCELED]
-                    else "normal"
-                )
-
-                # Send to client
-                await self.notification_service.send(
-                    user_id=event.client_id,
-                    title=f"Job {event.event_type.value.replace('_', ' ')}",
-                    body=event.data.get("message", "Job status updated"),
-                    data={"job_id": str(event.job_id), "type": event.event_type},
-                    priority=priority,
-                )
-
-                # Send to cleaner if applicable
-                if event.cleaner_id:
-                    await self.notification_service.send(
-                        user_id=event.cleaner_id,
-                        title=f"Job {event.event_type.value.replace('_', ' ')}",
-                        body=event.data.get("message", "Job status updated"),
-                        data={"job_id": str(event.job_id), "type": event.event_type},
-                        priority=priority,
-                    )
-            except Exception as e:
-                print(f"Error sending push notification: {e}")
-
-        # For development/debugging: print the event
-        print(f"Job Event: {event.event_type} - Job: {event.job_id}")
+    async def _publish_to_redis(self, event: JobEvent) -> None:
+        """Publish the event on its Redis channel."""
+        try:
+            await self.redis_client.publish(f"jobs:{event.event_type}", event.model_dump_json())
+        except Exception as e:
+            logger.warning("Error publishing to Redis: %s", e)
+
+    async def _publish_to_websockets(self, event: JobEvent, recipients: List[UUID]) -> None:
+        """Send the event to each recipient's WebSocket connection."""
+        event_data = event.model_dump()
+        results = await asyncio.gather(
+            *(self.websocket_manager.send_to_user(user_id=str(user_id), message=event_data) for user_id in recipients),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Error sending WebSocket message: %s", result)
+
+    async def _publish_push(self, event: JobEvent, recipients: List[UUID]) -> None:
+        """Queue one multicast push of the event to every recipient; the worker sends it."""
+        try:
+            await self.notification_service.enqueue_multi_notification(
+                user_ids=recipients,
+                title=f"Job {event.event_type.value.replace('_', ' ')}",
+                body=event.data.get("message", "Job status updated"),
+                data={"job_id": str(event.job_id), "type": event.event_type.value},
+            )
+        except Exception as e:
+            logger.warning("Error queueing push notification: %s", e)
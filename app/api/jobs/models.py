@@ -3,14 +3,18 @@ from enum import Enum
 from typing import List, Optional
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
-from sqlalchemy import Column, DateTime, Enum as SQLAEnum, Float, ForeignKey, Integer, String, Text
+from pydantic import BaseModel, Field, computed_field
+from sqlalchemy import CheckConstraint, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import relationship
 
 from app.api.storage.base import Base
 
 
+# Base rate per minute in KES
+BASE_RATE_PER_MINUTE = 4.50
+
+
 # Database Models
 class JobStatus(str, Enum):
     PENDING = "pending"  # Job created but no cleaner assigned
@@ -23,12 +27,32 @@ class JobStatus(str, Enum):
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Listings and state changes always filter by owner plus status
+        Index("ix_jobs_client_status", "client_id", "status"),
+        Index("ix_jobs_cleaner_status", "cleaner_id", "status"),
+        # Keyset pagination of job history; scanned backwards for newest-first pages
+        Index("ix_jobs_client_created_id", "client_id", "created_at", "id"),
+        Index("ix_jobs_cleaner_created_id", "cleaner_id", "created_at", "id"),
+        # A cleaner works one job at a time; enforced here so concurrent starts can't race
+        Index(
+            "uq_jobs_one_active_per_cleaner",
+            "cleaner_id",
+            unique=True,
+            postgresql_where=text(f"status = '{JobStatus.IN_PROGRESS.value}'"),
+        ),
+        # Plain text + CHECK instead of a PG enum: new states don't need ALTER TYPE
+        CheckConstraint(
+            "status IN (%s)" % ", ".join(f"'{status.value}'" for status in JobStatus),
+            name="ck_jobs_status",
+        ),
+    )
 
     id = Column(PGUUID, primary_key=True, default=uuid4)
     client_id = Column(PGUUID, ForeignKey("users.id"), nullable=False)
     cleaner_id = Column(PGUUID, ForeignKey("users.id"), nullable=True)  # Nullable until assigned
 
-    status = Column(SQLAEnum(JobStatus), default=JobStatus.PENDING, nullable=False)
+    status = Column(String(16), default=JobStatus.PENDING, nullable=False)
 
     # Location details
     address = Column(String(255), nullable=False)
@@ -55,6 +79,8 @@ class Job(Base):
     client = relationship("User", foreign_keys=[client_id], back_populates="client_jobs")
     cleaner = relationship("User", foreign_keys=[cleaner_id], back_populates="cleaner_jobs")
     schedule_slots = relationship("ScheduleSlot", back_populates="job", cascade="all, delete-orphan")
+    payments = relationship("Payment", back_populates="job", lazy="raise_on_sql")
+    routes = relationship("Route", back_populates="job", lazy="raise_on_sql")
 
 
 class ScheduleSlot(Base):
@@ -107,6 +133,12 @@ class JobCreate(BaseModel):
     description: Optional[str] = None
     estimated_duration_minutes: int = Field(..., gt=0)
 
+    @computed_field
+    @property
+    def base_cost(self) -> float:
+        """Quoted cost for the estimated duration."""
+        return self.estimated_duration_minutes * BASE_RATE_PER_MINUTE
+
 
 class JobUpdate(BaseModel):
     status: Optional[JobStatus] = None
@@ -139,6 +171,21 @@ class JobResponse(BaseModel):
         from_attributes = True
 
 
+class JobListItem(BaseModel):
+    """Summary row for job listings; only these columns are selected."""
+
+    id: UUID
+    client_id: UUID
+    cleaner_id: Optional[UUID] = None
+    status: JobStatus
+    city: str
+    estimated_duration_minutes: int
+    base_cost: float
+    final_cost: Optional[float] = None
+    created_at: datetime
+    scheduled_for: Optional[datetime] = None
+
+
 class ScheduleJobRequest(BaseModel):
     job_id: UUID
     slot_id: UUID
@@ -1,11 +1,17 @@
-from typing import List, Optional, Tuple
+from datetime import datetime
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import and_, desc, select
+from sqlalchemy import ColumnElement, and_, desc, func, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.api.jobs.models import Job, JobStatus, ScheduleSlot
+from app.api.jobs.models import Job, JobListItem, JobStatus, ScheduleSlot
+
+# Columns loaded for job listings, kept in step with the JobListItem schema
+LIST_COLUMNS = tuple(getattr(Job, name) for name in JobListItem.model_fields)
 
 
 class JobRepository:
@@ -15,7 +21,6 @@ class JobRepository:
     async def create_job(self, job: Job) -> Job:
         self.db_session.add(job)
         await self.db_session.commit()
-        await self.db_session.refresh(job)
         return job
 
     async def get_job_by_id(self, job_id: UUID, include_slots: bool = False) -> Optional[Job]:
@@ -27,57 +32,139 @@ class JobRepository:
         result = await self.db_session.execute(query)
         return result.scalars().first()
 
-    async def get_jobs_by_client(
-        self, client_id: UUID, status: Optional[JobStatus] = None, limit: int = 50, offset: int = 0
-    ) -> Tuple[List[Job], int]:
-        query = select(Job).where(Job.client_id == client_id)
-
-        if status:
-            query = query.where(Job.status == status)
-
-        # Get total count
-        count_query = select(Job.id).where(Job.client_id == client_id)
-        if status:
-            count_query = count_query.where(Job.status == status)
-        count_result = await self.db_session.execute(count_query)
-        total_count = len(count_result.scalars().all())
+    async def get_job_visible_to(
+        self, job_id: UUID, user_id: UUID, include_pending: bool = False, include_slots: bool = False
+    ) -> Optional[Job]:
+        """Get a job only if the user is its client or cleaner (or it is pending and open to them)."""
+        visibility = [Job.client_id == user_id, Job.cleaner_id == user_id]
+        if include_pending:
+            visibility.append(Job.status == JobStatus.PENDING)
+        query = select(Job).where(Job.id == job_id, or_(*visibility))
 
-        # Apply pagination
-        query = query.order_by(desc(Job.created_at)).limit(limit).offset(offset)
+        if include_slots:
+            query = query.options(selectinload(Job.schedule_slots))
 
         result = await self.db_session.execute(query)
-        return result.scalars().all(), total_count
+        return result.scalars().first()
 
-    async def get_jobs_by_cleaner(
-        self, cleaner_id: UUID, status: Optional[JobStatus] = None, limit: int = 50, offset: int = 0
-    ) -> Tuple[List[Job], int]:
-        query = select(Job).where(Job.cleaner_id == cleaner_id)
+    async def get_jobs_by_client(
+        self,
+        client_id: UUID,
+        status: Optional[JobStatus] = None,
+        limit: int = 50,
+        cursor: Optional[Tuple[datetime, UUID]] = None,
+        offset: Optional[int] = None,
+    ) -> Tuple[List[JobListItem], Optional[int]]:
+        return await self._get_jobs_page(Job.client_id == client_id, status, limit, cursor, offset)
 
+    async def get_jobs_by_cleaner(
+        self,
+        cleaner_id: UUID,
+        status: Optional[JobStatus] = None,
+        limit: int = 50,
+        cursor: Optional[Tuple[datetime, UUID]] = None,
+        offset: Optional[int] = None,
+    ) -> Tuple[List[JobListItem], Optional[int]]:
+        return await self._get_jobs_page(Job.cleaner_id == cleaner_id, status, limit, cursor, offset)
+
+    async def _get_jobs_page(
+        self,
+        owner_clause: ColumnElement[bool],
+        status: Optional[JobStatus],
+        limit: int,
+        cursor: Optional[Tuple[datetime, UUID]],
+        offset: Optional[int] = None,
+    ) -> Tuple[List[JobListItem], Optional[int]]:
+        """
+        Newest-first page of a user's jobs, plus the total matching count.
+
+        Only ``LIST_COLUMNS`` are selected and rows go straight into ``JobListItem``,
+        skipping ORM hydration, the identity map and the schedule slots.
+
+        Keyset pagination: ``cursor`` is the ``(created_at, id)`` of the last job on the
+        previous page, so the (owner, created_at, id) index seeks straight to the next page
+        instead of walking and discarding OFFSET rows. ``offset`` is still honoured for
+        clients written against the old offset pagination.
+
+        The count walks every matching row, so only requests without a cursor pay for it;
+        later cursor pages return None and clients keep the first page's total.
+        """
+        filters = [owner_clause]
         if status:
-            query = query.where(Job.status == status)
+            filters.append(Job.status == status)
 
-        # Get total count
-        count_query = select(Job.id).where(Job.cleaner_id == cleaner_id)
-        if status:
-            count_query = count_query.where(Job.status == status)
-        count_result = await self.db_session.execute(count_query)
-        total_count = len(count_result.scalars().all())
+        total_count = None
+        if cursor is None:
+            total_count = await self.db_session.scalar(select(func.count()).select_from(Job).where(*filters))
 
-        # Apply pagination
-        query = query.order_by(desc(Job.created_at)).limit(limit).offset(offset)
+        query = select(*LIST_COLUMNS).where(*filters)
+        if cursor:
+            query = query.where(tuple_(Job.created_at, Job.id) < cursor)
+        elif offset:
+            query = query.offset(offset)
+        query = query.order_by(desc(Job.created_at), desc(Job.id)).limit(limit)
 
         result = await self.db_session.execute(query)
-        return result.scalars().all(), total_count
+        return [JobListItem.model_validate(row) for row in result.mappings()], total_count
 
     async def update_job(self, job: Job) -> Job:
         await self.db_session.commit()
-        await self.db_session.refresh(job)
         return job
 
+    async def transition_job(
+        self, job_id: UUID, from_statuses: Iterable[JobStatus], values: Dict[str, Any], **conditions: Any
+    ) -> Optional[Job]:
+        """
+        Atomically move a job out of one of ``from_statuses``.
+
+        Runs a single ``UPDATE ... WHERE id AND status IN (...) [AND <conditions>] RETURNING``
+        so the status check, ownership check and write cannot race. Returns None when no
+        row matched; the caller decides whether that means 404, 403 or 400. Constraint
+        violations are rolled back and re-raised as ``IntegrityError``.
+        """
+        stmt = (
+            update(Job)
+            .where(Job.id == job_id, Job.status.in_(tuple(from_statuses)))
+            .where(*(getattr(Job, column) == value for column, value in conditions.items()))
+            .values(**values)
+            .returning(Job)
+            .execution_options(populate_existing=True)
+        )
+        try:
+            result = await self.db_session.execute(stmt)
+            job = result.scalar_one_or_none()
+            if job is None:
+                await self.db_session.rollback()
+                return None
+            await self.db_session.commit()
+        except IntegrityError:
+            await self.db_session.rollback()
+            raise
+        return job
+
+    async def accept_slot(self, job_id: UUID, slot_id: UUID) -> Optional[ScheduleSlot]:
+        """
+        Claim a pending slot for acceptance without committing.
+
+        The caller follows up with ``transition_job`` so both writes commit together.
+        """
+        stmt = (
+            update(ScheduleSlot)
+            .where(
+                ScheduleSlot.id == slot_id,
+                ScheduleSlot.job_id == job_id,
+                ScheduleSlot.is_accepted.is_(None),
+            )
+            .values(is_accepted=True)
+            .returning(ScheduleSlot)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db_session.execute(stmt)
+        return result.scalar_one_or_none()
+
     async def add_schedule_slot(self, slot: ScheduleSlot) -> ScheduleSlot:
         self.db_session.add(slot)
         await self.db_session.commit()
-        await self.db_session.refresh(slot)
         return slot
 
     async def get_slot_by_id(self, slot_id: UUID) -> Optional[ScheduleSlot]:
@@ -95,9 +182,29 @@ class JobRepository:
         result = await self.db_session.execute(query)
         return result.scalars().all()
 
-    async def get_available_jobs(self, limit: int = 50, offset: int = 0) -> List[Job]:
-        """Get jobs that are pending assignment to a cleaner."""
-        query = select(Job).where(Job.status == JobStatus.PENDING)
-        query = query.order_by(desc(Job.created_at)).limit(limit).offset(offset)
+    async def get_available_jobs(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        near: Optional[Tuple[float, float]] = None,
+    ) -> List[Job]:
+        """
+        Get jobs that are pending assignment to a cleaner.
+
+        With ``near=(latitude, longitude)`` the closest jobs come first. The ranking runs
+        in SQL, so only one page of rows is ever loaded.
+        """
+        query = select(Job).where(Job.status == JobStatus.PENDING).options(selectinload(Job.schedule_slots))
+        if near:
+            latitude, longitude = near
+            # Equirectangular approximation: fine for ranking at city scale and index-free to compute
+            lng_scale = math.cos(math.radians(latitude))
+            distance = (Job.latitude - latitude) * (Job.latitude - latitude) + (
+                (Job.longitude - longitude) * lng_scale
+            ) * ((Job.longitude - longitude) * lng_scale)
+            query = query.order_by(distance, desc(Job.created_at))
+        else:
+            query = query.order_by(desc(Job.created_at))
+        query = query.limit(limit).offset(offset)
         result = await self.db_session.execute(query)
         return result.scalars().all()
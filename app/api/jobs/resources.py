@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
@@ -27,6 +28,15 @@ def create_paginated_response(items, total, limit, offset):
     return {"items": items, "total": total, "limit": limit, "offset": offset}
 
 
+# Helper function for keyset-paginated responses; the last item is the cursor for the next page
+def create_cursor_response(items, total, limit):
+    next_cursor = None
+    if len(items) == limit:
+        last = items[-1]
+        next_cursor = {"after_created_at": last.created_at, "after_id": last.id}
+    return {"items": items, "total": total, "limit": limit, "next_cursor": next_cursor}
+
+
 @router.post("", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
 async def create_job(
     job_data: JobCreate, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
@@ -37,71 +47,90 @@ async def create_job(
     return job
 
 
-@router.get("/{job_id}", response_model=JobResponse)
-async def get_job(
-    job_id: UUID,
-    include_slots: bool = False,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
-    """Get a job by ID."""
-    service = JobService(db)
-    job = await service.get_job(job_id, include_slots)
-
-    # Only client, assigned cleaner, or admins can view job details
-    if current_user.id != job.client_id and current_user.id != job.cleaner_id and current_user.role != UserRole.ADMIN:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this job")
-
-    return job
-
-
 @router.get("")
 async def list_jobs(
     job_status: Optional[JobStatus] = None,
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    offset: Optional[int] = Query(None, ge=0, deprecated=True),
+    after_created_at: Optional[datetime] = None,
+    after_id: Optional[UUID] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """List jobs for the current user based on their role."""
+    """List jobs for the current user based on their role, newest first.
+
+    Pass the ``next_cursor`` values from the previous page as ``after_created_at`` and
+    ``after_id`` to fetch the next one; ``total`` is only counted for the first page.
+    ``offset`` still returns the old offset-paginated response, but is deprecated.
+    """
+    if (after_created_at is None) != (after_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="after_created_at and after_id must be given together",
+        )
+    cursor = (after_created_at, after_id) if after_created_at is not None else None
+    if cursor and offset is not None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Use either a cursor or offset, not both"
+        )
+
     service = JobService(db)
 
     if current_user.role == UserRole.CLIENT:
         jobs, total = await service.get_client_jobs(
-            client_id=current_user.id, status=job_status, limit=limit, offset=offset
+            client_id=current_user.id, status=job_status, limit=limit, cursor=cursor, offset=offset
         )
-        return create_paginated_response(jobs, total, limit, offset)
     elif current_user.role == UserRole.CLEANER:
         jobs, total = await service.get_cleaner_jobs(
-            cleaner_id=current_user.id, status=job_status, limit=limit, offset=offset
+            cleaner_id=current_user.id, status=job_status, limit=limit, cursor=cursor, offset=offset
         )
-        return create_paginated_response(jobs, total, limit, offset)
     elif current_user.role == UserRole.ADMIN:
         # For admins, return all jobs or implement admin-specific filtering
         # This is simplified and should be implemented based on requirements
         raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Admin job listing not implemented")
+    else:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to list jobs")
 
-    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to list jobs")
+    if offset is not None:
+        return create_paginated_response(jobs, total, limit, offset)
+    return create_cursor_response(jobs, total, limit)
 
 
 @router.get("/available")
 async def list_available_jobs(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    latitude: Optional[float] = Query(None, ge=-90, le=90),
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """List jobs available for cleaners to accept."""
+    """List jobs available for cleaners to accept, nearest first when the cleaner's position is given."""
     if current_user.role != UserRole.CLEANER:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only cleaners can view available jobs")
 
     service = JobService(db)
-    jobs = await service.get_available_jobs(limit=limit, offset=offset)
+    near = (latitude, longitude) if latitude is not None and longitude is not None else None
+    jobs = await service.get_available_jobs(limit=limit, offset=offset, near=near)
     # For available jobs, we don't have a total count method implemented yet
     # Using len(jobs) as a simplification
     return create_paginated_response(jobs, len(jobs), limit, offset)
 
 
+# Declared after the static GET paths so "/available" isn't captured as a job_id
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: UUID,
+    include_slots: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get a job by ID."""
+    service = JobService(db)
+    # Only the client, assigned cleaner, admins, or cleaners browsing pending jobs can view details
+    return await service.get_job_for_user(job_id, current_user.id, current_user.role, include_slots)
+
+
 @router.post("/schedule-slot", response_model=ScheduleSlotResponse)
 async def propose_schedule_slot(
     slot_data: ScheduleSlotCreate,
@@ -1,24 +1,60 @@
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from types import MappingProxyType
+from typing import FrozenSet, List, Mapping, NoReturn, Optional, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException
+from sqlalchemy import ColumnElement, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.jobs.models import Job, JobCreate, JobStatus, ScheduleSlot, ScheduleSlotCreate
+from app.api.auth.models import UserRole
+from app.api.jobs.models import (
+    BASE_RATE_PER_MINUTE,
+    Job,
+    JobCreate,
+    JobListItem,
+    JobStatus,
+    ScheduleSlot,
+    ScheduleSlotCreate,
+)
 from app.api.jobs.repository import JobRepository
+from app.api.shared.database import violated_constraint
+
+# Allowed status changes, built once at import. Anything short of COMPLETED/PAID can still be
+# canceled, and canceling or rescheduling again is a no-op rather than an error.
+VALID_TRANSITIONS: Mapping[JobStatus, FrozenSet[JobStatus]] = MappingProxyType(
+    {
+        JobStatus.PENDING: frozenset({JobStatus.SCHEDULED, JobStatus.CANCELED}),
+        JobStatus.SCHEDULED: frozenset({JobStatus.SCHEDULED, JobStatus.IN_PROGRESS, JobStatus.CANCELED}),
+        JobStatus.IN_PROGRESS: frozenset({JobStatus.COMPLETED, JobStatus.CANCELED}),
+        JobStatus.COMPLETED: frozenset({JobStatus.PAID}),
+        JobStatus.PAID: frozenset(),
+        JobStatus.CANCELED: frozenset({JobStatus.CANCELED}),
+    }
+)
+
+# The same table inverted: statuses a job may be in to move into each target status
+_TRANSITION_SOURCES: Mapping[JobStatus, FrozenSet[JobStatus]] = MappingProxyType(
+    {
+        target: frozenset(source for source, targets in VALID_TRANSITIONS.items() if target in targets)
+        for target in JobStatus
+    }
+)
+
+# Overtime is billed at the base rate plus 20%
+EXTRA_TIME_PREMIUM = 1.2
+
+# Partial unique index on jobs in progress (see Job.__table_args__)
+ONE_ACTIVE_JOB_PER_CLEANER_INDEX = "uq_jobs_one_active_per_cleaner"
 
 
 class JobService:
     def __init__(self, db_session: AsyncSession):
         self.repository = JobRepository(db_session)
-        # Base rate per minute in KES
-        self.base_rate_per_minute = 4.50
+        self.base_rate_per_minute = BASE_RATE_PER_MINUTE
 
     async def create_job(self, job_data: JobCreate, client_id: UUID) -> Job:
-        # Calculate base cost based on estimated duration
-        base_cost = self._calculate_base_cost(job_data.estimated_duration_minutes)
-
         # Create job entity
         job = Job(
             client_id=client_id,
@@ -28,16 +64,12 @@ class JobService:
             longitude=job_data.longitude,
             description=job_data.description,
             estimated_duration_minutes=job_data.estimated_duration_minutes,
-            base_cost=base_cost,
+            base_cost=job_data.base_cost,
             status=JobStatus.PENDING,
         )
 
         return await self.repository.create_job(job)
 
-    def _calculate_base_cost(self, duration_minutes: int) -> float:
-        """Calculate the base cost of a job based on estimated duration."""
-        return duration_minutes * self.base_rate_per_minute
-
     async def get_job(self, job_id: UUID, include_slots: bool = False) -> Job:
         """Get a job by its ID."""
         job = await self.repository.get_job_by_id(job_id, include_slots)
@@ -45,18 +77,47 @@ class JobService:
             raise HTTPException(status_code=404, detail="Job not found")
         return job
 
+    async def get_job_for_user(self, job_id: UUID, user_id: UUID, role: UserRole, include_slots: bool = False) -> Job:
+        """
+        Get a job the user is allowed to see.
+
+        Access is part of the query, so jobs the user can't see are reported as
+        not found rather than forbidden.
+        """
+        if role == UserRole.ADMIN:
+            return await self.get_job(job_id, include_slots)
+
+        job = await self.repository.get_job_visible_to(
+            job_id, user_id, include_pending=role == UserRole.CLEANER, include_slots=include_slots
+        )
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
     async def get_client_jobs(
-        self, client_id: UUID, status: Optional[JobStatus] = None, limit: int = 50, offset: int = 0
-    ) -> Tuple[List[Job], int]:
-        """Get all jobs for a client, with optional status filter."""
-        return await self.repository.get_jobs_by_client(client_id=client_id, status=status, limit=limit, offset=offset)
+        self,
+        client_id: UUID,
+        status: Optional[JobStatus] = None,
+        limit: int = 50,
+        cursor: Optional[Tuple[datetime, UUID]] = None,
+        offset: Optional[int] = None,
+    ) -> Tuple[List[JobListItem], Optional[int]]:
+        """Get a page of a client's jobs, newest first, with optional status filter."""
+        return await self.repository.get_jobs_by_client(
+            client_id=client_id, status=status, limit=limit, cursor=cursor, offset=offset
+        )
 
     async def get_cleaner_jobs(
-        self, cleaner_id: UUID, status: Optional[JobStatus] = None, limit: int = 50, offset: int = 0
-    ) -> Tuple[List[Job], int]:
-        """Get all jobs for a cleaner, with optional status filter."""
+        self,
+        cleaner_id: UUID,
+        status: Optional[JobStatus] = None,
+        limit: int = 50,
+        cursor: Optional[Tuple[datetime, UUID]] = None,
+        offset: Optional[int] = None,
+    ) -> Tuple[List[JobListItem], Optional[int]]:
+        """Get a page of a cleaner's jobs, newest first, with optional status filter."""
         return await self.repository.get_jobs_by_cleaner(
-            cleaner_id=cleaner_id, status=status, limit=limit, offset=offset
+            cleaner_id=cleaner_id, status=status, limit=limit, cursor=cursor, offset=offset
         )
 
     async def propose_schedule_slot(
@@ -96,145 +157,115 @@ class JobService:
 
         return await self.repository.add_schedule_slot(slot)
 
-    async def accept_schedule_slot(self, job_id: UUID, slot_id: UUID, client_id: UUID, cleaner_id: UUID) -> Job:
-        """Accept a proposed time slot and assign the cleaner to the job."""
-        job = await self.repository.get_job_by_id(job_id, include_slots=True)
+    async def _raise_transition_error(
+        self, job_id: UUID, action: str, owner_field: Optional[str] = None, owner_id: Optional[UUID] = None
+    ) -> NoReturn:
+        """Work out why a conditional status update matched no row and raise accordingly."""
+        job = await self.repository.get_job_by_id(job_id)
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
+        if owner_field and getattr(job, owner_field) != owner_id:
+            raise HTTPException(status_code=403, detail=f"Not authorized to {action} this job")
+        raise HTTPException(status_code=400, detail=f"Cannot {action} a job with status {job.status}")
 
-        # Verify client ownership
-        if job.client_id != client_id:
-            raise HTTPException(status_code=403, detail="Not authorized to modify this job")
-
-        # Find the slot
-        slot = None
-        for s in job.schedule_slots:
-            if s.id == slot_id:
-                slot = s
-                break
-
+    async def accept_schedule_slot(self, job_id: UUID, slot_id: UUID, client_id: UUID, cleaner_id: UUID) -> Job:
+        """Accept a proposed time slot and assign the cleaner to the job."""
+        slot = await self.repository.accept_slot(job_id, slot_id)
         if not slot:
-            raise HTTPException(status_code=404, detail="Schedule slot not found")
-
-        if slot.is_accepted is not None:
+            job = await self.repository.get_job_by_id(job_id)
+            if not job:
+                raise HTTPException(status_code=404, detail="Job not found")
+            if job.client_id != client_id:
+                raise HTTPException(status_code=403, detail="Not authorized to modify this job")
+            existing = await self.repository.get_slot_by_id(slot_id)
+            if not existing or existing.job_id != job_id:
+                raise HTTPException(status_code=404, detail="Schedule slot not found")
             raise HTTPException(status_code=400, detail="This slot has already been processed")
 
-        # Update the slot and job
-        slot.is_accepted = True
-        job.cleaner_id = cleaner_id
-        job.status = JobStatus.SCHEDULED
-        job.scheduled_for = slot.start_time
-
-        return await self.repository.update_job(job)
-
-    async def start_job(self, job_id: UUID, cleaner_id: UUID) -> Job:
-        """Mark a job as started by the cleaner."""
-        job = await self.repository.get_job_by_id(job_id)
+        # Commits together with the slot claim above
+        job = await self.repository.transition_job(
+            job_id,
+            _TRANSITION_SOURCES[JobStatus.SCHEDULED],
+            {"cleaner_id": cleaner_id, "status": JobStatus.SCHEDULED, "scheduled_for": slot.start_time},
+            client_id=client_id,
+        )
         if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-
-        # Verify cleaner assignment
-        if job.cleaner_id != cleaner_id:
-            raise HTTPException(status_code=403, detail="Not authorized to start this job")
-
-        # Validate job status
-        if job.status != JobStatus.SCHEDULED:
-            raise HTTPException(status_code=400, detail=f"Cannot start a job with status {job.status}")
-
-        # Update job status
-        job.status = JobStatus.IN_PROGRESS
-        job.started_at = datetime.now(timezone.utc)
+            await self._raise_transition_error(job_id, "modify", "client_id", client_id)
+        return job
 
-        return await self.repository.update_job(job)
+    async def start_job(self, job_id: UUID, cleaner_id: UUID) -> Job:
+        """
+        Mark a job as started by the cleaner.
 
-    async def complete_job(self, job_id: UUID, cleaner_id: UUID, actual_duration_minutes: int) -> Job:
-        """Mark a job as completed by the cleaner."""
-        job = await self.repository.get_job_by_id(job_id)
+        The partial unique index on in-progress jobs rejects a second active job for the
+        same cleaner, so there is no separate lookup before the update.
+        """
+        try:
+            job = await self.repository.transition_job(
+                job_id,
+                _TRANSITION_SOURCES[JobStatus.IN_PROGRESS],
+                {"status": JobStatus.IN_PROGRESS, "started_at": datetime.now(timezone.utc)},
+                cleaner_id=cleaner_id,
+            )
+        except IntegrityError as e:
+            if violated_constraint(e) != ONE_ACTIVE_JOB_PER_CLEANER_INDEX:
+                raise
+            raise HTTPException(status_code=409, detail="Cleaner already has an active job") from None
         if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-
-        # Verify cleaner assignment
-        if job.cleaner_id != cleaner_id:
-            raise HTTPException(status_code=403, detail="Not authorized to complete this job")
-
-        # Validate job status
-        if job.status != JobStatus.IN_PROGRESS:
-            raise HTTPException(status_code=400, detail=f"Cannot complete a job with status {job.status}")
-
-        # Validate duration is reasonable
-        if not job.started_at:
-            raise HTTPException(status_code=500, detail="Job started_at timestamp missing")
-
-        # Calculate the actual time elapsed since job start
-        elapsed_minutes = (datetime.now(timezone.utc) - job.started_at).total_seconds() / 60
-
-        # Allow some flexibility in reported duration, but flag large discrepancies
-        # This could be refined with business rules
-        if abs(actual_duration_minutes - elapsed_minutes) > 30:  # 30 min discrepancy
-            # Could log this for review instead of failing
-            pass
-
-        # Calculate final cost based on actual duration
-        final_cost = self._calculate_final_cost(job.base_cost, actual_duration_minutes, job.estimated_duration_minutes)
+            await self._raise_transition_error(job_id, "start", "cleaner_id", cleaner_id)
+        return job
 
-        # Update job
-        job.status = JobStatus.COMPLETED
-        job.completed_at = datetime.now(timezone.utc)
-        job.actual_duration_minutes = actual_duration_minutes
-        job.final_cost = final_cost
+    async def complete_job(self, job_id: UUID, cleaner_id: UUID, actual_duration_minutes: int) -> Job:
+        """
+        Mark a job as completed by the cleaner.
 
-        return await self.repository.update_job(job)
+        A single UPDATE ... RETURNING: status and assignment are checked in the WHERE
+        clause and the final cost is computed from the row's own base cost and estimate.
+        """
+        job = await self.repository.transition_job(
+            job_id,
+            _TRANSITION_SOURCES[JobStatus.COMPLETED],
+            {
+                "status": JobStatus.COMPLETED,
+                "completed_at": datetime.now(timezone.utc),
+                "actual_duration_minutes": actual_duration_minutes,
+                "final_cost": self._final_cost_expression(actual_duration_minutes),
+            },
+            cleaner_id=cleaner_id,
+        )
+        if not job:
+            await self._raise_transition_error(job_id, "complete", "cleaner_id", cleaner_id)
+        return job
 
-    def _calculate_final_cost(self, base_cost: float, actual_minutes: int, estimated_minutes: int) -> float:
+    def _final_cost_expression(self, actual_minutes: int) -> ColumnElement[float]:
         """
-        Calculate the final cost of a job.
+        SQL expression for the final cost of a job.
         For jobs that take longer than estimated, add charges for the extra time.
         """
-        if actual_minutes <= estimated_minutes:
-            return base_cost
-
-        # Calculate extra time cost
-        extra_minutes = actual_minutes - estimated_minutes
-        extra_cost = extra_minutes * self.base_rate_per_minute * 1.2  # 20% premium for extra time
-
-        return base_cost + extra_cost
+        extra_minutes = func.greatest(actual_minutes - Job.estimated_duration_minutes, 0)
+        return Job.base_cost + extra_minutes * (self.base_rate_per_minute * EXTRA_TIME_PREMIUM)
 
     async def mark_job_paid(self, job_id: UUID) -> Job:
         """Mark a job as paid."""
-        job = await self.repository.get_job_by_id(job_id)
+        job = await self.repository.transition_job(
+            job_id, _TRANSITION_SOURCES[JobStatus.PAID], {"status": JobStatus.PAID}
+        )
         if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-
-        # Validate job status
-        if job.status != JobStatus.COMPLETED:
-            raise HTTPException(status_code=400, detail=f"Cannot mark as paid a job with status {job.status}")
-
-        # Update job status
-        job.status = JobStatus.PAID
-
-        return await self.repository.update_job(job)
+            await self._raise_transition_error(job_id, "mark as paid")
+        return job
 
     async def cancel_job(self, job_id: UUID, user_id: UUID, is_client: bool) -> Job:
         """Cancel a job."""
-        job = await self.repository.get_job_by_id(job_id)
+        owner_field = "client_id" if is_client else "cleaner_id"
+        job = await self.repository.transition_job(
+            job_id, _TRANSITION_SOURCES[JobStatus.CANCELED], {"status": JobStatus.CANCELED}, **{owner_field: user_id}
+        )
         if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-
-        # Verify authorization
-        if is_client and job.client_id != user_id:
-            raise HTTPException(status_code=403, detail="Not authorized to cancel this job")
-        elif not is_client and job.cleaner_id != user_id:
-            raise HTTPException(status_code=403, detail="Not authorized to cancel this job")
-
-        # Validate job status - can't cancel completed or paid jobs
-        if job.status in [JobStatus.COMPLETED, JobStatus.PAID]:
-            raise HTTPException(status_code=400, detail=f"Cannot cancel a job with status {job.status}")
-
-        # Update job status
-        job.status = JobStatus.CANCELED
-
-        return await self.repository.update_job(job)
+            await self._raise_transition_error(job_id, "cancel", owner_field, user_id)
+        return job
 
-    async def get_available_jobs(self, limit: int = 50, offset: int = 0) -> List[Job]:
-        """Get jobs that are available for cleaners to pick up."""
-        return await self.repository.get_available_jobs(limit, offset)
+    async def get_available_jobs(
+        self, limit: int = 50, offset: int = 0, near: Optional[Tuple[float, float]] = None
+    ) -> List[Job]:
+        """Get jobs that are available for cleaners to pick up, nearest first when a location is given."""
+        return await self.repository.get_available_jobs(limit, offset, near)
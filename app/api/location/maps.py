@@ -11,17 +11,30 @@ from app.api.location.core import (
 )
 from app.api.shared.config import settings
 from app.api.shared.exceptions import ExternalServiceError
+from app.api.shared.utils.cache import CacheManager, get_async_redis_client
+
+# Cache keys snap coordinates to 4 decimal places (~11 m), so a stationary device hits one entry
+CACHE_SNAP_DECIMALS = 4
+# Addresses rarely change; routes depend on traffic and go stale sooner
+GEOCODE_CACHE_TTL_SECONDS = 86400
+ROUTE_CACHE_TTL_SECONDS = 3600
+
+
+def _snap(coords: Coordinates) -> str:
+    """Cache key part for a coordinate snapped to the cache grid."""
+    return f"{coords.latitude:.{CACHE_SNAP_DECIMALS}f},{coords.longitude:.{CACHE_SNAP_DECIMALS}f}"
 
 
 class GoogleMapsService:
     """Service for interacting with Google Maps APIs."""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[CacheManager] = None):
         """Initialize Google Maps client."""
         try:
             self.client = googlemaps.Client(key=settings.GOOGLE_MAPS_API_KEY)
         except Exception as e:
             raise ExternalServiceError(f"Failed to initialize Google Maps client: {e!s}")
+        self.cache = cache or CacheManager(get_async_redis_client(decode_responses=False), prefix="maps")
 
     async def geocode_address(self, address: str) -> Coordinates:
         """Convert address to coordinates."""
@@ -35,23 +48,45 @@ class GoogleMapsService:
         except Exception as e:
             raise ExternalServiceError(f"Geocoding failed: {e!s}")
 
-    async def reverse_geocode(self, coords: Coordinates) -> str:
-        """Convert coordinates to address."""
+    async def reverse_geocode(self, coords: Coordinates, use_cache: bool = True) -> str:
+        """
+        Convert coordinates to address.
+
+        Results are cached per snapped coordinate unless ``use_cache`` is False.
+        """
+        cache_key = f"geocode:{_snap(coords)}"
+        if use_cache:
+            address = await self.cache.get(cache_key)
+            if address is not None:
+                return address
+
         try:
             result = self.client.reverse_geocode(coords.to_tuple())
-            if not result:
-                return ""
-            return result[0]["formatted_address"]
+            address = result[0]["formatted_address"] if result else ""
         except Exception as e:
             raise ExternalServiceError(f"Reverse geocoding failed: {e!s}")
 
+        if use_cache:
+            await self.cache.set(cache_key, address, GEOCODE_CACHE_TTL_SECONDS)
+        return address
+
     async def calculate_route(
         self,
         origin: Coordinates,
         destination: Coordinates,
         departure_time: Optional[datetime] = None,
     ) -> RouteInfo:
-        """Calculate route between two points."""
+        """
+        Calculate route between two points.
+
+        Routes without a departure time are cached per snapped origin and destination.
+        """
+        cache_key = f"route:{_snap(origin)}:{_snap(destination)}" if departure_time is None else None
+        if cache_key:
+            route_info = await self.cache.get(cache_key)
+            if route_info is not None:
+                return route_info
+
         try:
             result = self.client.directions(
                 origin=origin.to_tuple(),
@@ -78,7 +113,7 @@ class GoogleMapsService:
                 for step in leg["steps"]
             ]
 
-            return RouteInfo(
+            route_info = RouteInfo(
                 distance=leg["distance"]["value"],
                 duration=leg["duration"]["value"],
                 polyline=route["overview_polyline"]["points"],
@@ -89,6 +124,10 @@ class GoogleMapsService:
         except Exception as e:
             raise ExternalServiceError(f"Route calculation failed: {e!s}")
 
+        if cache_key:
+            await self.cache.set(cache_key, route_info, ROUTE_CACHE_TTL_SECONDS)
+        return route_info
+
     async def calculate_distance_matrix(
         self,
         origins: List[Coordinates],
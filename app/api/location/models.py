@@ -27,11 +27,11 @@ class Location(Base, TimestampMixin):
     address = Column(String, nullable=True)  # Reverse geocoded address
     location_type = Column(String, nullable=False)  # from LocationType enum
 
-    # Composite index for spatial queries
-    __table_args__ = (Index("idx_locations_coordinates", "latitude", "longitude"),)
+    # Latest-fix and history lookups filter by user and walk created_at
+    __table_args__ = (Index("idx_locations_user_created", "user_id", "created_at"),)
 
-    # Relationships
-    user = relationship("User", back_populates="locations")
+    # Relationships; never lazy-loaded, so listing code can't fall into N+1 queries
+    user = relationship("User", back_populates="locations", lazy="raise_on_sql")
 
 
 class Route(Base, TimestampMixin):
@@ -51,6 +51,6 @@ class Route(Base, TimestampMixin):
     encoded_polyline = Column(String, nullable=False)  # Google's encoded polyline
     eta = Column(DateTime(timezone=True), nullable=False)  # Estimated arrival time
 
-    # Relationships
-    user = relationship("User", back_populates="routes")
-    job = relationship("Job", back_populates="routes")
+    # Relationships; callers that need them eager-load with selectinload()
+    user = relationship("User", back_populates="routes", lazy="raise_on_sql")
+    job = relationship("Job", back_populates="routes", lazy="raise_on_sql")
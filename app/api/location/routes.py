@@ -37,6 +37,23 @@ async def update_location(
     return await service.update_location(current_user.id, location)
 
 
+@router.post("/updates", response_model=schemas.LocationUpdateAccepted, status_code=status.HTTP_202_ACCEPTED)
+@rate_limit(limit=60, window=60)  # 1 update per second max
+async def queue_location_update(
+    location: schemas.LocationUpdate,
+    current_user: User = Depends(get_current_active_user),
+    service: LocationService = Depends(get_location_service),
+):
+    """
+    Update user's current location without waiting for it to be stored.
+
+    The update is written in the next batch, so it is accepted rather than returned.
+    ``/update`` keeps returning the stored location for existing clients.
+    """
+    await service.queue_location_update(current_user.id, location)
+    return schemas.LocationUpdateAccepted()
+
+
 @router.get("/current", response_model=schemas.LocationResponse)
 async def get_current_location(
     user_id: Optional[int] = None,
@@ -65,13 +82,14 @@ async def get_location_history(
     start_time: datetime,
     end_time: datetime,
     user_id: Optional[int] = None,
+    include_address: bool = False,
     current_user: User = Depends(get_current_active_user),
     service: LocationService = Depends(get_location_service),
 ):
     """
     Get user's location history within a timeframe.
 
-    Admins can query other users' history.
+    Admins can query other users' history. Addresses are only included when asked for.
     """
     if user_id and user_id != current_user.id:
         if current_user.role != UserRole.ADMIN:
@@ -81,7 +99,7 @@ async def get_location_history(
             )
 
     target_user_id = user_id or current_user.id
-    return await service.get_location_history(target_user_id, start_time, end_time)
+    return await service.get_location_history(target_user_id, start_time, end_time, include_address)
 
 
 @router.post("/routes/{job_id}", response_model=schemas.RouteResponse)
@@ -1,6 +1,8 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
 
+import numpy as np
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -10,6 +12,32 @@ from app.api.location.maps import GoogleMapsService
 from app.api.location.models import Route
 from app.api.shared.exceptions import BusinessLogicError, NotFoundException
 
+# Mean Earth radius, for straight-line distances between stops
+EARTH_RADIUS_METERS = 6_371_000.0
+
+
+def haversine_matrix(points: List[Coordinates]) -> np.ndarray:
+    """Pairwise great-circle distances in meters, computed for every pair at once."""
+    lats = np.radians([point.latitude for point in points])
+    lngs = np.radians([point.longitude for point in points])
+    dlat = lats[:, None] - lats[None, :]
+    dlng = lngs[:, None] - lngs[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lats[:, None]) * np.cos(lats[None, :]) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def nearest_neighbor_order(distances: np.ndarray) -> List[int]:
+    """Visit order of points 1..N starting from point 0, always moving to the closest unvisited one."""
+    remaining = distances.copy()
+    remaining[:, 0] = np.inf
+    order = []
+    current = 0
+    for _ in range(len(distances) - 1):
+        current = int(np.argmin(remaining[current]))
+        order.append(current)
+        remaining[:, current] = np.inf
+    return order
+
 
 class RouteCalculator:
     """Service for route calculations and optimizations."""
@@ -55,7 +83,6 @@ class RouteCalculator:
 
         self.db.add(route)
         await self.db.commit()
-        await self.db.refresh(route)
 
         return route
 
@@ -71,45 +98,34 @@ class RouteCalculator:
         if not jobs:
             raise BusinessLogicError("No valid jobs found")
 
-        # Create origins and destinations
-        destinations = [Coordinates(latitude=job.latitude, longitude=job.longitude) for job in jobs]
-
-        # Calculate distance matrix
-        matrix = await self.maps.calculate_distance_matrix(
-            origins=[start_location],
-            destinations=destinations,
-        )
+        points = [start_location] + [Coordinates(latitude=job.latitude, longitude=job.longitude) for job in jobs]
 
-        # Optimize using nearest neighbor algorithm
-        current_point = 0  # Start location
-        unvisited = list(range(len(destinations)))
-        route = []
-
-        while unvisited:
-            nearest = min(
-                unvisited,
-                key=lambda x, cp=current_point: matrix[cp][x]["duration"],
-            )
-
-            route.append(
-                {
-                    "job_id": jobs[nearest].id,
-                    "duration": matrix[current_point][nearest]["duration"],
-                    "distance": matrix[current_point][nearest]["distance"],
-                }
+        # Order stops by straight-line distance locally, then ask Google only for the chosen legs.
+        # One 1x1 request per leg: elements are billed, and a full origins x destinations
+        # matrix would pay for (N-1)^2 of them to read the N-1 on its diagonal.
+        stops = [0] + nearest_neighbor_order(haversine_matrix(points))
+        legs = await asyncio.gather(
+            *(
+                self.maps.calculate_distance_matrix(origins=[points[origin]], destinations=[points[destination]])
+                for origin, destination in zip(stops, stops[1:])
             )
+        )
 
-            current_point = nearest + 1
-            unvisited.remove(nearest)
-
-        return route
+        return [
+            {
+                "job_id": jobs[stop - 1].id,
+                "duration": leg[0][0]["duration"],
+                "distance": leg[0][0]["distance"],
+            }
+            for leg, stop in zip(legs, stops[1:])
+        ]
 
     async def _get_job(self, job_id: int, user_id: int) -> Optional[Job]:
         """Get job and verify access."""
         result = await self.db.execute(
             select(Job).filter(
                 Job.id == job_id,
-                Job.status != JobStatus.CANCELLED,
+                Job.status != JobStatus.CANCELED,
             ),
         )
         job = result.scalar_one_or_none()
@@ -127,7 +143,7 @@ class RouteCalculator:
         result = await self.db.execute(
             select(Job).filter(
                 Job.id.in_(job_ids),
-                Job.status != JobStatus.CANCELLED,
+                Job.status != JobStatus.CANCELED,
             ),
         )
         jobs = result.scalars().all()
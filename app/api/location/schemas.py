@@ -30,7 +30,7 @@ class LocationResponse(CoordinatesBase):
     accuracy: Optional[float]
     speed: Optional[float]
     bearing: Optional[float]
-    address: Optional[str]
+    address: Optional[str] = None  # Left out of history listings unless requested
     location_type: LocationType
     created_at: datetime
     updated_at: datetime
@@ -39,6 +39,12 @@ class LocationResponse(CoordinatesBase):
         from_attributes = True
 
 
+class LocationUpdateAccepted(BaseModel):
+    """Schema for location updates queued for the batched writer."""
+
+    status: str = "accepted"
+
+
 class RouteRequest(BaseModel):
     """Schema for route calculation requests."""
 
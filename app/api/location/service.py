@@ -1,14 +1,23 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional, Dict
-from sqlalchemy import select
+from sqlalchemy import RowMapping, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.location import models, schemas
 from app.api.location.core import Coordinates, LocationError
 from app.api.location.maps import GoogleMapsService
 from app.api.location.routing import RouteCalculator
+from app.api.location.writer import get_location_writer
 from app.api.shared.exceptions import NotFoundException
 
+# Fixes less precise than this may be far from their snapped cache cell, so skip the geocode cache
+GEOCODE_CACHE_MAX_ACCURACY_METERS = 50
+
+# Columns returned by location history listings (address is opt-in)
+HISTORY_COLUMNS = tuple(
+    getattr(models.Location, name) for name in schemas.LocationResponse.model_fields if name != "address"
+)
+
 
 class LocationService:
     """Service for handling location-related operations."""
@@ -24,29 +33,49 @@ class LocationService:
         location_data: schemas.LocationUpdate,
     ) -> models.Location:
         """Update user's location."""
-        coords = Coordinates(latitude=location_data.latitude, longitude=location_data.longitude)
-
-        # Reverse geocode to get address
-        address = await self.maps.reverse_geocode(coords)
-
-        # Create location record
-        location = models.Location(
-            user_id=user_id,
-            latitude=coords.latitude,
-            longitude=coords.longitude,
-            accuracy=location_data.accuracy,
-            speed=location_data.speed,
-            bearing=location_data.bearing,
-            address=address,
-            location_type=location_data.location_type,
-        )
+        location = models.Location(**await self._location_row(user_id, location_data))
 
         self.db.add(location)
         await self.db.commit()
-        await self.db.refresh(location)
 
         return location
 
+    async def queue_location_update(
+        self,
+        user_id: int,
+        location_data: schemas.LocationUpdate,
+    ) -> None:
+        """
+        Record user's location without waiting for the write.
+
+        The fix is queued for the batched ``LocationWriter`` rather than inserted here, so
+        the request does not wait on its own INSERT and commit.
+        """
+        await get_location_writer().push(await self._location_row(user_id, location_data))
+
+    async def _location_row(self, user_id: int, location_data: schemas.LocationUpdate) -> Dict:
+        """Build the ``locations`` row for a fix, reverse geocoding its address."""
+        coords = Coordinates(latitude=location_data.latitude, longitude=location_data.longitude)
+
+        # Reverse geocode to get address
+        precise = location_data.accuracy is None or location_data.accuracy <= GEOCODE_CACHE_MAX_ACCURACY_METERS
+        address = await self.maps.reverse_geocode(coords, use_cache=precise)
+
+        # Timestamped now, not when a queued row is flushed
+        now = datetime.now(timezone.utc)
+        return {
+            "user_id": user_id,
+            "latitude": coords.latitude,
+            "longitude": coords.longitude,
+            "accuracy": location_data.accuracy,
+            "speed": location_data.speed,
+            "bearing": location_data.bearing,
+            "address": address,
+            "location_type": location_data.location_type,
+            "created_at": now,
+            "updated_at": now,
+        }
+
     async def get_latest_location(self, user_id: int) -> Optional[models.Location]:
         """Get user's most recent location."""
         result = await self.db.execute(
@@ -65,10 +94,17 @@ class LocationService:
         user_id: int,
         start_time: datetime,
         end_time: datetime,
-    ) -> List[models.Location]:
-        """Get user's location history within timeframe."""
+        include_address: bool = False,
+    ) -> List[RowMapping]:
+        """
+        Get user's location history within timeframe.
+
+        Selects plain columns rather than ORM objects; the reverse geocoded address is
+        skipped unless ``include_address`` is set.
+        """
+        columns = HISTORY_COLUMNS + (models.Location.address,) if include_address else HISTORY_COLUMNS
         result = await self.db.execute(
-            select(models.Location)
+            select(*columns)
             .filter(
                 models.Location.user_id == user_id,
                 models.Location.created_at >= start_time,
@@ -76,7 +112,7 @@ class LocationService:
             )
             .order_by(models.Location.created_at)
         )
-        return result.scalars().all()
+        return result.mappings().all()
 
     async def calculate_route(
         self,
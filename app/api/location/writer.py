@@ -0,0 +1,124 @@
+import asyncio
+from functools import lru_cache
+import logging
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.api.location.models import Location
+from app.api.shared.database import session_scope
+
+logger = logging.getLogger(__name__)
+
+# Buffered fixes before push() starts applying backpressure to the request
+LOCATION_QUEUE_SIZE = 10_000
+# A batch is written once it is this large or this old, whichever comes first
+LOCATION_BATCH_SIZE = 500
+LOCATION_FLUSH_INTERVAL_SECONDS = 0.2
+# Backoff between attempts to write a batch while the database is unavailable
+LOCATION_RETRY_BASE_DELAY_SECONDS = 0.5
+LOCATION_RETRY_MAX_DELAY_SECONDS = 30
+
+
+class LocationWriter:
+    """
+    Buffers location fixes and writes them to ``locations`` in batches.
+
+    Each batch is one multi-row INSERT and one commit instead of a round-trip and commit
+    per update. ``run`` is started as a background task from the app lifespan.
+
+    A batch stays buffered until its commit succeeds: failed writes are retried with
+    backoff (the bounded queue then pushes back on requests), and a batch cancelled
+    mid-write is written again by the shutdown flush. Delivery is therefore at-least-once.
+    """
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=LOCATION_QUEUE_SIZE)
+        # Rows taken off the queue but not yet committed; flushed on shutdown too
+        self._batch: List[Dict[str, Any]] = []
+
+    async def push(self, row: Dict[str, Any]) -> None:
+        """Queue a ``locations`` row for the next batch."""
+        await self._queue.put(row)
+
+    async def run(self) -> None:
+        """Write batches until cancelled, then flush whatever is still queued."""
+        try:
+            failures = 0
+            while True:
+                await self._collect_batch()
+                try:
+                    await self._write(self._batch)
+                except Exception:
+                    failures += 1
+                    delay = min(
+                        LOCATION_RETRY_BASE_DELAY_SECONDS * 2 ** (failures - 1), LOCATION_RETRY_MAX_DELAY_SECONDS
+                    )
+                    logger.exception("Failed to write %s location updates, retrying in %ss", len(self._batch), delay)
+                    await asyncio.sleep(delay)
+                    continue
+                failures = 0
+                self._batch = []
+        finally:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write everything currently buffered; rows that still can't be written are logged as lost."""
+        while not self._queue.empty():
+            self._batch.append(self._queue.get_nowait())
+        while self._batch:
+            rows = self._batch[:LOCATION_BATCH_SIZE]
+            try:
+                await self._write(rows)
+            except Exception:
+                logger.exception("Dropping %s location updates that could not be written", len(self._batch))
+                self._batch = []
+                return
+            self._batch = self._batch[len(rows) :]
+
+    async def _collect_batch(self) -> None:
+        """Wait for a row, then collect more until the batch is full or the flush interval ends."""
+        if not self._batch:
+            self._batch.append(await self._queue.get())
+        deadline = time.monotonic() + LOCATION_FLUSH_INTERVAL_SECONDS
+        while len(self._batch) < LOCATION_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                self._batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert and commit ``rows``; raises if the database can't be written to.
+
+        A batch rejected for its data (a bad user_id, a value out of range) would fail on
+        every retry, so it is written row by row instead and only the offending rows are
+        dropped.
+        """
+        if not rows:
+            return
+        try:
+            await self._insert(rows)
+        except (DataError, IntegrityError):
+            for row in rows:
+                try:
+                    await self._insert([row])
+                except (DataError, IntegrityError):
+                    logger.exception("Dropping location update for user %s", row.get("user_id"))
+
+    @staticmethod
+    async def _insert(rows: List[Dict[str, Any]]) -> None:
+        async with session_scope() as db:
+            await db.execute(insert(Location), rows)
+            await db.commit()
+
+
+@lru_cache
+def get_location_writer() -> LocationWriter:
+    """Get the process-wide location writer."""
+    return LocationWriter()
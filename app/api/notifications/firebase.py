@@ -1,54 +1,164 @@
+import asyncio
+from dataclasses import dataclass
+from functools import lru_cache
 import firebase_admin
-from firebase_admin import messaging, credentials
-from typing import Dict, Any, Optional
+from firebase_admin import credentials
+from google.auth.transport import requests as google_requests
+import httpx
+from typing import Dict, Any, List, Optional, Tuple
 from app.api.shared.config import settings
 from app.api.notifications.exceptions import NotificationError
 
+FCM_SEND_URL = "https://fcm.googleapis.com/v1/projects/{project_id}/messages:send"
+FCM_MAX_CONNECTIONS = 10
+# FCM serves up to 100 concurrent HTTP/2 streams per connection
+FCM_MAX_CONCURRENT_SENDS = FCM_MAX_CONNECTIONS * 100
 
-class FirebaseHandler:
-    _instance = None
-    _initialized = False
+# One transport for OAuth token refreshes: its requests.Session keeps the TLS connection alive
+_google_auth_request = google_requests.Request()
+
+
+@dataclass
+class PushResult:
+    """Outcome of sending one FCM message: its message name, or the error it failed with."""
+
+    message_id: Optional[str] = None
+    exception: Optional[NotificationError] = None
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    @property
+    def success(self) -> bool:
+        return self.exception is None
+
+
+class FirebaseHandler:
+    _http: Optional[httpx.AsyncClient] = None
+    # Shared by every send in the process so concurrent fan-outs can't oversubscribe the pool
+    _send_limiter: Optional[asyncio.Semaphore] = None
 
     def __init__(self):
-        if not self._initialized:
-            self._initialize_firebase()
-            FirebaseHandler._initialized = True
+        self._initialize_firebase()
 
     @staticmethod
     def _initialize_firebase():
-        """Initialize Firebase Admin SDK."""
-        if settings.FIREBASE_CREDENTIALS_PATH:
+        """Initialize the Firebase Admin SDK unless the default app already exists."""
+        if settings.FIREBASE_CREDENTIALS_PATH and not firebase_admin._apps:
             try:
                 cred = credentials.Certificate(settings.FIREBASE_CREDENTIALS_PATH)
                 firebase_admin.initialize_app(cred)
-            except ValueError:
-                # App already initialized
-                pass
             except Exception as e:
                 raise NotificationError(f"Firebase initialization failed: {str(e)}")
 
+    @classmethod
+    def _get_http_client(cls) -> httpx.AsyncClient:
+        """Shared HTTP/2 client so multicast sends multiplex over a few connections."""
+        if cls._http is None:
+            cls._http = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=FCM_MAX_CONNECTIONS, max_keepalive_connections=FCM_MAX_CONNECTIONS),
+                timeout=10.0,
+            )
+            cls._send_limiter = asyncio.Semaphore(FCM_MAX_CONCURRENT_SENDS)
+        return cls._http
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP client; called on application shutdown."""
+        if cls._http is not None:
+            await cls._http.aclose()
+            cls._http = None
+            cls._send_limiter = None
+
+    @staticmethod
+    async def _get_fcm_auth() -> Tuple[str, Dict[str, str]]:
+        """Return the FCM v1 send URL and auth header for the default Firebase app."""
+        try:
+            app = firebase_admin.get_app()
+        except ValueError as e:
+            raise NotificationError(f"Firebase not initialized: {str(e)}")
+
+        google_credential = app.credential.get_credential()
+        if not google_credential.valid:
+            # OAuth token refresh is a blocking HTTP call; only made when the token expires
+            await asyncio.to_thread(google_credential.refresh, _google_auth_request)
+        url = FCM_SEND_URL.format(project_id=app.project_id)
+        return url, {"Authorization": f"Bearer {google_credential.token}"}
+
     @staticmethod
+    def _send_error(response: httpx.Response) -> NotificationError:
+        """Build the error for a rejected FCM v1 send."""
+        try:
+            error = response.json().get("error", {})
+            detail = f"{error.get('status')}: {error.get('message')}"
+        except ValueError:
+            detail = f"HTTP {response.status_code}"
+        return NotificationError(f"Push notification failed: {detail}")
+
+    @staticmethod
+    def _build_message(token: str, title: str, body: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Build an FCM v1 message body for one device."""
+        message = {"token": token, "notification": {"title": title, "body": body}}
+        if data:
+            # FCM v1 rejects the whole message unless every data value is a string
+            message["data"] = {key: str(value) for key, value in data.items()}
+        return message
+
+    @classmethod
+    async def _post_message(cls, message: Dict[str, Any], url: str, headers: Dict[str, str]) -> PushResult:
+        """POST one message to FCM on the shared client, capturing failures in the result."""
+        http = cls._get_http_client()
+        try:
+            async with cls._send_limiter:
+                response = await http.post(url, json={"message": message}, headers=headers)
+        except httpx.HTTPError as e:
+            return PushResult(exception=NotificationError(f"Push notification failed: {str(e)}"))
+        if response.is_success:
+            return PushResult(message_id=response.json().get("name"))
+        return PushResult(exception=cls._send_error(response))
+
+    @classmethod
     async def send_push_notification(
+        cls,
         token: str,
         title: str,
         body: str,
         data: Optional[Dict[str, Any]] = None,
-    ):
-        """Send push notification using Firebase."""
-        try:
-            message = messaging.Message(
-                notification=messaging.Notification(
-                    title=title,
-                    body=body,
-                ),
-                data=data,
-                token=token,
-            )
-            return messaging.send(message)
-        except Exception as e:
-            raise NotificationError(f"Push notification failed: {str(e)}")
+    ) -> str:
+        """
+        Send push notification using Firebase.
+
+        Posted straight to the FCM v1 API on the shared HTTP/2 client, so the event loop is
+        never blocked and the connection is reused. Returns the FCM message name.
+        """
+        url, headers = await cls._get_fcm_auth()
+        response = await cls._post_message(cls._build_message(token, title, body, data), url, headers)
+        if not response.success:
+            raise response.exception
+        return response.message_id
+
+    @classmethod
+    async def send_many(cls, messages: List[Dict[str, Any]]) -> List[PushResult]:
+        """
+        Send several FCM v1 messages.
+
+        The sends are issued concurrently as HTTP/2 streams on the shared connections, bounded
+        by the process-wide limiter. Results are returned in the same order as ``messages``.
+        """
+        url, headers = await cls._get_fcm_auth()
+        return await asyncio.gather(*(cls._post_message(message, url, headers) for message in messages))
+
+    @classmethod
+    async def send_multicast_notification(
+        cls,
+        tokens: List[str],
+        title: str,
+        body: str,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> List[PushResult]:
+        """Send one push notification to several devices, in the same order as ``tokens``."""
+        return await cls.send_many([cls._build_message(token, title, body, data) for token in tokens])
+
+
+@lru_cache(maxsize=1)
+def get_firebase_handler() -> FirebaseHandler:
+    """Get the process-wide Firebase handler; first called from the app lifespan."""
+    return FirebaseHandler()
@@ -1,6 +1,7 @@
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, DateTime, Enum as SQLAEnum, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.api.shared.database import Base, TimestampMixin
@@ -20,16 +21,28 @@ class NotificationStatus(str, PyEnum):
 
 class Notification(Base, TimestampMixin):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Keyset pagination of a user's notifications; scanned backwards for newest-first pages
+        Index("ix_notifications_user_created", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
-    type = Column(String, nullable=False)
+    # Native PG enums: 4-byte values instead of variable-length strings in rows and indexes
+    type = Column(
+        SQLAEnum(NotificationType, name="notification_type", values_callable=lambda e: [m.value for m in e]),
+        nullable=False,
+    )
     title = Column(String, nullable=False)
     body = Column(String, nullable=False)
-    status = Column(String, default=NotificationStatus.PENDING)
-    data = Column(String, nullable=True)  # JSON string for additional data
+    status = Column(
+        SQLAEnum(NotificationStatus, name="notification_status", values_callable=lambda e: [m.value for m in e]),
+        default=NotificationStatus.PENDING,
+        nullable=False,
+    )
+    data = Column(JSONB, nullable=True)  # Additional payload, round-trips as a dict
     sent_at = Column(DateTime, nullable=True)
     error_message = Column(String, nullable=True)
 
-    # Relationships
-    user = relationship("User", back_populates="notifications")
+    # Relationships; never lazy-loaded, so listings can't fall into a query per notification
+    user = relationship("User", back_populates="notifications", lazy="raise_on_sql")
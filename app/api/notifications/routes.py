@@ -1,5 +1,7 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.shared.database import get_db
 from app.api.auth.dependencies import get_current_active_user
@@ -8,17 +10,46 @@ from app.api.notifications.service import NotificationService
 
 router = APIRouter(prefix="/api/v1/notifications", tags=["notifications"])
 
+# Larger limits are clamped rather than rejected so existing clients keep working
+MAX_PAGE_SIZE = 100
 
-@router.get("/", response_model=List[schemas.NotificationResponse])
+
+# No response_model: rows are already in the response shape, so skip per-row validation on the way out
+@router.get(
+    "/",
+    response_class=ORJSONResponse,
+    responses={200: {"model": List[schemas.NotificationResponse]}},
+)
 async def get_notifications(
-    skip: int = 0,
-    limit: int = 100,
+    skip: Optional[int] = Query(None, ge=0, deprecated=True),
+    limit: int = Query(100, ge=1),
+    after_created_at: Optional[datetime] = None,
+    after_id: Optional[int] = None,
     current_user=Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get current user's notifications."""
+    """Get current user's notifications, newest first.
+
+    Pass the ``created_at`` and ``id`` of the last notification received as ``after_created_at``
+    and ``after_id`` to fetch the next page. ``skip`` still pages by offset, but is deprecated.
+    """
+    if (after_created_at is None) != (after_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="after_created_at and after_id must be given together",
+        )
+    cursor = (after_created_at, after_id) if after_created_at is not None else None
+    if cursor and skip is not None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Use either a cursor or skip, not both"
+        )
+
     service = NotificationService(db)
-    return await service.get_user_notifications(current_user.id, skip, limit)
+    notifications = await service.get_user_notifications(
+        current_user.id, min(limit, MAX_PAGE_SIZE), cursor=cursor, skip=skip
+    )
+    # Rows come back as plain dicts in the response shape; encode them straight with orjson
+    return ORJSONResponse(notifications)
 
 
 @router.post("/{notification_id}/read")
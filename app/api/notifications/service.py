@@ -1,14 +1,28 @@
+import asyncio
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, Sequence
-from sqlalchemy import select
+import logging
+from typing import Optional, Dict, Any, List, Tuple
+from uuid import UUID
+from fastapi import Depends
+from sqlalchemy import Row, desc, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-import json
+from sqlalchemy.orm import InstrumentedAttribute
 
 from app.api.auth.models import User
-from app.api.notifications import models
+from app.api.notifications import models, schemas
 from app.api.notifications.exceptions import NotificationError
-from app.api.notifications.firebase import FirebaseHandler
+from app.api.notifications.firebase import get_firebase_handler
 from app.api.shared.config import settings
+from app.api.shared.database import get_db
+from app.api.shared.utils.task_queue import get_task_queue
+
+logger = logging.getLogger(__name__)
+
+# Recipients per FCM multicast call; sends across all chunks share the handler's limiter
+MULTICAST_CHUNK_SIZE = 500
+
+# Columns loaded for notification listings, kept in step with NotificationResponse
+LIST_COLUMNS = tuple(getattr(models.Notification, name) for name in schemas.NotificationResponse.model_fields)
 
 
 class NotificationServiceError:
@@ -20,9 +34,10 @@ class NotificationServiceError:
 
 
 class NotificationService:
-    def __init__(self, db: AsyncSession):
+    # Defaulting db to the request session lets routes inject the service with a bare Depends()
+    def __init__(self, db: AsyncSession = Depends(get_db)):
         self.db = db
-        self.firebase = FirebaseHandler()
+        self.firebase = get_firebase_handler()
 
     async def send_notification(
         self,
@@ -38,7 +53,7 @@ class NotificationService:
             type=notification_type,
             title=title,
             body=body,
-            data=json.dumps(data) if data else None,
+            data=data or None,
             status=models.NotificationStatus.PENDING,
         )
 
@@ -46,7 +61,6 @@ class NotificationService:
             # Save notification record first
             self.db.add(notification)
             await self.db.commit()
-            await self.db.refresh(notification)
 
             # Send based on type
             if notification_type == models.NotificationType.PUSH and settings.PUSH_ENABLED:
@@ -62,11 +76,15 @@ class NotificationService:
             notification.status = models.NotificationStatus.SENT
             notification.sent_at = datetime.now(timezone.utc)
             await self.db.commit()
-            await self.db.refresh(notification)
 
             return notification
 
         except Exception as e:
+            logger.exception("Failed to send %s notification to user %s", notification_type, user_id)
+            # A failed flush leaves the shared request session unusable until rolled back
+            if not self.db.is_active:
+                await self.db.rollback()
+
             # Update notification status on failure if it was saved
             if notification.id:
                 notification.status = models.NotificationStatus.FAILED
@@ -75,30 +93,110 @@ class NotificationService:
 
             raise NotificationError(f"Failed to send notification: {str(e)}")
 
+    async def enqueue_multi_notification(
+        self,
+        user_ids: List[UUID],
+        title: str,
+        body: str,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Queue a push notification for several users and return without waiting on FCM.
+
+        The worker delivers it with ``send_multi_notification``, so request latency is just
+        the Redis write and FCM failures never surface as request errors.
+        """
+        return await get_task_queue().enqueue(
+            "send_multi_notification", user_ids=user_ids, title=title, body=body, data=data
+        )
+
+    async def send_multi_notification(
+        self,
+        user_ids: List[UUID],
+        title: str,
+        body: str,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> List[models.Notification]:
+        """Send the same push notification to several users with one FCM multicast."""
+        notifications = [
+            models.Notification(
+                user_id=user_id,
+                type=models.NotificationType.PUSH,
+                title=title,
+                body=body,
+                data=data or None,
+                status=models.NotificationStatus.PENDING,
+            )
+            for user_id in user_ids
+        ]
+        self.db.add_all(notifications)
+        await self.db.commit()
+
+        # Columns only, and users without a device token are filtered out by the database
+        result = await self.db.execute(
+            select(User.id, User.fcm_token).where(User.id.in_(user_ids), User.fcm_token.is_not(None))
+        )
+        tokens = dict(result.tuples().all())
+
+        deliverable = []
+        for notification in notifications:
+            if not settings.PUSH_ENABLED:
+                notification.status = models.NotificationStatus.FAILED
+                notification.error_message = NotificationServiceError.UNSUPPORTED_TYPE
+            elif notification.user_id not in tokens:
+                notification.status = models.NotificationStatus.FAILED
+                notification.error_message = NotificationServiceError.FCM_TOKEN_NOT_FOUND
+            else:
+                deliverable.append(notification)
+
+        # Large fan-outs go out as concurrent chunks so FCM round-trips overlap
+        chunks = [deliverable[i : i + MULTICAST_CHUNK_SIZE] for i in range(0, len(deliverable), MULTICAST_CHUNK_SIZE)]
+
+        async def send_chunk(chunk: List[models.Notification]) -> None:
+            try:
+                results = await self.firebase.send_multicast_notification(
+                    tokens=[tokens[n.user_id] for n in chunk],
+                    title=title,
+                    body=body,
+                    data=data,
+                )
+            except NotificationError as e:
+                for notification in chunk:
+                    notification.status = models.NotificationStatus.FAILED
+                    notification.error_message = str(e)
+                return
+
+            # Results come back in the same order as the tokens
+            sent_at = datetime.now(timezone.utc)
+            for notification, result in zip(chunk, results):
+                if result.success:
+                    notification.status = models.NotificationStatus.SENT
+                    notification.sent_at = sent_at
+                else:
+                    notification.status = models.NotificationStatus.FAILED
+                    notification.error_message = str(result.exception)
+
+        await asyncio.gather(*(send_chunk(chunk) for chunk in chunks))
+
+        await self.db.commit()
+        return notifications
+
     async def _send_push_notification(self, notification: models.Notification) -> None:
         """Send push notification using Firebase."""
-        user = await self._get_user(notification.user_id)
-        if not user:
-            raise NotificationError(NotificationServiceError.USER_NOT_FOUND)
-
-        fcm_token = getattr(user, "fcm_token", None)
+        fcm_token = (await self._get_user_contact(notification.user_id, User.fcm_token)).fcm_token
         if not fcm_token:
             raise NotificationError(NotificationServiceError.FCM_TOKEN_NOT_FOUND)
 
-        data = json.loads(notification.data) if notification.data else None
         await self.firebase.send_push_notification(
             token=fcm_token,
             title=notification.title,
             body=notification.body,
-            data=data,
+            data=notification.data,
         )
 
     async def _send_email_notification(self, notification: models.Notification) -> None:
         """Send email notification."""
-        user = await self._get_user(notification.user_id)
-        if not user:
-            raise NotificationError(NotificationServiceError.USER_NOT_FOUND)
-
+        user = await self._get_user_contact(notification.user_id, User.email)
         if not user.email:
             raise NotificationError(NotificationServiceError.EMAIL_NOT_FOUND)
 
@@ -106,32 +204,45 @@ class NotificationService:
 
     async def _send_sms_notification(self, notification: models.Notification) -> None:
         """Send SMS notification."""
-        user = await self._get_user(notification.user_id)
-        if not user:
-            raise NotificationError(NotificationServiceError.USER_NOT_FOUND)
-
+        user = await self._get_user_contact(notification.user_id, User.phone_number)
         if not user.phone_number:
             raise NotificationError(NotificationServiceError.PHONE_NOT_FOUND)
 
         # Implement SMS sending logic here
 
-    async def _get_user(self, user_id: int) -> Optional[User]:
-        """Get user details."""
-        result = await self.db.execute(select(User).filter(User.id == user_id))
-        return result.scalar_one_or_none()
+    async def _get_user_contact(self, user_id: int, column: InstrumentedAttribute) -> Row:
+        """Load one contact column for a user rather than the whole row."""
+        result = await self.db.execute(select(column).where(User.id == user_id))
+        row = result.one_or_none()
+        if row is None:
+            raise NotificationError(NotificationServiceError.USER_NOT_FOUND)
+        return row
 
     async def get_user_notifications(
-        self, user_id: int, skip: int = 0, limit: int = 100
-    ) -> Sequence[models.Notification]:
-        """Get user's notifications."""
-        result = await self.db.execute(
-            select(models.Notification)
-            .filter(models.Notification.user_id == user_id)
-            .order_by(models.Notification.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-        )
-        return result.scalars().all()
+        self,
+        user_id: int,
+        limit: int = 100,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        skip: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a page of the user's notifications, newest first, as response-ready dicts.
+
+        ``cursor`` is the ``(created_at, id)`` of the last notification on the previous page;
+        seeking past it walks the (user_id, created_at, id) index instead of skipping rows
+        with OFFSET. ``skip`` is the deprecated offset paging, kept for older clients. Only the
+        response columns are selected and ``data`` already arrives as a dict from JSONB, so the
+        route can encode the page directly without validating each row.
+        """
+        query = select(*LIST_COLUMNS).where(models.Notification.user_id == user_id)
+        if cursor is not None:
+            query = query.where(tuple_(models.Notification.created_at, models.Notification.id) < cursor)
+        query = query.order_by(desc(models.Notification.created_at), desc(models.Notification.id)).limit(limit)
+        if skip:
+            query = query.offset(skip)
+
+        result = await self.db.execute(query)
+        return [dict(row) for row in result.mappings()]
 
     async def mark_as_read(self, notification_id: int, user_id: int) -> Optional[models.Notification]:
         """Mark notification as read."""
@@ -139,7 +250,6 @@ class NotificationService:
         if notification:
             notification.is_read = True
             await self.db.commit()
-            await self.db.refresh(notification)
         return notification
 
     async def _get_notification(self, notification_id: int, user_id: int) -> Optional[models.Notification]:
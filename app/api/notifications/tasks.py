@@ -0,0 +1,20 @@
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from app.api.notifications.service import NotificationService
+from app.api.shared.database import session_scope
+
+
+async def send_multi_notification(
+    user_ids: List[str], title: str, body: str, data: Optional[Dict[str, Any]] = None
+) -> None:
+    """Deliver a push notification queued by ``NotificationService.enqueue_multi_notification``."""
+    # orjson writes UUIDs as strings; turn them back so they match the User.id keys loaded from the database
+    user_ids = [UUID(user_id) for user_id in user_ids]
+    async with session_scope() as db:
+        await NotificationService(db).send_multi_notification(user_ids=user_ids, title=title, body=body, data=data)
+
+
+TASKS = {
+    "send_multi_notification": send_multi_notification,
+}
@@ -1,4 +1,4 @@
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.shared.database import get_db
@@ -8,14 +8,17 @@ from app.api.payments.service import PaymentService
 from app.api.payments.core import PaymentProcessor
 
 
-async def get_payment_service(db: AsyncSession = Depends(get_db)) -> PaymentService:
-    """Get PaymentService instance."""
-    return PaymentService(db)
+async def get_mpesa_client(request: Request) -> MPESAClient:
+    """Get the app-wide MPESAClient, so its access token is reused across requests."""
+    return request.app.state.mpesa_client
 
 
-async def get_mpesa_client() -> MPESAClient:
-    """Get MPESAClient instance."""
-    return MPESAClient()
+async def get_payment_service(
+    db: AsyncSession = Depends(get_db),
+    mpesa_client: MPESAClient = Depends(get_mpesa_client),
+) -> PaymentService:
+    """Get PaymentService instance."""
+    return PaymentService(db, mpesa_client)
 
 
 async def get_job_service(db: AsyncSession = Depends(get_db)) -> JobService:
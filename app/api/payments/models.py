@@ -1,6 +1,5 @@
 from enum import Enum as PyEnum
-from typing import Any
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, JSON
+from sqlalchemy import Column, DateTime, Integer, String, Float, ForeignKey, JSON
 from sqlalchemy.orm import relationship
 
 from app.api.shared.database import Base, TimestampMixin
@@ -19,10 +18,6 @@ class PaymentProvider(str, PyEnum):
 
 
 class Payment(Base, TimestampMixin):
-    def __init__(self, **kw: Any):
-        super().__init__(kw)
-        self.completed_at = None
-
     __tablename__ = "payments"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -35,6 +30,7 @@ class Payment(Base, TimestampMixin):
     # Provider-specific fields
     provider_reference = Column(String, unique=True, nullable=True)  # e.g., M-PESA transaction ID
     provider_metadata = Column(JSON, nullable=True)  # Additional provider data
+    completed_at = Column(DateTime(timezone=True), nullable=True)  # Set when the payment settles
 
     # Relations
     job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
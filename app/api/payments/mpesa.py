@@ -1,84 +1,250 @@
+import asyncio
 import base64
 from datetime import datetime, UTC
-from typing import Dict, Optional
+from functools import lru_cache, wraps
+import inspect
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 import httpx
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
-from app.api.payments.exceptions import PaymentProcessingError
+from app.api.payments.exceptions import PaymentProcessingError, PaymentValidationError
 from app.api.payments.models import Payment
 from app.api.shared.config import get_settings
+from app.api.shared.exceptions import BaseAPIException
+from app.api.shared.utils.cache import get_async_redis_client
+from app.api.shared.utils.phone import normalize_phone_number
 from app.api.shared.utils.time import TimeUtils
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 
 # Constants
 CONTENT_TYPE_JSON = "application/json"
 TOKEN_EXPIRY_SECONDS = 3500  # Set slightly less than 1 hour to ensure token refresh
+TOKEN_CACHE_KEY = "mpesa:access_token"
+TOKEN_EXPIRY_MARGIN_SECONDS = 300  # Drop cached tokens 5 minutes before Safaricom expires them
+# Keep-alive pool shared by every client so Safaricom calls skip the TCP+TLS handshake
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+HTTP_TIMEOUT_SECONDS = 30.0
+# Outcomes reported by check_transaction_status once Safaricom has settled a transaction
+STK_STATUS_SUCCESS = "SUCCESS"
+STK_STATUS_FAILED = "FAILED"
+
+
+@lru_cache(maxsize=128)
+def _stk_password(business_shortcode: str, passkey: str, timestamp: str) -> str:
+    """Base64 STK password; timestamps have one-second resolution, so bursts share one result."""
+    return base64.b64encode(f"{business_shortcode}{passkey}{timestamp}".encode()).decode("ascii")
+
+
+def mpesa_error_boundary(
+    network_message: str,
+    failure_message: str,
+    context: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+):
+    """
+    Translate errors escaping an M-PESA call into ``PaymentProcessingError``.
+
+    API errors raised deliberately inside the call pass through untouched, transport
+    failures become ``network_message`` and anything else ``failure_message``, so each
+    method keeps only its happy path.
+
+    Args:
+        network_message: Message used when the HTTP request itself fails
+        failure_message: Prefix for any other unexpected error
+        context: Maps the call's arguments, by name, to identifying fields
+            (e.g. ``payment_id``) added to the error details
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        signature = inspect.signature(func)
+
+        def error_details(error: Exception, args: tuple, kwargs: dict) -> Dict[str, Any]:
+            details = {"error": str(error)}
+            if context is not None:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                details.update(context(bound.arguments))
+            return details
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except BaseAPIException:
+                raise
+            except httpx.HTTPError as e:
+                raise PaymentProcessingError(message=network_message, details=error_details(e, args, kwargs)) from e
+            except Exception as e:
+                raise PaymentProcessingError(
+                    message=f"{failure_message}: {str(e)}", details=error_details(e, args, kwargs)
+                ) from e
+
+        return wrapper
+
+    return decorator
 
 
 class MPESAClient:
-    def __init__(self):
+    _http: Optional[httpx.AsyncClient] = None
+
+    def __init__(self, redis: Optional[Redis] = None):
         """Initialize MPESA client with configuration."""
-        self.consumer_key = settings.mpesa_consumer_key
-        self.consumer_secret = settings.mpesa_consumer_secret
-        self.business_shortcode = settings.mpesa_business_shortcode
-        self.passkey = settings.mpesa_passkey
-        self.environment = "sandbox" if settings.environment != "production" else "production"
-        self.base_url = (
-            "https://sandbox.safaricom.co.ke" if self.environment == "sandbox" else "https://api.safaricom.co.ke"
-        )
+        self.consumer_key = settings.MPESA_CONSUMER_KEY
+        self.consumer_secret = settings.MPESA_CONSUMER_SECRET
+        self.business_shortcode = settings.MPESA_BUSINESS_SHORTCODE
+        self.passkey = settings.MPESA_PASSKEY
+        self.environment = settings.MPESA_ENVIRONMENT
+        self.base_url = settings.mpesa_api_url
+        # Credentials are fixed for the client's lifetime, so encode the OAuth header once
+        credentials = f"{self.consumer_key}:{self.consumer_secret}".encode()
+        self._basic_auth_header = f"Basic {base64.b64encode(credentials).decode('ascii')}"
+        # Endpoints and the fields every request repeats are fixed per client; build them once
+        self._token_url = f"{self.base_url}/oauth/v1/generate?grant_type=client_credentials"
+        self._stk_push_url = f"{self.base_url}/mpesa/stkpush/v1/processrequest"
+        self._stk_query_url = f"{self.base_url}/mpesa/stkpushquery/v1/query"
+        self._balance_url = f"{self.base_url}/mpesa/accountbalance/v1/query"
+        self._stk_base_payload = {
+            "BusinessShortCode": self.business_shortcode,
+            "TransactionType": "CustomerPayBillOnline",
+            "PartyB": self.business_shortcode,
+            "CallBackURL": f"{settings.API_BASE_URL}/api/v1/payments/mpesa-callback",
+        }
+        self._balance_payload = {
+            "Initiator": settings.MPESA_INITIATOR_NAME,
+            "SecurityCredential": settings.MPESA_SECURITY_CREDENTIAL,
+            "CommandID": "AccountBalance",
+            "PartyA": self.business_shortcode,
+            "IdentifierType": "4",  # Shortcode identifier type
+            "Remarks": "Account balance query",
+            "QueueTimeOutURL": f"{settings.API_BASE_URL}/api/v1/payments/mpesa-timeout",
+            "ResultURL": f"{settings.API_BASE_URL}/api/v1/payments/mpesa-result",
+        }
         self._access_token: Optional[str] = None
         self._token_expiry: Optional[float] = None
-        self.timeout = httpx.Timeout(30.0)  # 30 seconds timeout
+        self._token_lock = asyncio.Lock()
+        # Second the cached (timestamp, password) pair was generated for; see _now_ts
+        self._cached_ts_second: Optional[int] = None
+        self._cached_ts: tuple[str, str] = ("", "")
+        # OAuth tokens are shared across clients and workers through Redis
+        self.redis = redis or get_async_redis_client()
+        self._token_cache_key = f"{TOKEN_CACHE_KEY}:{self.environment}"
+
+    @classmethod
+    def _get_http_client(cls) -> httpx.AsyncClient:
+        """Shared HTTP/2 client, created on first use, so concurrent payments multiplex over few connections."""
+        if cls._http is None:
+            cls._http = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+                ),
+            )
+        return cls._http
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP client; called on application shutdown."""
+        if cls._http is not None:
+            await cls._http.aclose()
+            cls._http = None
+
+    def _has_fresh_token(self) -> bool:
+        """Whether the in-memory access token can still be used."""
+        return bool(self._access_token and self._token_expiry and datetime.now(UTC).timestamp() < self._token_expiry)
 
     async def _get_access_token(self) -> str:
         """
         Get OAuth access token from Safaricom.
 
+        Tokens are cached in Redis for ``expires_in - TOKEN_EXPIRY_MARGIN_SECONDS``
+        so only a cache miss pays for a round trip to ``/oauth/v1/generate``. Concurrent
+        callers that find the token expired wait on one refresh instead of each fetching.
+
         Returns:
             str: Access token
 
         Raises:
             PaymentProcessingError: If token generation fails
         """
-        try:
-            if self._access_token and self._token_expiry and datetime.now(UTC).timestamp() < self._token_expiry:
-                return self._access_token
+        if self._has_fresh_token():
+            return self._access_token
 
-            credentials = f"{self.consumer_key}:{self.consumer_secret}".encode()
-            auth_string = base64.b64encode(credentials).decode("ascii")
-
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/oauth/v1/generate?grant_type=client_credentials",
-                    headers={
-                        "Authorization": f"Basic {auth_string}",
-                        "Content-Type": CONTENT_TYPE_JSON,
-                    },
-                )
-
-                if response.status_code != 200:
-                    raise PaymentProcessingError(
-                        message=f"Failed to get access token. Status: {response.status_code}",
-                        details={"response": response.text},
-                    )
-
-                data = response.json()
-                self._access_token = data["access_token"]
-                self._token_expiry = datetime.now(UTC).timestamp() + TOKEN_EXPIRY_SECONDS
+        async with self._token_lock:
+            # Another caller may have refreshed the token while this one waited
+            if self._has_fresh_token():
                 return self._access_token
+            return await self._refresh_access_token()
+
+    @mpesa_error_boundary("Network error while getting access token", "Unexpected error while getting access token")
+    async def _refresh_access_token(self) -> str:
+        """Load the access token from the shared cache, or fetch a new one from Safaricom."""
+        cached_token, ttl_ms = await self._get_cached_token()
+        if cached_token and ttl_ms > 0:
+            # Expire the in-memory copy with the shared key, which already carries the safety margin
+            self._access_token = cached_token
+            self._token_expiry = datetime.now(UTC).timestamp() + ttl_ms / 1000
+            return cached_token
+
+        response = await self._get_http_client().get(
+            self._token_url,
+            headers={
+                "Authorization": self._basic_auth_header,
+                "Content-Type": CONTENT_TYPE_JSON,
+            },
+        )
 
-        except httpx.HTTPError as e:
-            raise PaymentProcessingError(
-                message="Network error while getting access token",
-                details={"error": str(e)},
-            )
-        except Exception as e:
+        if response.status_code != 200:
             raise PaymentProcessingError(
-                message="Unexpected error while getting access token",
-                details={"error": str(e)},
+                message=f"Failed to get access token. Status: {response.status_code}",
+                details={"response": response.text},
             )
 
+        data = orjson.loads(response.content)
+        expires_in = int(data.get("expires_in", TOKEN_EXPIRY_SECONDS))
+        self._access_token = data["access_token"]
+        self._token_expiry = datetime.now(UTC).timestamp() + expires_in - TOKEN_EXPIRY_MARGIN_SECONDS
+        await self._cache_token(self._access_token, expires_in - TOKEN_EXPIRY_MARGIN_SECONDS)
+        return self._access_token
+
+    async def _get_cached_token(self) -> Tuple[Optional[str], int]:
+        """
+        Read the shared access token and its remaining TTL from Redis in one round trip.
+
+        Returns:
+            Tuple[Optional[str], int]: Token and milliseconds left on its key; ``(None, 0)``
+            on a miss, a key without expiry or a Redis outage
+        """
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.get(self._token_cache_key)
+                pipe.pttl(self._token_cache_key)
+                token, ttl_ms = await pipe.execute()
+        except RedisError:
+            logger.warning("Could not read M-PESA access token from cache", exc_info=True)
+            return None, 0
+        # PTTL is -2 for a missing key and -1 for one without expiry; neither is trustworthy
+        if token is None or ttl_ms <= 0:
+            return None, 0
+        return token, ttl_ms
+
+    async def _cache_token(self, token: str, ttl: int) -> None:
+        """Store the access token in Redis for other clients to reuse."""
+        if ttl <= 0:
+            return
+        try:
+            await self.redis.set(self._token_cache_key, token, ex=ttl)
+        except RedisError:
+            logger.warning("Could not cache M-PESA access token", exc_info=True)
+
     def _generate_password(self, timestamp: str) -> str:
         """
         Generate the M-PESA API password using the provided timestamp.
@@ -89,9 +255,30 @@ class MPESAClient:
         Returns:
             str: Base64 encoded password
         """
-        data_to_encode = f"{self.business_shortcode}{self.passkey}{timestamp}"
-        return base64.b64encode(data_to_encode.encode()).decode("ascii")
+        return _stk_password(self.business_shortcode, self.passkey, timestamp)
+
+    def _now_ts(self) -> tuple[str, str]:
+        """
+        Current M-PESA timestamp and the password derived from it.
 
+        Timestamps only have one-second resolution, so calls within the same second reuse
+        the pair instead of formatting the time and looking up the password again.
+
+        Returns:
+            tuple[str, str]: ``(timestamp, password)``
+        """
+        second = int(time.time())
+        if self._cached_ts_second != second:
+            timestamp = TimeUtils.generate_timestamp()
+            self._cached_ts = (timestamp, self._generate_password(timestamp))
+            self._cached_ts_second = second
+        return self._cached_ts
+
+    @mpesa_error_boundary(
+        "Network error during STK push request",
+        "STK push request failed",
+        context=lambda args: {"payment_id": args["payment"].id, "phone_number": args["phone_number"]},
+    )
     async def initiate_stk_push(self, payment: Payment, phone_number: str) -> Dict:
         """
         Initiate M-PESA STK Push payment.
@@ -105,77 +292,62 @@ class MPESAClient:
 
         Raises:
             PaymentProcessingError: If the request fails
+            PaymentValidationError: If the phone number is invalid
         """
         try:
-            access_token = await self._get_access_token()
-            timestamp = TimeUtils.generate_timestamp()
+            phone_number = normalize_phone_number(phone_number)
+        except ValueError as e:
+            raise PaymentValidationError(message=str(e), details={"phone_number": phone_number})
+
+        access_token = await self._get_access_token()
+        timestamp, password = self._now_ts()
+
+        payload = {
+            **self._stk_base_payload,
+            "Password": password,
+            "Timestamp": timestamp,
+            "Amount": int(payment.amount),
+            "PartyA": phone_number,
+            "PhoneNumber": phone_number,
+            "AccountReference": payment.reference,
+            "TransactionDesc": f"Payment for job {payment.job_id}",
+        }
+
+        response = await self._get_http_client().post(
+            self._stk_push_url,
+            content=orjson.dumps(payload),
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": CONTENT_TYPE_JSON,
+            },
+        )
 
-            # Format phone number (ensure it starts with 254)
-            if phone_number.startswith("0"):
-                phone_number = "254" + phone_number[1:]
-            elif phone_number.startswith("+"):
-                phone_number = phone_number[1:]
-
-            payload = {
-                "BusinessShortCode": self.business_shortcode,
-                "Password": self._generate_password(timestamp),
-                "Timestamp": timestamp,
-                "TransactionType": "CustomerPayBillOnline",
-                "Amount": int(payment.amount),
-                "PartyA": phone_number,
-                "PartyB": self.business_shortcode,
-                "PhoneNumber": phone_number,
-                "CallBackURL": f"{settings.api_base_url}/api/v1/payments/mpesa-callback",
-                "AccountReference": payment.reference,
-                "TransactionDesc": f"Payment for job {payment.job_id}",
-            }
-
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/mpesa/stkpush/v1/processrequest",
-                    json=payload,
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Content-Type": CONTENT_TYPE_JSON,
-                    },
-                )
-
-                if response.status_code != 200:
-                    raise PaymentProcessingError(
-                        message="STK push request failed",
-                        details={
-                            "status_code": response.status_code,
-                            "response": response.text,
-                            "payment_id": payment.id,
-                        },
-                    )
-
-                result = response.json()
-
-                # Validate response format
-                if "ResponseCode" in result and result["ResponseCode"] != "0":
-                    raise PaymentProcessingError(
-                        message=f"STK push request failed: {result.get('ResponseDescription', 'Unknown error')}",
-                        details={"response": result, "payment_id": payment.id},
-                    )
-
-                return result
-
-        except httpx.HTTPError as e:
+        if response.status_code != 200:
             raise PaymentProcessingError(
-                message="Network error during STK push request",
+                message="STK push request failed",
                 details={
-                    "error": str(e),
+                    "status_code": response.status_code,
+                    "response": response.text,
                     "payment_id": payment.id,
-                    "phone_number": phone_number,
                 },
             )
-        except Exception as e:
+
+        result = orjson.loads(response.content)
+
+        # Validate response format
+        if "ResponseCode" in result and result["ResponseCode"] != "0":
             raise PaymentProcessingError(
-                message=str(e),
-                details={"payment_id": payment.id, "phone_number": phone_number},
+                message=f"STK push request failed: {result.get('ResponseDescription', 'Unknown error')}",
+                details={"response": result, "payment_id": payment.id},
             )
 
+        return result
+
+    @mpesa_error_boundary(
+        "Network error checking transaction status",
+        "Failed to check transaction status",
+        context=lambda args: {"checkout_request_id": args["checkout_request_id"]},
+    )
     async def check_transaction_status(self, checkout_request_id: str) -> Dict:
         """
         Check STK Push transaction status.
@@ -189,62 +361,50 @@ class MPESAClient:
         Raises:
             PaymentProcessingError: If the status check fails
         """
-        try:
-            access_token = await self._get_access_token()
-            timestamp = TimeUtils.generate_timestamp()
+        access_token = await self._get_access_token()
+        timestamp, password = self._now_ts()
+
+        payload = {
+            "BusinessShortCode": self.business_shortcode,
+            "Password": password,
+            "Timestamp": timestamp,
+            "CheckoutRequestID": checkout_request_id,
+        }
+
+        response = await self._get_http_client().post(
+            self._stk_query_url,
+            content=orjson.dumps(payload),
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": CONTENT_TYPE_JSON,
+            },
+        )
 
-            payload = {
-                "BusinessShortCode": self.business_shortcode,
-                "Password": self._generate_password(timestamp),
-                "Timestamp": timestamp,
-                "CheckoutRequestID": checkout_request_id,
-            }
-
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/mpesa/stkpushquery/v1/query",
-                    json=payload,
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Content-Type": CONTENT_TYPE_JSON,
-                    },
-                )
-
-                if response.status_code != 200:
-                    raise PaymentProcessingError(
-                        message="Transaction status check failed",
-                        details={
-                            "status_code": response.status_code,
-                            "response": response.text,
-                            "checkout_request_id": checkout_request_id,
-                        },
-                    )
-
-                result = response.json()
-
-                # Handle different response formats
-                if "ResultCode" in result:
-                    if result["ResultCode"] != "0":
-                        return {
-                            "status": "FAILED",
-                            "reason": result.get("ResultDesc", "Unknown error"),
-                            "raw_response": result,
-                        }
-                    return {"status": "SUCCESS", "raw_response": result}
-
-                return result
-
-        except httpx.HTTPError as e:
-            raise PaymentProcessingError(
-                message="Network error checking transaction status",
-                details={"error": str(e), "checkout_request_id": checkout_request_id},
-            )
-        except Exception as e:
+        if response.status_code != 200:
             raise PaymentProcessingError(
-                message=f"Failed to check transaction status: {str(e)}",
-                details={"checkout_request_id": checkout_request_id},
+                message="Transaction status check failed",
+                details={
+                    "status_code": response.status_code,
+                    "response": response.text,
+                    "checkout_request_id": checkout_request_id,
+                },
             )
 
+        result = orjson.loads(response.content)
+
+        # Handle different response formats; no ResultCode means the query isn't settled yet
+        result_code = result.get("ResultCode")
+        if result_code is None:
+            return result
+        if result_code == "0":
+            return {"status": STK_STATUS_SUCCESS, "raw_response": result}
+        return {
+            "status": STK_STATUS_FAILED,
+            "reason": result.get("ResultDesc", "Unknown error"),
+            "raw_response": result,
+        }
+
+    @mpesa_error_boundary("Network error querying account balance", "Failed to check account balance")
     async def get_account_balance(self) -> Dict:
         """
         Query account balance.
@@ -255,45 +415,24 @@ class MPESAClient:
         Raises:
             PaymentProcessingError: If the balance query fails
         """
-        try:
-            access_token = await self._get_access_token()
-
-            payload = {
-                "Initiator": settings.mpesa_initiator_name,
-                "SecurityCredential": settings.mpesa_security_credential,
-                "CommandID": "AccountBalance",
-                "PartyA": self.business_shortcode,
-                "IdentifierType": "4",  # Shortcode identifier type
-                "Remarks": "Account balance query",
-                "QueueTimeOutURL": f"{settings.api_base_url}/api/v1/payments/mpesa-timeout",
-                "ResultURL": f"{settings.api_base_url}/api/v1/payments/mpesa-result",
-            }
-
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/mpesa/accountbalance/v1/query",
-                    json=payload,
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Content-Type": CONTENT_TYPE_JSON,
-                    },
-                )
-
-                if response.status_code != 200:
-                    raise PaymentProcessingError(
-                        message="Account balance query failed",
-                        details={
-                            "status_code": response.status_code,
-                            "response": response.text,
-                        },
-                    )
-
-                return response.json()
-
-        except httpx.HTTPError as e:
+        access_token = await self._get_access_token()
+
+        response = await self._get_http_client().post(
+            self._balance_url,
+            content=orjson.dumps(self._balance_payload),
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": CONTENT_TYPE_JSON,
+            },
+        )
+
+        if response.status_code != 200:
             raise PaymentProcessingError(
-                message="Network error querying account balance",
-                details={"error": str(e)},
+                message="Account balance query failed",
+                details={
+                    "status_code": response.status_code,
+                    "response": response.text,
+                },
             )
-        except Exception as e:
-            raise PaymentProcessingError(message=f"Failed to check account balance: {str(e)}")
+
+        return orjson.loads(response.content)
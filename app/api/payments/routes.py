@@ -1,5 +1,8 @@
+import logging
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from redis.exceptions import RedisError
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.api.auth.dependencies import get_current_user
 from app.api.jobs.service import JobService
@@ -7,9 +10,20 @@ from app.api.payments import schemas
 from app.api.payments.core import PaymentProcessor
 from app.api.payments.models import PaymentStatus
 from app.api.payments.service import PaymentService
-from app.api.payments.dependencies import get_payment_service, get_payment_processor, get_job_service
+from app.api.payments.tasks import PAYMENT_STATUS_CHECK_DELAY_SECONDS
+from app.api.shared.utils.cache import get_async_redis_client
+from app.api.shared.utils.task_queue import get_task_queue
+from app.api.payments.dependencies import (
+    get_job_service,
+    get_payment_processor,
+    get_payment_service,
+)
 from app.api.shared.utils.time import TimeUtils
 
+logger = logging.getLogger(__name__)
+
+CALLBACK_IDEMPOTENCY_TTL_SECONDS = 86400
+
 router = APIRouter(prefix="/api/v1/payments", tags=["payments"])
 
 
@@ -36,12 +50,25 @@ async def initiate_mpesa_payment(
 
     # Process M-PESA payment
     try:
-        return await payment_processor.process_mpesa_payment(payment=payment, phone_number=payment_data.phone_number)
+        payment = await payment_processor.process_mpesa_payment(payment=payment, phone_number=payment_data.phone_number)
     except Exception as e:
         # Ensure payment is marked as failed
         await payment_service.update_payment_status(payment, PaymentStatus.FAILED, provider_metadata={"error": str(e)})
         raise
 
+    # Reconcile from the worker in case the M-PESA callback never arrives
+    try:
+        await get_task_queue().enqueue(
+            "check_payment_status",
+            defer_by=PAYMENT_STATUS_CHECK_DELAY_SECONDS,
+            payment_id=payment.id,
+            checkout_request_id=payment.provider_metadata["CheckoutRequestID"],
+        )
+    except RedisError:
+        logger.exception("Failed to schedule status check for payment %s", payment.reference)
+
+    return payment
+
 
 @router.get("/{payment_id}", response_model=schemas.PaymentResponse)
 async def get_payment(
@@ -65,28 +92,66 @@ async def get_payment(
 async def list_payments(
     job_id: int = None,
     status: PaymentStatus = None,
-    skip: int = 0,
-    limit: int = 50,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
     payment_service: PaymentService = Depends(get_payment_service),
     current_user=Depends(get_current_user),
 ):
     """List user's payments."""
-    return await payment_service.list_payments(
+    payments = await payment_service.list_payments(
         user_id=current_user.id, job_id=job_id, status=status, skip=skip, limit=limit
     )
+    # The owner is the authenticated user; attach it instead of reloading it per page
+    for payment in payments:
+        set_committed_value(payment, "user", current_user)
+    return payments
 
 
 @router.post("/mpesa/callback")
-async def mpesa_callback(callback_data: dict, payment_service: PaymentService = Depends(get_payment_service)):
+async def mpesa_callback(
+    callback_data: dict,
+    payment_service: PaymentService = Depends(get_payment_service),
+):
     """Handle M-PESA payment callback."""
     checkout_request_id = callback_data.get("CheckoutRequestID")
-    result_code = callback_data.get("ResultCode")
 
     if not checkout_request_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Missing CheckoutRequestID in callback data"
         )
 
+    # Safaricom retries callbacks on timeout; only the first delivery should have side effects
+    redis = get_async_redis_client()
+    idempotency_key = f"mpesa:cb:{checkout_request_id}"
+    try:
+        first_delivery = await redis.set(idempotency_key, "1", nx=True, ex=CALLBACK_IDEMPOTENCY_TTL_SECONDS)
+    except RedisError:
+        logger.warning("Callback idempotency check unavailable for %s", checkout_request_id, exc_info=True)
+        first_delivery = True
+    if not first_delivery:
+        return {"status": "success", "message": "Already processed"}
+
+    try:
+        await _handle_mpesa_callback(callback_data, checkout_request_id, payment_service)
+    except Exception:
+        # Let Safaricom's retry through if this delivery didn't complete
+        try:
+            await redis.delete(idempotency_key)
+        except RedisError:
+            logger.warning("Failed to release callback key %s", idempotency_key, exc_info=True)
+        raise
+
+    return {"status": "success"}
+
+
+async def _handle_mpesa_callback(
+    callback_data: dict,
+    checkout_request_id: str,
+    payment_service: PaymentService,
+) -> None:
+    """Apply an M-PESA callback to its payment."""
+    result_code = callback_data.get("ResultCode")
+
     # Find payment by checkout request ID
     payment = await payment_service.get_payment_by_checkout_request_id(checkout_request_id)
 
@@ -111,5 +176,3 @@ async def mpesa_callback(callback_data: dict, payment_service: PaymentService =
             PaymentStatus.FAILED,
             provider_metadata={**callback_data, "error": callback_data.get("ResultDesc", "Payment failed")},
         )
-
-    return {"status": "success"}
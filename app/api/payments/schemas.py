@@ -3,6 +3,7 @@ from typing import Optional, Dict, Any
 from pydantic import BaseModel, Field, field_validator
 
 from app.api.payments.models import PaymentProvider, PaymentStatus
+from app.api.shared.utils.phone import normalize_phone_number
 
 
 class PaymentBase(BaseModel):
@@ -25,12 +26,8 @@ class MPESAPaymentCreate(PaymentCreate):
     @field_validator("phone_number")
     @classmethod
     def validate_phone_number(cls, v: str) -> str:
-        """Validate phone number format."""
-        if not v.startswith("254"):
-            raise ValueError("Phone number must start with 254")
-        if not v[3:].isdigit():
-            raise ValueError("Invalid phone number format")
-        return v
+        """Validate phone number format and normalize it to 254XXXXXXXXX."""
+        return normalize_phone_number(v)
 
 
 class PaymentResponse(PaymentBase):
@@ -2,9 +2,9 @@ from datetime import datetime, UTC
 from typing import List, Optional, Dict, Any
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
 from .models import Payment, PaymentStatus
 from .mpesa import MPESAClient
@@ -12,31 +12,33 @@ from .schemas import PaymentCreate
 
 
 class PaymentService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, mpesa_client: Optional[MPESAClient] = None):
         self.db = db
-        self.mpesa_client = MPESAClient()
+        self.mpesa_client = mpesa_client or MPESAClient()
 
     async def create_payment(self, payment_data: PaymentCreate, user_id: int, reference: str) -> Payment:
         """Create a new payment record"""
-        payment_dict = payment_data.model_dump()
-        payment = Payment(
-            reference=reference,
-            user_id=user_id,
-            created_at=datetime.now(UTC),
-            **payment_dict,
+        # Subclasses such as MPESAPaymentCreate carry request-only fields (phone_number)
+        payment_dict = payment_data.model_dump(include=set(PaymentCreate.model_fields))
+        stmt = (
+            insert(Payment)
+            .values(
+                reference=reference,
+                user_id=user_id,
+                created_at=datetime.now(UTC),
+                **payment_dict,
+            )
+            .returning(Payment)
         )
 
-        self.db.add(payment)
+        payment = (await self.db.execute(stmt)).scalar_one()
         await self.db.commit()
-        await self.db.refresh(payment)
         return payment
 
     async def get_payment(self, payment_id: int) -> Optional[Payment]:
         """Get payment by ID"""
         query = (
-            select(Payment)
-            .options(selectinload(Payment.job), selectinload(Payment.user))
-            .where(Payment.id == payment_id)
+            select(Payment).options(joinedload(Payment.job), joinedload(Payment.user)).where(Payment.id == payment_id)
         )
 
         result = await self.db.execute(query)
@@ -62,8 +64,15 @@ class PaymentService:
         skip: int = 0,
         limit: int = 50,
     ) -> List[Payment]:
-        """List payments with optional filters"""
-        query = select(Payment).options(selectinload(Payment.job), selectinload(Payment.user))
+        """List payments with optional filters
+
+        When filtering by ``user_id`` the caller already holds that user, so
+        ``Payment.user`` is not eager-loaded; attach it with ``set_committed_value``.
+        """
+        options = [selectinload(Payment.job)]
+        if user_id is None:
+            options.append(selectinload(Payment.user))
+        query = select(Payment).options(*options)
 
         if user_id:
             query = query.where(Payment.user_id == user_id)
@@ -72,9 +81,9 @@ class PaymentService:
         if status:
             query = query.where(Payment.status == status)
 
-        query = query.offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        query = query.offset(skip).limit(limit).execution_options(yield_per=100)
+        result = await self.db.stream_scalars(query)
+        return [payment async for payment in result]
 
     async def initiate_mpesa_payment(self, payment: Payment, phone_number: str) -> dict:
         """Initiate M-PESA payment"""
@@ -94,7 +103,6 @@ class PaymentService:
             payment.updated_at = datetime.now(UTC)
 
             await self.db.commit()
-            await self.db.refresh(payment)
 
             return response
         except Exception as e:
@@ -114,20 +122,19 @@ class PaymentService:
         provider_metadata: Optional[Dict[str, Any]] = None,
     ) -> Payment:
         """Update payment status"""
-        payment.status = new_status
-        payment.updated_at = datetime.now(UTC)
+        now = datetime.now(UTC)
+        values: Dict[str, Any] = {"status": new_status, "updated_at": now}
+
+        if new_status in [PaymentStatus.COMPLETED, PaymentStatus.FAILED]:
+            values["completed_at"] = now
 
         if provider_reference:
-            payment.provider_reference = provider_reference
+            values["provider_reference"] = provider_reference
 
         if provider_metadata:
-            if not payment.provider_metadata:
-                payment.provider_metadata = {}
-            payment.provider_metadata.update(provider_metadata)
-
-        if new_status in [PaymentStatus.COMPLETED, PaymentStatus.FAILED]:
-            payment.completed_at = datetime.now(UTC)
+            values["provider_metadata"] = {**(payment.provider_metadata or {}), **provider_metadata}
 
+        stmt = update(Payment).where(Payment.id == payment.id).values(**values).returning(Payment)
+        payment = (await self.db.execute(stmt)).scalar_one()
         await self.db.commit()
-        await self.db.refresh(payment)
         return payment
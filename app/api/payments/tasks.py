@@ -0,0 +1,49 @@
+from functools import lru_cache
+
+from app.api.payments.exceptions import PaymentProcessingError
+from app.api.payments.models import PaymentStatus
+from app.api.payments.mpesa import STK_STATUS_FAILED, STK_STATUS_SUCCESS, MPESAClient
+from app.api.payments.service import PaymentService
+from app.api.shared.database import session_scope
+
+# Give the M-PESA callback a chance to arrive before polling Safaricom
+PAYMENT_STATUS_CHECK_DELAY_SECONDS = 30
+
+
+@lru_cache
+def get_mpesa_client() -> MPESAClient:
+    """One M-PESA client per worker, so its access token is reused across tasks."""
+    return MPESAClient()
+
+
+async def check_payment_status(payment_id: int, checkout_request_id: str) -> None:
+    """Reconcile a payment with M-PESA when its callback hasn't settled it yet."""
+    async with session_scope() as db:
+        service = PaymentService(db, get_mpesa_client())
+        payment = await service.get_payment(payment_id)
+        if not payment or payment.status != PaymentStatus.PROCESSING:
+            return
+
+        result = await service.mpesa_client.check_transaction_status(checkout_request_id)
+        outcome = result.get("status")
+        if outcome == STK_STATUS_SUCCESS:
+            await service.update_payment_status(
+                payment, PaymentStatus.COMPLETED, provider_metadata=result["raw_response"]
+            )
+        elif outcome == STK_STATUS_FAILED:
+            await service.update_payment_status(
+                payment,
+                PaymentStatus.FAILED,
+                provider_metadata={**result["raw_response"], "error": result["reason"]},
+            )
+        else:
+            # Still being processed on Safaricom's side; raising schedules a retry with backoff
+            raise PaymentProcessingError(
+                message="M-PESA transaction still pending",
+                details={"payment_id": payment_id, "checkout_request_id": checkout_request_id},
+            )
+
+
+TASKS = {
+    "check_payment_status": check_payment_status,
+}
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-import os
 from enum import Enum
-from functools import lru_cache
+from functools import cached_property
+import os
 from typing import List
 
 from pydantic_settings import BaseSettings
@@ -32,10 +32,14 @@ class Settings(BaseSettings):
 
     # Database settings
     DATABASE_URL: str
-    DB_POOL_SIZE: int = 5
+    # Per worker process: WORKERS * (DB_POOL_SIZE + DB_MAX_OVERFLOW) must stay below Postgres max_connections
+    DB_POOL_SIZE: int = 10
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 1800
+    DB_QUERY_CACHE_SIZE: int = 1200  # SQLAlchemy compiled-statement LRU entries
+    DB_STATEMENT_CACHE_SIZE: int = 512  # asyncpg prepared statements per connection
+    DB_USE_PGBOUNCER: bool = False  # PgBouncer (transaction mode) pools instead; no local pool or prepared statements
     SQL_ECHO: bool = False
 
     # Docker Database Settings
@@ -49,6 +53,7 @@ class Settings(BaseSettings):
     REDIS_URL: str
     REDIS_POOL_SIZE: int = 10
     REDIS_POOL_TIMEOUT: int = 30
+    REDIS_SOCKET_TIMEOUT: float = 2.0
 
     # Security settings
     SECRET_KEY: str
@@ -57,9 +62,10 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 15
     EMAIL_VERIFICATION_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = 10  # ~4x cheaper than passlib's default of 12; still within OWASP guidance
 
     # CORS settings
-    @property
+    @cached_property
     def CORS_ORIGINS(self) -> List[str]:
         if self.ENVIRONMENT == Environment.DEVELOPMENT:
             return ["*"]
@@ -69,11 +75,11 @@ class Settings(BaseSettings):
             "https://admin.keateka.com",
         ]
 
-    @property
+    @cached_property
     def CORS_METHODS(self) -> List[str]:
         return ["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"]
 
-    @property
+    @cached_property
     def CORS_HEADERS(self) -> List[str]:
         return ["*"]
 
@@ -95,7 +101,7 @@ class Settings(BaseSettings):
     MPESA_SECURITY_CREDENTIAL: str  # For B2B/B2C transactions
     MPESA_CALLBACK_BASE_URL: str = "https://api.keateka.com"
 
-    @property
+    @cached_property
     def MPESA_CALLBACK_URLS(self) -> dict[str, str]:
         base = f"{self.MPESA_CALLBACK_BASE_URL}/api/v1/payments"
         return {
@@ -129,11 +135,11 @@ class Settings(BaseSettings):
     MAX_UPLOAD_SIZE: int = 5_242_880  # 5MB
     MAX_FILES_PER_REQUEST: int = 5
 
-    @property
+    @cached_property
     def ALLOWED_UPLOAD_EXTENSIONS(self) -> List[str]:
         return [".jpg", ".jpeg", ".png", ".pdf", ".doc", ".docx"]
 
-    @property
+    @cached_property
     def ALLOWED_IMAGE_TYPES(self) -> List[str]:
         return ["image/jpeg", "image/png"]
 
@@ -191,6 +197,8 @@ class Settings(BaseSettings):
         env_file = (".env", ".env.test")
         case_sensitive = True
         use_enum_values = True
+        # Settings are parsed once at startup and never mutated; derived values are cached below
+        frozen = True
 
     @classmethod
     def get_test_settings(cls) -> "Settings":
@@ -206,27 +214,15 @@ class Settings(BaseSettings):
     def is_testing(self) -> bool:
         return bool(self.TEST_DATABASE_URL)
 
-    @property
+    @cached_property
     def mpesa_api_url(self) -> str:
         if self.MPESA_ENVIRONMENT == "production":
             return "https://api.safaricom.co.ke"
         return "https://sandbox.safaricom.co.ke"
 
 
-settings: Settings | None = None
-
-
-def init_settings():
-    """Initialize settings based on environment."""
-    global settings
-    if settings is None:
-        settings = get_settings()
-    return settings
-
-
-@lru_cache
-def get_settings() -> Settings:
-    """Get cached settings instance."""
+def _load_settings() -> Settings:
+    """Build the settings instance for the current environment."""
     if os.getenv("ENVIRONMENT") == "test":
         return Settings(
             API_BASE_URL="http://testserver",
@@ -246,3 +242,17 @@ def get_settings() -> Settings:
             DEBUG=True,
         )
     return Settings()
+
+
+# Settings are read-only after startup, so load them once at import and share the instance
+settings: Settings = _load_settings()
+
+
+def init_settings() -> Settings:
+    """Return the settings singleton."""
+    return settings
+
+
+def get_settings() -> Settings:
+    """Return the settings singleton; kept as a shim for existing callers and dependency overrides."""
+    return settings
@@ -3,15 +3,15 @@ from datetime import datetime, timezone
 import logging
 from typing import AsyncGenerator, Optional
 
-from sqlalchemy import Column, DateTime, create_engine, text
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import Column, DateTime, text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import Session, declarative_base, sessionmaker
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
 
 from app.api.shared.config import init_settings
 
@@ -19,47 +19,47 @@ logger = logging.getLogger(__name__)
 
 settings = init_settings()
 
-# Database URL constant
-SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+# Database URL constant; a bare postgresql:// URL would pick the sync psycopg2 driver
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
 
+# The engine and session factory are module-private: use get_db / session_scope rather than
+# building another engine (and another connection pool) elsewhere.
 # Create async engine for the PostgreSQL database
-engine = create_async_engine(
+if settings.DB_USE_PGBOUNCER:
+    # PgBouncer owns pooling; server-side prepared statements don't survive its connection hand-offs
+    _pool_options = {"poolclass": NullPool}
+    _statement_cache_size = 0
+else:
+    _pool_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+    _statement_cache_size = settings.DB_STATEMENT_CACHE_SIZE
+
+_engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
     echo=settings.SQL_ECHO,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
-    pool_timeout=settings.DB_POOL_TIMEOUT,
-    pool_recycle=settings.DB_POOL_RECYCLE,
-    pool_pre_ping=True,
-)
-
-# Create sync engine for migrations and utilities
-sync_engine = create_engine(
-    SQLALCHEMY_DATABASE_URL.replace("+asyncpg", ""),
-    poolclass=QueuePool,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
-    pool_timeout=settings.DB_POOL_TIMEOUT,
-    pool_recycle=settings.DB_POOL_RECYCLE,
-    pool_pre_ping=True,
+    **_pool_options,
+    # Reuse compiled SQL across requests and keep prepared statements per connection
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    connect_args={
+        "prepared_statement_cache_size": _statement_cache_size,
+        "statement_cache_size": _statement_cache_size,
+    },
 )
 
 # Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
+_AsyncSessionLocal = async_sessionmaker(
+    _engine,
     class_=AsyncSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
 )
 
-# Create sync session factory for utilities
-SyncSessionLocal = sessionmaker(
-    sync_engine,
-    autocommit=False,
-    autoflush=False,
-)
-
 # Base class for declarative models
 Base = declarative_base()
 
@@ -92,28 +92,44 @@ class DatabaseManager:
         """
         Check database connection health.
 
+        Uses a plain pooled connection rather than ``begin()`` so the probe
+        costs a single ``SELECT 1`` instead of BEGIN/SELECT/COMMIT.
+
         Returns:
             bool: True if connection is healthy, False otherwise
         """
         try:
-            async with engine.begin() as conn:
+            async with _engine.connect() as conn:
                 await conn.execute(text("SELECT 1"))
             return True
         except SQLAlchemyError as e:
-            logger.exception(f"Database connection check failed: {e!s}")
+            logger.exception("Database connection check failed: %s", e)
             return False
 
     @staticmethod
     async def close_connections() -> None:
         """Close all database connections."""
         try:
-            await engine.dispose()
-            sync_engine.dispose()
+            await _engine.dispose()
         except Exception as e:
-            logger.exception(f"Error closing database connections: {e!s}")
+            logger.exception("Error closing database connections: %s", e)
             raise DatabaseError("Failed to close database connections") from e
 
 
+def violated_constraint(error: IntegrityError) -> Optional[str]:
+    """
+    Name of the constraint or unique index an IntegrityError reports, if the driver exposes it.
+
+    asyncpg carries ``constraint_name`` on its own exception, which SQLAlchemy's adapted
+    DBAPI error chains as its ``__cause__``.
+    """
+    for candidate in (error.orig, getattr(error.orig, "__cause__", None)):
+        name = getattr(candidate, "constraint_name", None)
+        if name:
+            return name
+    return None
+
+
 class TimestampMixin:
     """Mixin that adds created_at and updated_at timestamps."""
 
@@ -146,11 +162,28 @@ async def transaction(session: AsyncSession):
             yield session
     except Exception as e:
         await session.rollback()
-        logger.exception(f"Transaction error: {e!s}")
+        logger.exception("Transaction error: %s", e)
         msg = f"Transaction failed: {e!s}"
         raise DatabaseError(msg) from e
 
 
+@asynccontextmanager
+async def session_scope() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for code running outside a request, such as background tasks.
+
+    Usage:
+        async with session_scope() as db:
+            await db.execute(...)
+    """
+    async with _AsyncSessionLocal() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency function that yields async db sessions and handles cleanup.
@@ -160,28 +193,12 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         async def get_users(db: AsyncSession = Depends(get_db)):
             ...
     """
-    async with AsyncSessionLocal() as session:
+    async with _AsyncSessionLocal() as session:
         try:
             yield session
         except Exception as e:
-            logger.exception(f"Database session error: {e!s}")
+            logger.exception("Database session error: %s", e)
             await session.rollback()
             raise DatabaseError("Database session error") from e
         finally:
             await session.close()
-
-
-@asynccontextmanager
-async def get_sync_db() -> Session:
-    """
-    Context manager for synchronous database sessions.
-
-    Usage:
-        async with get_sync_db() as db:
-            db.query(User).all()
-    """
-    db = SyncSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
@@ -3,7 +3,7 @@ import time
 from typing import Optional
 
 from fastapi import HTTPException, Request
-from redis import Redis
+from redis.asyncio import Redis
 
 
 class RateLimiter:
@@ -0,0 +1,56 @@
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class LogRequestsMiddleware:
+    """
+    Log the start, outcome and duration of every HTTP request.
+
+    Written as plain ASGI rather than ``BaseHTTPMiddleware`` so each request costs one wrapped
+    ``send`` instead of an extra task and memory stream around the response body.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Monotonic and sub-microsecond; wall-clock time can jump between the two reads
+        start = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        status_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # Set on request.state by RequestIDMiddleware, which runs outside this one
+        request_id = scope.get("state", {}).get("request_id", "unknown")
+        logger.info("Request started | ID: %s | Method: %s | Path: %s", request_id, method, path)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            logger.exception(
+                "Request failed | ID: %s | Method: %s | Path: %s | Error: %s", request_id, method, path, str(e)
+            )
+            raise
+
+        logger.info(
+            "Request completed | ID: %s | Method: %s | Path: %s | Status: %s | Time: %.2fms",
+            request_id,
+            method,
+            path,
+            status_code,
+            (time.perf_counter() - start) * 1000,
+        )
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
 import json
 import logging
 from typing import Awaitable, Callable
 
 from fastapi import WebSocket, WebSocketDisconnect
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent sends per broadcast so large groups don't flood the event loop
+BROADCAST_CONCURRENCY = 256
+
 
 class WebSocketConnectionManager:
     """Manages WebSocket connections and broadcasting."""
@@ -52,21 +57,54 @@ class WebSocketConnectionManager:
         group: str = "default",
         exclude: str | None = None,
     ) -> None:
-        """Broadcast a message to all clients in a group."""
-        if group in self.active_connections:
-            for client_id, websocket in self.active_connections[group].items():
+        """Broadcast a message to all clients in a group.
+
+        The frame is serialized once with orjson and handed to ``broadcast_bytes``.
+        """
+        if not self.active_connections.get(group):
+            return
+
+        frame = orjson.dumps({"timestamp": datetime.now(tz=timezone.utc).isoformat(), "data": message})
+        await self.broadcast_bytes(frame, group, exclude)
+
+    async def broadcast_bytes(
+        self,
+        payload: bytes,
+        group: str = "default",
+        exclude: str | None = None,
+    ) -> None:
+        """Send an already-serialized JSON payload to all clients in a group.
+
+        No per-connection encoding happens here: the payload is sent as-is to every client
+        concurrently (bounded by ``BROADCAST_CONCURRENCY``) so a single slow client doesn't
+        hold up the rest. Frames stay text frames so existing clients keep parsing them.
+        """
+        connections = self.active_connections.get(group)
+        if not connections:
+            return
+
+        frame = payload.decode()
+        semaphore = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+        dead: list[str] = []
+
+        async def _send(client_id: str, websocket: WebSocket) -> None:
+            async with semaphore:
+                try:
+                    await websocket.send_text(frame)
+                except WebSocketDisconnect:
+                    dead.append(client_id)
+                except Exception:
+                    # Any failed send must stay local, or the TaskGroup cancels every other client's send
+                    logger.warning("Dropping client %s after failed send to group %s", client_id, group, exc_info=True)
+                    dead.append(client_id)
+
+        async with asyncio.TaskGroup() as tg:
+            for client_id, websocket in list(connections.items()):
                 if client_id != exclude:
-                    try:
-                        await websocket.send_json(
-                            {
-                                "timestamp": datetime.now(
-                                    tz=timezone.utc
-                                ).isoformat(),  # Fixed to timezone-aware timestamp
-                                "data": message,
-                            }
-                        )
-                    except WebSocketDisconnect:
-                        await self.disconnect(client_id, group)
+                    tg.create_task(_send(client_id, websocket))
+
+        for client_id in dead:
+            await self.disconnect(client_id, group)
 
     def register_handler(self, event_type: str, handler: Callable[[str, dict], Awaitable[None]]) -> None:
         """Register a handler for specific event types."""
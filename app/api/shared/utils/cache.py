@@ -1,16 +1,24 @@
 from datetime import timedelta
-from functools import wraps
+from functools import lru_cache, wraps
 import logging
 import pickle
 from typing import Any, Callable, Optional, Union
 
-from redis import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
 
 logger = logging.getLogger(__name__)
 
+# Keys unlinked per pipeline round-trip when clearing a pattern
+DELETE_BATCH_SIZE = 500
+
 
 class CacheManager:
-    """Cache manager for Redis backend."""
+    """
+    Cache manager for Redis backend.
+
+    Values are pickled, so the client must be built with ``decode_responses=False``
+    (``get_async_redis_client(decode_responses=False)``).
+    """
 
     def __init__(self, redis_client: Redis, prefix: str = "cache") -> None:
         self.redis = redis_client
@@ -29,12 +37,12 @@ class CacheManager:
             default: Default value if key not found
         """
         try:
-            value = self.redis.get(self._get_key(key))
+            value = await self.redis.get(self._get_key(key))
             if value is None:
                 return default
             return pickle.loads(value)
         except Exception as e:
-            logger.exception(f"Error retrieving from cache: {e!s}")
+            logger.exception("Error retrieving from cache: %s", e)
             return default
 
     async def set(
@@ -56,43 +64,63 @@ class CacheManager:
             if isinstance(expires_in, timedelta):
                 expires_in = int(expires_in.total_seconds())
 
-            return bool(self.redis.set(self._get_key(key), serialized, ex=expires_in))
+            return bool(await self.redis.set(self._get_key(key), serialized, ex=expires_in))
         except Exception as e:
-            logger.exception(f"Error setting cache: {e!s}")
+            logger.exception("Error setting cache: %s", e)
             return False
 
     async def delete(self, key: str) -> bool:
         """Delete value from cache."""
         try:
-            return bool(self.redis.delete(self._get_key(key)))
+            return bool(await self.redis.delete(self._get_key(key)))
         except Exception as e:
-            logger.exception(f"Error deleting from cache: {e!s}")
+            logger.exception("Error deleting from cache: %s", e)
             return False
 
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
         try:
-            return bool(self.redis.exists(self._get_key(key)))
+            return bool(await self.redis.exists(self._get_key(key)))
         except Exception as e:
-            logger.exception(f"Error checking cache existence: {e!s}")
+            logger.exception("Error checking cache existence: %s", e)
             return False
 
     async def delete_pattern(self, pattern: str) -> bool:
-        """Delete keys matching pattern."""
+        """
+        Delete keys matching pattern.
+
+        Uses incremental SCAN rather than KEYS so Redis is never blocked walking the
+        whole keyspace, and UNLINK so large values are freed off the main thread.
+        """
         try:
-            keys = self.redis.keys(self._get_key(pattern))
-            if keys:
-                return bool(self.redis.delete(*keys))
+            pipe = self.redis.pipeline(transaction=False)
+            batch = []
+            async for key in self.redis.scan_iter(match=self._get_key(pattern), count=1000):
+                batch.append(key)
+                if len(batch) >= DELETE_BATCH_SIZE:
+                    pipe.unlink(*batch)
+                    await pipe.execute()
+                    batch.clear()
+            if batch:
+                pipe.unlink(*batch)
+                await pipe.execute()
             return True
         except Exception as e:
-            logger.exception(f"Error deleting pattern from cache: {e!s}")
+            logger.exception("Error deleting pattern from cache: %s", e)
             return False
 
 
+def _cache_key_part(value: Any) -> str:
+    """Render an argument for a cache key; ORM/user objects are keyed by their id."""
+    identity = getattr(value, "id", None)
+    return str(identity) if identity is not None else str(value)
+
+
 def cached(
     expire: Optional[Union[int, timedelta]] = None,
     key_prefix: str = "cache",
     key_builder: Optional[Callable[..., str]] = None,
+    vary_on: tuple[str, ...] = (),
 ):
     """
     Decorator for caching function results.
@@ -101,11 +129,13 @@ def cached(
         expire: Cache expiration time
         key_prefix: Prefix for cache keys
         key_builder: Custom function to build cache key
+        vary_on: Keyword arguments (e.g. ``current_user``) that scope the entry; they
+            lead the key so ``delete_pattern(f"{func}:{user_id}:*")`` drops one user's entries
 
     Usage:
-        @cached(expire=300)
-        async def get_user_data(user_id: int):
-            return await db.fetch_user(user_id)
+        @cached(expire=300, vary_on=("current_user",))
+        async def list_jobs(self, current_user: User, status: str | None = None):
+            return await db.fetch_jobs(current_user.id, status)
     """
 
     def decorator(func):
@@ -122,10 +152,11 @@ def cached(
             if key_builder:
                 cache_key = key_builder(*args, **kwargs)
             else:
-                # Default key builder using function name and arguments
-                arg_str = ":".join(str(arg) for arg in args[1:])  # Skip self
-                kwarg_str = ":".join(f"{k}={v}" for k, v in kwargs.items())
-                cache_key = f"{func.__name__}:{arg_str}:{kwarg_str}"
+                # Default key builder: scope first, then every argument in a stable order
+                scope = ":".join(_cache_key_part(kwargs.get(name)) for name in vary_on)
+                arg_str = ":".join(_cache_key_part(arg) for arg in args[1:])  # Skip self
+                kwarg_str = ":".join(f"{k}={_cache_key_part(v)}" for k, v in sorted(kwargs.items()))
+                cache_key = f"{func.__name__}:{scope}:{arg_str}:{kwarg_str}"
 
             # Try to get from cache
             cached_value = await cache.get(cache_key)
@@ -174,10 +205,7 @@ def invalidate_cache(
             result = await func(*args, **kwargs)
 
             # Delete matching cache keys
-            pattern = cache._get_key(key_pattern)
-            keys = redis_client.keys(pattern)
-            if keys:
-                redis_client.delete(*keys)
+            await cache.delete_pattern(key_pattern)
 
             return result
 
@@ -186,13 +214,36 @@ def invalidate_cache(
     return decorator
 
 
-async def get_redis_client() -> Redis:
-    """Dependency to get Redis client."""
-    from app.shared.config import settings
+def _pool_options(decode_responses: bool) -> dict[str, Any]:
+    """
+    Connection pool settings for the shared clients.
+
+    Pools block for up to ``REDIS_POOL_TIMEOUT`` when exhausted instead of raising,
+    and the RESP reply parser is hiredis (via the ``redis[hiredis]`` extra), which
+    redis-py selects automatically when it is installed.
+    """
+    from app.api.shared.config import get_settings
+
+    settings = get_settings()
+    return {
+        "max_connections": settings.REDIS_POOL_SIZE,
+        "timeout": settings.REDIS_POOL_TIMEOUT,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_keepalive": True,
+        "encoding": "utf-8",
+        "decode_responses": decode_responses,
+    }
+
+
+@lru_cache
+def get_async_redis_client(decode_responses: bool = True) -> Redis:
+    """
+    Get the process-wide asyncio Redis client.
+
+    The client owns a connection pool, so it is built once (per ``decode_responses``
+    flavour) and shared rather than per request.
+    """
+    from app.api.shared.config import get_settings
 
-    return Redis.from_url(
-        settings.REDIS_URL,
-        encoding="utf-8",
-        decode_responses=True,
-        max_connections=settings.REDIS_POOL_SIZE,
-    )
+    pool = BlockingConnectionPool.from_url(get_settings().REDIS_URL, **_pool_options(decode_responses))
+    return Redis(connection_pool=pool)
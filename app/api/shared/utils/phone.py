@@ -0,0 +1,28 @@
+import re
+
+# Optional +254 / 254 / 0 prefix followed by the 9-digit subscriber number. Digits are ASCII
+# only: \d and str.isdigit() also accept e.g. Arabic-Indic digits, which M-PESA rejects
+_PHONE_RE = re.compile(r"(?:\+?254|0)?([0-9]{9})", re.ASCII)
+
+
+def normalize_phone_number(phone_number: str) -> str:
+    """
+    Normalize a Kenyan phone number to the 254XXXXXXXXX form M-PESA expects.
+
+    Args:
+        phone_number: Number as entered, e.g. 0712345678, +254712345678 or 254712345678
+
+    Returns:
+        Canonical 12-digit number
+
+    Raises:
+        ValueError: If the number isn't a valid Kenyan mobile number
+    """
+    # Request schemas normalize before the payment layer sees the number; pass those through as-is
+    if len(phone_number) == 12 and phone_number.startswith("254") and phone_number.isascii() and phone_number.isdigit():
+        return phone_number
+
+    match = _PHONE_RE.fullmatch(phone_number.strip())
+    if not match:
+        raise ValueError("Invalid phone number format")
+    return "254" + match.group(1)
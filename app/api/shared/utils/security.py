@@ -2,18 +2,25 @@ import base64
 import hashlib
 import logging
 import secrets
+import string
 from typing import Optional, Tuple
 
 from cryptography.fernet import Fernet
 
 logger = logging.getLogger(__name__)
 
+_FILENAME_ALLOWED = frozenset(string.ascii_letters + string.digits + "._-")
+_FILENAME_TRANSLATE = str.maketrans({chr(i): None for i in range(128) if chr(i) not in _FILENAME_ALLOWED})
+
 
 class SecurityUtils:
     """Utility class for security operations."""
 
     def __init__(self, secret_key: str) -> None:
         self.secret_key = secret_key
+        # blake2b keys are capped at 64 bytes; longer secrets are digested down to fit
+        key = secret_key.encode()
+        self._hash_key = key if len(key) <= hashlib.blake2b.MAX_KEY_SIZE else hashlib.blake2b(key).digest()
         self.fernet = Fernet(base64.urlsafe_b64encode(hashlib.sha256(secret_key.encode()).digest()))
 
     def encrypt_data(self, data: str) -> str:
@@ -29,7 +36,7 @@ class SecurityUtils:
         try:
             return self.fernet.encrypt(data.encode()).decode()
         except Exception as e:
-            logger.exception(f"Encryption error: {e!s}")
+            logger.exception("Encryption error: %s", e)
             raise
 
     def decrypt_data(self, encrypted_data: str) -> str:
@@ -45,7 +52,7 @@ class SecurityUtils:
         try:
             return self.fernet.decrypt(encrypted_data.encode()).decode()
         except Exception as e:
-            logger.exception(f"Decryption error: {e!s}")
+            logger.exception("Decryption error: %s", e)
             raise
 
     @staticmethod
@@ -81,7 +88,7 @@ class SecurityUtils:
         Returns:
             Hash string
         """
-        return hashlib.sha256(f"{data}{self.secret_key}".encode()).hexdigest()
+        return hashlib.blake2b(data.encode(), key=self._hash_key, digest_size=32).hexdigest()
 
     @staticmethod
     def sanitize_filename(filename: str) -> str:
@@ -94,7 +101,7 @@ class SecurityUtils:
         Returns:
             Sanitized filename
         """
-        return "".join(c for c in filename if c.isalnum() or c in "._-")
+        return filename.encode("ascii", "ignore").decode("ascii").translate(_FILENAME_TRANSLATE)
 
     @staticmethod
     def validate_file_size(file_size: int, max_size: int) -> bool:
@@ -0,0 +1,132 @@
+import asyncio
+from functools import lru_cache
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.api.shared.utils.cache import get_async_redis_client
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "tasks:scheduled"
+DEFAULT_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY_SECONDS = 5
+LEASE_SECONDS = 300  # A claimed task reappears if its worker dies before finishing it
+
+TaskHandler = Callable[..., Awaitable[None]]
+
+# Move every due task's score forward by the lease in one atomic step, so exactly one
+# worker sees it until the lease runs out.
+_CLAIM_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[3])
+for _, member in ipairs(due) do
+    redis.call('ZADD', KEYS[1], ARGV[2], member)
+end
+return due
+"""
+
+
+class TaskQueue:
+    """
+    Durable task queue backed by a Redis sorted set scored by run-at time.
+
+    Tasks live in Redis rather than the API process, so they survive restarts and are
+    executed by a separate worker (``python -m app.worker``). Delivery is at-least-once:
+    handlers must be idempotent.
+
+    Deliberately small rather than arq or Celery: the only needs are delayed tasks with
+    retries, which one sorted set on the existing Redis client covers without adding a
+    dependency and its own connection handling. Reach for arq once cron jobs, results or
+    per-task timeouts are needed.
+    """
+
+    def __init__(self, redis: Optional[Redis] = None, key: str = QUEUE_KEY) -> None:
+        self.redis = redis or get_async_redis_client()
+        self.key = key
+        self._claim = self.redis.register_script(_CLAIM_SCRIPT)
+
+    async def enqueue(
+        self, name: str, *, defer_by: float = 0, max_attempts: int = DEFAULT_MAX_ATTEMPTS, **kwargs: Any
+    ) -> str:
+        """
+        Schedule a task.
+
+        Args:
+            name: Registered handler name
+            defer_by: Seconds to wait before the task becomes due
+            max_attempts: Attempts before the task is dropped
+            **kwargs: JSON-serializable handler arguments
+
+        Returns:
+            Task ID
+        """
+        task = {"id": uuid4().hex, "name": name, "kwargs": kwargs, "attempt": 0, "max_attempts": max_attempts}
+        await self.redis.zadd(self.key, {orjson.dumps(task): time.time() + defer_by})
+        return task["id"]
+
+    async def run_worker(
+        self, handlers: Dict[str, TaskHandler], poll_interval: float = 1.0, batch_size: int = 10
+    ) -> None:
+        """Claim and execute due tasks until cancelled."""
+        logger.info("Task worker started with handlers: %s", ", ".join(sorted(handlers)))
+        while True:
+            now = time.time()
+            try:
+                members: List[str] = await self._claim(keys=[self.key], args=[now, now + LEASE_SECONDS, batch_size])
+            except RedisError:
+                logger.exception("Could not claim tasks, retrying in %ss", poll_interval)
+                members = []
+            if not members:
+                await asyncio.sleep(poll_interval)
+                continue
+            await asyncio.gather(*(self._execute_guarded(member, handlers) for member in members))
+
+    async def _execute_guarded(self, member: str, handlers: Dict[str, TaskHandler]) -> None:
+        """Run one task without letting its bookkeeping errors take down the worker."""
+        try:
+            await self._execute(member, handlers)
+        except Exception:
+            # The task keeps its lease score, so it is claimed again once the lease runs out
+            logger.exception("Could not settle task %s", member)
+
+    async def _execute(self, member: str, handlers: Dict[str, TaskHandler]) -> None:
+        try:
+            task = orjson.loads(member)
+        except orjson.JSONDecodeError:
+            logger.error("Dropping malformed task %s", member)
+            await self.redis.zrem(self.key, member)
+            return
+        handler = handlers.get(task["name"])
+        if handler is None:
+            logger.error("No handler registered for task %s (%s)", task["name"], task["id"])
+            await self.redis.zrem(self.key, member)
+            return
+
+        try:
+            await handler(**task["kwargs"])
+        except Exception:
+            task["attempt"] += 1
+            if task["attempt"] >= task["max_attempts"]:
+                logger.exception("Task %s (%s) failed permanently", task["name"], task["id"])
+                await self.redis.zrem(self.key, member)
+                return
+
+            delay = RETRY_BASE_DELAY_SECONDS * 2 ** (task["attempt"] - 1)
+            logger.exception("Task %s (%s) failed, retrying in %ss", task["name"], task["id"], delay)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.zrem(self.key, member)
+                pipe.zadd(self.key, {orjson.dumps(task): time.time() + delay})
+                await pipe.execute()
+        else:
+            await self.redis.zrem(self.key, member)
+
+
+@lru_cache
+def get_task_queue() -> TaskQueue:
+    """Get the process-wide task queue."""
+    return TaskQueue()
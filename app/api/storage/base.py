@@ -1,4 +1,3 @@
-from sqlalchemy.ext.declarative import declarative_base
-
-# Base class for SQLAlchemy models
-Base = declarative_base()
+# Re-export the one declarative Base so every model shares a registry and metadata;
+# string relationships such as relationship("User") can't resolve across two registries
+from app.api.shared.database import Base  # noqa: F401
@@ -1,29 +1,3 @@
-from typing import AsyncGenerator
+from app.api.shared.database import get_db
 
-from sqlalchemy.ext.asyncio import AsyncSession
-
-# This is a placeholder for the actual database session dependency
-# In a real application, this would be set up with the database connection
-
-
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """
-    Dependency for getting a database session.
-
-    This is a placeholder implementation. In a real application, this would:
-    1. Acquire a connection from a connection pool
-    2. Create a session
-    3. Yield the session for use in an endpoint
-    4. Ensure the session is closed when done
-
-    For now, this raises NotImplementedError to indicate it needs implementation.
-    """
-    # In a real implementation, this would be something like:
-    # async with async_session_maker() as session:
-    #     try:
-    #         yield session
-    #     finally:
-    #         await session.close()
-
-    # For now, raise an exception to indicate this needs implementation
-    raise NotImplementedError("Database session dependency not implemented yet")
+__all__ = ["get_db"]
@@ -1,42 +1,71 @@
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Awaitable, Callable
+from typing import AsyncGenerator
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
-from starlette.responses import Response
 
 from app.api.auth.routes import router as auth_router
-from app.api.jobs.routes import (
-    router as jobs_router,
-    websocket_router as jobs_ws_router,
-)
+from app.api.jobs.resources import router as jobs_router
 from app.api.location.routes import router as location_router
+from app.api.location.writer import get_location_writer
+from app.api.notifications.firebase import FirebaseHandler, get_firebase_handler
 from app.api.notifications.routes import router as notifications_router
+from app.api.payments.mpesa import MPESAClient
 from app.api.payments.routes import router as payments_router
 from app.api.shared.config import settings
 from app.api.shared.database import DatabaseManager
 from app.api.shared.middleware.error_handler import setup_error_handlers
 from app.api.shared.middleware.request_id import RequestIDMiddleware
+from app.api.shared.middleware.request_logging import LogRequestsMiddleware
 from app.api.shared.middleware.timing import TimingMiddleware
 
 # Configure logging
 logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL), format=settings.LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
+# How often the background probe refreshes the database status reported by /health
+HEALTH_CHECK_INTERVAL_SECONDS = 2.0
+
+
+async def refresh_db_health(app: FastAPI) -> None:
+    """Keep ``app.state.db_healthy`` current so /health answers without touching the database."""
+    while True:
+        await asyncio.sleep(HEALTH_CHECK_INTERVAL_SECONDS)
+        try:
+            app.state.db_healthy = await DatabaseManager.check_connection()
+        except Exception:
+            logger.exception("Database health probe failed")
+            app.state.db_healthy = False
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager for startup and shutdown events."""
     logger.info("Starting up application...")
+    location_writer_task = None
+    health_task = None
     try:
         # Check database connection
         if not await DatabaseManager.check_connection():
             raise ConnectionError("Could not connect to database")
         logger.info("Database connection established successfully")
+        app.state.db_healthy = True
+        health_task = asyncio.create_task(refresh_db_health(app))
+
+        # Loading the service account and initializing firebase_admin is blocking I/O;
+        # do it once off the event loop rather than inside the first request that notifies
+        await asyncio.to_thread(get_firebase_handler)
+
+        # One M-PESA client for the app, so its in-memory access token survives between requests
+        app.state.mpesa_client = MPESAClient()
+
+        # Location updates are queued by requests and written in batches by this task
+        location_writer_task = asyncio.create_task(get_location_writer().run())
 
         # Additional startup tasks could go here
         logger.info("Application startup completed successfully")
@@ -48,56 +77,29 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     finally:
         logger.info("Shutting down application...")
+        if health_task is not None:
+            health_task.cancel()
+            await asyncio.gather(health_task, return_exceptions=True)
+        if location_writer_task is not None:
+            # Cancelling flushes the updates still queued, so do it before closing the database
+            location_writer_task.cancel()
+            await asyncio.gather(location_writer_task, return_exceptions=True)
         try:
             await DatabaseManager.close_connections()
             logger.info("Database connections closed successfully")
         except Exception as e:
             logger.error("Error during cleanup: %s", str(e))
+        try:
+            await FirebaseHandler.aclose()
+        except Exception as e:
+            logger.error("Error closing FCM client: %s", str(e))
+        try:
+            await MPESAClient.aclose()
+        except Exception as e:
+            logger.error("Error closing M-PESA client: %s", str(e))
         logger.info("Cleanup completed")
 
 
-async def gzip_middleware(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
-    middleware = GZipMiddleware(app_=None)  # type: ignore
-    return await middleware(request, call_next)
-
-
-async def logging_middleware(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
-    start_time = time.time()
-    request_id = getattr(request.state, "request_id", "unknown")
-
-    logger.info(
-        "Request started | ID: %s | Method: %s | Path: %s",
-        request_id,
-        request.method,
-        request.url.path,
-    )
-
-    try:
-        response = await call_next(request)
-        process_time = (time.time() - start_time) * 1000
-
-        logger.info(
-            "Request completed | ID: %s | Method: %s | Path: %s | Status: %s | Time: %.2fms",
-            request_id,
-            request.method,
-            request.url.path,
-            response.status_code,
-            process_time,
-        )
-
-        return response
-
-    except Exception as e:
-        logger.exception(
-            "Request failed | ID: %s | Method: %s | Path: %s | Error: %s",
-            request_id,
-            request.method,
-            request.url.path,
-            str(e),
-        )
-        raise
-
-
 def create_application() -> FastAPI:
     """Create and configure the FastAPI application."""
     fast_app = FastAPI(
@@ -119,9 +121,9 @@ def create_application() -> FastAPI:
         allow_headers=settings.CORS_HEADERS,
     )
 
-    # Add other middlewares
-    fast_app.middleware("http")(gzip_middleware)
-    fast_app.middleware("http")(logging_middleware)
+    # Add other middlewares; both are plain ASGI, so neither adds a task or stream per request
+    fast_app.add_middleware(GZipMiddleware, minimum_size=500)
+    fast_app.add_middleware(LogRequestsMiddleware)
 
     # Add request ID and timing middlewares
     fast_app.add_middleware(RequestIDMiddleware)
@@ -138,8 +140,8 @@ app = create_application()
 
 @app.get("/health")
 async def health_check() -> JSONResponse:
-    """Health check endpoint for monitoring."""
-    db_healthy = await DatabaseManager.check_connection()
+    """Health check endpoint for monitoring; reports the status cached by the background probe."""
+    db_healthy = getattr(app.state, "db_healthy", False)
 
     status = "healthy" if db_healthy else "unhealthy"
     status_code = 200 if db_healthy else 503
@@ -158,13 +160,12 @@ async def health_check() -> JSONResponse:
 # API Routes
 api_v1_prefix = settings.API_V1_PREFIX
 
-# Core feature routers
-app.include_router(auth_router, prefix=api_v1_prefix)
+# Core feature routers; all but jobs already carry the /api/v1 prefix themselves
+app.include_router(auth_router)
 app.include_router(jobs_router, prefix=api_v1_prefix)
-app.include_router(jobs_ws_router, prefix=api_v1_prefix)
-app.include_router(notifications_router, prefix=api_v1_prefix)
-app.include_router(payments_router, prefix=api_v1_prefix)
-app.include_router(location_router, prefix=api_v1_prefix)
+app.include_router(notifications_router)
+app.include_router(payments_router)
+app.include_router(location_router)
 
 
 @app.get("/")
@@ -0,0 +1,41 @@
+"""jobs keyset pagination indexes
+
+Revision ID: 0b6e3f95d2a8
+Revises: f2c8d41a6b07
+Create Date: 2026-10-16 12:31:47.209316
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0b6e3f95d2a8"
+down_revision: Union[str, None] = "f2c8d41a6b07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_jobs_client_created_id",
+            "jobs",
+            ["client_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_jobs_cleaner_created_id",
+            "jobs",
+            ["cleaner_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_jobs_cleaner_created_id", table_name="jobs", postgresql_concurrently=True)
+        op.drop_index("ix_jobs_client_created_id", table_name="jobs", postgresql_concurrently=True)
@@ -0,0 +1,70 @@
+"""notification native enums
+
+Revision ID: 3c9a7e12f4d8
+Revises: 0b6e3f95d2a8
+Create Date: 2026-10-16 14:08:22.614035
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9a7e12f4d8"
+down_revision: Union[str, None] = "0b6e3f95d2a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+notification_type = postgresql.ENUM("email", "sms", "push", name="notification_type")
+notification_status = postgresql.ENUM("pending", "sent", "failed", name="notification_status")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    notification_type.create(bind, checkfirst=True)
+    notification_status.create(bind, checkfirst=True)
+
+    op.execute("UPDATE notifications SET status = 'pending' WHERE status IS NULL")
+    op.alter_column(
+        "notifications",
+        "type",
+        existing_type=sa.String(),
+        type_=notification_type,
+        postgresql_using="type::notification_type",
+        existing_nullable=False,
+    )
+    op.alter_column(
+        "notifications",
+        "status",
+        existing_type=sa.String(),
+        type_=notification_status,
+        postgresql_using="status::notification_status",
+        nullable=False,
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "notifications",
+        "status",
+        existing_type=notification_status,
+        type_=sa.String(),
+        postgresql_using="status::text",
+        nullable=True,
+    )
+    op.alter_column(
+        "notifications",
+        "type",
+        existing_type=notification_type,
+        type_=sa.String(),
+        postgresql_using="type::text",
+        existing_nullable=False,
+    )
+
+    bind = op.get_bind()
+    notification_status.drop(bind, checkfirst=True)
+    notification_type.drop(bind, checkfirst=True)
@@ -0,0 +1,43 @@
+"""add job owner/status composite indexes
+
+Revision ID: 4d7e2a91c5b3
+Revises: 9b900a086fe3
+Create Date: 2026-10-16 09:12:41.208317
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4d7e2a91c5b3"
+down_revision: Union[str, None] = "9b900a086fe3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_jobs_client_status",
+            "jobs",
+            ["client_id", "status"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_jobs_cleaner_status",
+            "jobs",
+            ["cleaner_id", "status"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_jobs_cleaner_status", table_name="jobs", postgresql_concurrently=True)
+        op.drop_index("ix_jobs_client_status", table_name="jobs", postgresql_concurrently=True)
@@ -0,0 +1,42 @@
+"""notification data jsonb
+
+Revision ID: 7d41b8c0e6a3
+Revises: 3c9a7e12f4d8
+Create Date: 2026-10-16 14:31:47.208519
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7d41b8c0e6a3"
+down_revision: Union[str, None] = "3c9a7e12f4d8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "notifications",
+        "data",
+        existing_type=sa.String(),
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        postgresql_using="data::jsonb",
+        existing_nullable=True,
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "notifications",
+        "data",
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        type_=sa.String(),
+        postgresql_using="data::text",
+        existing_nullable=True,
+    )
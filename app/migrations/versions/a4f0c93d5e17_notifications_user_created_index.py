@@ -0,0 +1,34 @@
+"""notifications user created index
+
+Revision ID: a4f0c93d5e17
+Revises: 7d41b8c0e6a3
+Create Date: 2026-10-16 14:52:03.771246
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4f0c93d5e17"
+down_revision: Union[str, None] = "7d41b8c0e6a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_notifications_user_created",
+            "notifications",
+            ["user_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_notifications_user_created", table_name="notifications", postgresql_concurrently=True)
@@ -0,0 +1,27 @@
+"""add user fcm token
+
+Revision ID: a83f6c02d9e1
+Revises: 4d7e2a91c5b3
+Create Date: 2026-10-16 10:02:17.554091
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a83f6c02d9e1"
+down_revision: Union[str, None] = "4d7e2a91c5b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("fcm_token", sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "fcm_token")
@@ -0,0 +1,53 @@
+"""jobs status check constraint
+
+Revision ID: e5b19c07a2f4
+Revises: a83f6c02d9e1
+Create Date: 2026-10-16 11:24:40.318207
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b19c07a2f4"
+down_revision: Union[str, None] = "a83f6c02d9e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JOB_STATUSES = ("pending", "scheduled", "in_progress", "completed", "paid", "canceled")
+
+
+def upgrade() -> None:
+    # SQLAEnum persisted member names ('PENDING', 'IN_PROGRESS'); the CHECK expects the values
+    op.execute("UPDATE jobs SET status = lower(status) WHERE status <> lower(status)")
+    op.execute("UPDATE jobs SET status = 'pending' WHERE status IS NULL")
+    op.alter_column(
+        "jobs",
+        "status",
+        existing_type=sa.String(),
+        type_=sa.String(length=16),
+        nullable=False,
+        server_default=None,
+    )
+    op.create_check_constraint(
+        "ck_jobs_status",
+        "jobs",
+        "status IN (%s)" % ", ".join(f"'{status}'" for status in JOB_STATUSES),
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("ck_jobs_status", "jobs", type_="check")
+    op.alter_column(
+        "jobs",
+        "status",
+        existing_type=sa.String(length=16),
+        type_=sa.String(),
+        nullable=True,
+    )
+    # Back to the member names the SQLAEnum column reads
+    op.execute("UPDATE jobs SET status = upper(status)")
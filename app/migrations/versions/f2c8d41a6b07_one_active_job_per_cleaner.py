@@ -0,0 +1,54 @@
+"""one active job per cleaner
+
+Revision ID: f2c8d41a6b07
+Revises: e5b19c07a2f4
+Create Date: 2026-10-16 12:02:13.551904
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c8d41a6b07"
+down_revision: Union[str, None] = "e5b19c07a2f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The index can't be built while a cleaner has several jobs in progress: keep the most
+    # recently started one and send the others back to scheduled so they can be restarted
+    op.execute(
+        """
+        UPDATE jobs SET status = 'scheduled', started_at = NULL
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY cleaner_id ORDER BY started_at DESC NULLS LAST, id DESC
+                ) AS position
+                FROM jobs
+                WHERE status = 'in_progress' AND cleaner_id IS NOT NULL
+            ) ranked
+            WHERE position > 1
+        )
+        """
+    )
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_jobs_one_active_per_cleaner",
+            "jobs",
+            ["cleaner_id"],
+            unique=True,
+            postgresql_where=sa.text("status = 'in_progress'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("uq_jobs_one_active_per_cleaner", table_name="jobs", postgresql_concurrently=True)
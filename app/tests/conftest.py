@@ -16,6 +16,13 @@ os.environ["ENVIRONMENT"] = "test"
 from app.api.shared.config import init_settings
 from app.api.shared.database import Base
 
+# Register every model on the shared Base so string relationships resolve whichever model a test touches
+from app.api.auth import models as auth_models  # noqa: F401
+from app.api.jobs import models as job_models  # noqa: F401
+from app.api.location import models as location_models  # noqa: F401
+from app.api.notifications import models as notification_models  # noqa: F401
+from app.api.payments import models as payment_models  # noqa: F401
+
 # Initialize settings
 settings = init_settings()
 
@@ -0,0 +1,128 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from hamcrest import assert_that, equal_to
+
+from app.api.auth import dependencies
+from app.api.auth.exceptions import InactiveUserError
+from app.api.auth.models import User, UserRole
+from app.tests.givenpy import given, then, when
+
+
+def prepare_token(user_id):
+    """Patch token decoding so the bearer token resolves to ``user_id``."""
+
+    def step(context):
+        context.user_id = user_id
+        return patch.object(dependencies.security, "decode_token", return_value={"sub": str(user_id)})
+
+    return step
+
+
+def prepare_user_cache(cached_user=None):
+    """Patch the Redis-backed user cache with an in-memory mock."""
+
+    def step(context):
+        context.user_cache = MagicMock()
+        context.user_cache.get_user = AsyncMock(return_value=cached_user)
+        context.user_cache.set_user = AsyncMock()
+        context.db = AsyncMock()
+        return patch.object(dependencies, "UserCache", return_value=context.user_cache)
+
+    return step
+
+
+def prepare_user_row(**overrides):
+    """Make the database return the user's auth columns."""
+
+    def step(context):
+        row = {
+            "id": context.user_id,
+            "email": "client@example.com",
+            "role": UserRole.CLIENT,
+            "phone_number": "254712345678",
+            "full_name": "Test Client",
+            "fcm_token": None,
+            "is_active": True,
+            **overrides,
+        }
+        result = MagicMock()
+        result.mappings.return_value.one_or_none.return_value = row
+        context.db.execute.return_value = result
+
+    return step
+
+
+@pytest.mark.asyncio
+class TestGetCurrentUser:
+    async def test_cached_user_skips_the_database(self):
+        """Test a cache hit resolves the user without a query."""
+        user_id = uuid4()
+        cached = User(id=user_id, email="client@example.com", role=UserRole.CLIENT, is_active=True)
+        with given([prepare_token(user_id), prepare_user_cache(cached)]) as context:
+            with when("resolving the current user"):
+                user = await dependencies.get_current_user("token", context.db)
+
+            with then("the cached user should be returned"):
+                assert_that(user, equal_to(cached))
+                assert_that(context.db.execute.await_count, equal_to(0))
+
+    async def test_cache_miss_loads_and_caches_the_user(self):
+        """Test a cache miss falls back to the database and fills the cache."""
+        with given([prepare_token(uuid4()), prepare_user_cache(), prepare_user_row()]) as context:
+            with when("resolving the current user"):
+                user = await dependencies.get_current_user("token", context.db)
+
+            with then("the user should be loaded once and cached"):
+                assert_that(user.id, equal_to(context.user_id))
+                assert_that(context.db.execute.await_count, equal_to(1))
+                assert_that(context.user_cache.set_user.await_count, equal_to(1))
+
+    async def test_inactive_user_is_rejected(self):
+        """Test deactivated accounts can't authenticate with a still-valid token."""
+        with given([prepare_token(uuid4()), prepare_user_cache(), prepare_user_row(is_active=False)]) as context:
+            with pytest.raises(InactiveUserError):
+                with when("resolving the current user"):
+                    await dependencies.get_current_user("token", context.db)
+
+    async def test_unknown_user_is_unauthorized(self):
+        """Test a token for a user that no longer exists gets a 401."""
+        with given([prepare_token(uuid4()), prepare_user_cache()]) as context:
+            result = MagicMock()
+            result.mappings.return_value.one_or_none.return_value = None
+            context.db.execute.return_value = result
+
+            with pytest.raises(HTTPException) as exc_info:
+                with when("resolving the current user"):
+                    await dependencies.get_current_user("token", context.db)
+
+            with then("the request should be unauthorized"):
+                assert_that(exc_info.value.status_code, equal_to(401))
+
+
+@pytest.mark.asyncio
+class TestCheckPermissions:
+    async def test_role_outside_the_allowed_set_is_forbidden(self):
+        """Test check_permissions rejects users without one of the required roles."""
+        with given([]):
+            endpoint = dependencies.check_permissions(UserRole.ADMIN)(AsyncMock(return_value="ok"))
+
+            with pytest.raises(HTTPException) as exc_info:
+                with when("a client calls an admin endpoint"):
+                    await endpoint(current_user=User(role=UserRole.CLIENT))
+
+            with then("the request should be forbidden"):
+                assert_that(exc_info.value.status_code, equal_to(403))
+
+    async def test_allowed_role_reaches_the_endpoint(self):
+        """Test check_permissions passes through to the endpoint for allowed roles."""
+        with given([]):
+            endpoint = dependencies.check_permissions(UserRole.ADMIN)(AsyncMock(return_value="ok"))
+
+            with when("an admin calls the endpoint"):
+                result = await endpoint(current_user=User(role=UserRole.ADMIN))
+
+            with then("the endpoint's result should be returned"):
+                assert_that(result, equal_to("ok"))
@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+import jwt
+import pytest
+from hamcrest import assert_that, equal_to, is_not, has_key
+
+from app.api.auth import security
+from app.api.auth.exceptions import InvalidTokenError
+from app.tests.givenpy import given, then, when
+
+
+def prepare_access_token():
+    """Issue an access token and start from an empty signature cache."""
+
+    def step(context):
+        security._verify_signature.cache_clear()
+        context.token = security.create_access_token("user-1", "client")["token"]
+
+    return step
+
+
+def prepare_signature_spy():
+    """Wrap jwt.decode so signature verifications can be counted."""
+
+    def step(context):
+        return patch.object(security.jwt, "decode", wraps=jwt.decode)
+
+    return step
+
+
+class TestDecodeToken:
+    def test_repeated_decodes_verify_the_signature_once(self):
+        """Test a token presented on several requests is only signature-checked the first time."""
+        with given([prepare_access_token(), prepare_signature_spy()]) as context:
+            with when("decoding the same token twice"):
+                first = security.decode_token(context.token)
+                second = security.decode_token(context.token)
+
+            with then("both decodes should agree and jwt.decode should run once"):
+                assert_that(first, equal_to(second))
+                assert_that(security.jwt.decode.call_count, equal_to(1))
+
+    def test_cached_token_still_expires(self):
+        """Test a memoized signature doesn't keep an expired token valid."""
+        with given([prepare_access_token()]) as context:
+            expires_at = security.decode_token(context.token)["exp"]
+
+            with pytest.raises(InvalidTokenError):
+                with when("decoding the token after its exp"):
+                    with patch.object(security.time, "time", return_value=expires_at + 1):
+                        security.decode_token(context.token)
+
+    def test_callers_cannot_change_the_cached_payload(self):
+        """Test mutating a returned payload doesn't leak into later decodes."""
+        with given([prepare_access_token()]) as context:
+            payload = security.decode_token(context.token)
+
+            with when("a caller edits the payload and the token is decoded again"):
+                payload["injected"] = True
+                again = security.decode_token(context.token)
+
+            with then("the later decode should be untouched"):
+                assert_that(again, is_not(has_key("injected")))
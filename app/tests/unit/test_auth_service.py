@@ -3,6 +3,7 @@ from unittest.mock import AsyncMock, patch
 
 from hamcrest import assert_that, equal_to, not_none
 import pytest
+from sqlalchemy.exc import IntegrityError
 
 from app.api.auth.exceptions import UserAlreadyExistsError
 from app.api.auth.models import RefreshToken, User, UserRole
@@ -70,6 +71,19 @@ def prepare_mock_db():
     return step
 
 
+def prepare_unique_violation(constraint_name):
+    """Make commit fail the way asyncpg reports a unique violation on ``constraint_name``."""
+
+    def step(context):
+        driver_error = Exception(f'duplicate key value violates unique constraint "{constraint_name}"')
+        driver_error.constraint_name = constraint_name
+        adapted_error = Exception(str(driver_error))
+        adapted_error.__cause__ = driver_error
+        context.async_session.commit.side_effect = IntegrityError("INSERT INTO users", {}, adapted_error)
+
+    return step
+
+
 def prepare_token_data():
     """Prepare token test data."""
 
@@ -95,7 +109,7 @@ class TestAuthService:
                 assert_that(user.email, equal_to(context.user_data["email"]))
                 assert_that(user.full_name, equal_to(context.user_data["full_name"]))
                 assert_that(context.async_session.commit.await_count, equal_to(1))
-                assert_that(context.async_session.refresh.await_count, equal_to(1))
+                assert_that(context.async_session.refresh.await_count, equal_to(0))
 
     async def test_create_user_with_existing_email_fails(self):
         """Test user creation fails when email already exists."""
@@ -103,28 +117,34 @@ class TestAuthService:
             [
                 prepare_auth_service(),
                 prepare_user_data(),
+                prepare_unique_violation("ix_users_email"),
             ]
         ) as context:
-            # Override get_user_by_email to return existing user
-            async def mock_existing_user(email):
-                return User(
-                    id=1,
-                    email=email,
-                    full_name="Existing User",
-                    role=UserRole.CLIENT,
-                )
-
-            context.auth_service.get_user_by_email = mock_existing_user
-
             with pytest.raises(UserAlreadyExistsError) as exc_info:
                 with when("attempting to create user with existing email"):
                     await context.auth_service.create_user(context.user_create)
 
             with then("should raise user already exists error"):
-                expected_message = f"""User already exists with email:
-                {context.user_data['email']}"""
+                assert_that(context.async_session.rollback.await_count, equal_to(1))
+                expected_message = f"User already exists with email: {context.user_data['email']}"
                 assert_that(str(exc_info.value), equal_to(expected_message))
 
+    async def test_create_user_with_other_unique_violation_is_not_reported_as_duplicate_email(self):
+        """Test only the email index maps to UserAlreadyExistsError."""
+        with given(
+            [
+                prepare_auth_service(),
+                prepare_user_data(),
+                prepare_unique_violation("ix_users_phone_number"),
+            ]
+        ) as context:
+            with pytest.raises(IntegrityError):
+                with when("the phone number is already taken"):
+                    await context.auth_service.create_user(context.user_create)
+
+            with then("the transaction should still be rolled back"):
+                assert_that(context.async_session.rollback.await_count, equal_to(1))
+
     async def test_create_tokens_generates_valid_tokens(self):
         """Test creation of access and refresh tokens."""
         with given(
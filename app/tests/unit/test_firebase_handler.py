@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from hamcrest import assert_that, equal_to, only_contains
+
+from app.api.notifications.firebase import FirebaseHandler
+from app.tests.givenpy import given, then, when
+
+
+def prepare_fcm_auth():
+    """Patch FCM auth so no Google credential is needed."""
+
+    def step(context):
+        return patch.object(FirebaseHandler, "_get_fcm_auth", AsyncMock(return_value=("https://fcm", {})))
+
+    return step
+
+
+def prepare_send_limit(send_limit):
+    """Replace the process-wide send limiter with one allowing ``send_limit`` sends."""
+
+    def step(context):
+        return patch.object(FirebaseHandler, "_send_limiter", asyncio.Semaphore(send_limit))
+
+    return step
+
+
+def prepare_http_client():
+    """Patch the shared HTTP client with one that records the most sends in flight at once."""
+
+    def step(context):
+        context.in_flight = 0
+        context.max_in_flight = 0
+        context.http = MagicMock()
+
+        async def post(url, json, headers):
+            context.in_flight += 1
+            context.max_in_flight = max(context.max_in_flight, context.in_flight)
+            await asyncio.sleep(0)
+            context.in_flight -= 1
+            return MagicMock(is_success=True, json=MagicMock(return_value={"name": "projects/p/messages/1"}))
+
+        context.http.post = AsyncMock(side_effect=post)
+        return patch.object(FirebaseHandler, "_get_http_client", return_value=context.http)
+
+    return step
+
+
+@pytest.mark.asyncio
+class TestFirebaseHandler:
+    async def test_concurrent_fan_outs_share_one_send_limit(self):
+        """Test two multicasts at once stay within the process-wide limit, not one limit each."""
+        with given([prepare_fcm_auth(), prepare_send_limit(3), prepare_http_client()]) as context:
+            with when("two multicasts are sent concurrently"):
+                batches = await asyncio.gather(
+                    FirebaseHandler.send_multicast_notification([f"a{i}" for i in range(5)], "Title", "Body"),
+                    FirebaseHandler.send_multicast_notification([f"b{i}" for i in range(5)], "Title", "Body"),
+                )
+
+            with then("no more than the shared limit should be in flight"):
+                assert_that(context.max_in_flight, equal_to(3))
+                assert_that([result.success for batch in batches for result in batch], only_contains(True))
+
+    async def test_data_values_are_sent_as_strings(self):
+        """Test non-string data values are coerced, since FCM v1 rejects them."""
+        with given([prepare_fcm_auth(), prepare_send_limit(1), prepare_http_client()]) as context:
+            with when("sending a push with numeric and boolean data"):
+                message_id = await FirebaseHandler.send_push_notification(
+                    "token", "Title", "Body", data={"job_id": 42, "urgent": True}
+                )
+
+            with then("every data value should be a string"):
+                message = context.http.post.await_args.kwargs["json"]["message"]
+                assert_that(message["data"], equal_to({"job_id": "42", "urgent": "True"}))
+                assert_that(message_id, equal_to("projects/p/messages/1"))
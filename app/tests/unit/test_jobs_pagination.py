@@ -0,0 +1,130 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from hamcrest import assert_that, contains_string, equal_to, has_entries, is_, none, not_
+from sqlalchemy.dialects import postgresql
+
+from app.api.auth.models import User, UserRole
+from app.api.jobs import resources
+from app.api.jobs.models import JobStatus
+from app.api.jobs.repository import JobRepository
+from app.tests.givenpy import given, then, when
+
+
+def prepare_job_repository():
+    """Prepare a repository whose session returns one listed job and a total of 7."""
+
+    def step(context):
+        context.db = AsyncMock()
+        context.db.scalar.return_value = 7
+        context.row = {
+            "id": uuid4(),
+            "client_id": uuid4(),
+            "cleaner_id": None,
+            "status": JobStatus.PENDING,
+            "city": "Nairobi",
+            "estimated_duration_minutes": 120,
+            "base_cost": 540.0,
+            "final_cost": None,
+            "created_at": datetime(2026, 10, 1, tzinfo=timezone.utc),
+            "scheduled_for": None,
+        }
+        result = MagicMock()
+        result.mappings.return_value = [context.row]
+        context.db.execute.return_value = result
+        context.repository = JobRepository(context.db)
+
+    return step
+
+
+def prepare_job_service(jobs, total):
+    """Patch the routes' JobService with one returning ``jobs`` and ``total``."""
+
+    def step(context):
+        context.service = MagicMock()
+        context.service.get_client_jobs = AsyncMock(return_value=(jobs, total))
+        return patch.object(resources, "JobService", return_value=context.service)
+
+    return step
+
+
+def listed_sql(context):
+    """SQL of the page query the repository executed."""
+    statement = context.db.execute.await_args.args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+class TestJobsPagination:
+    async def test_first_page_is_counted(self):
+        """Test the first page (no cursor) carries the total matching count."""
+        with given([prepare_job_repository()]) as context:
+            with when("fetching the first page"):
+                jobs, total = await context.repository.get_jobs_by_client(context.row["client_id"], limit=1)
+
+            with then("the total should be counted once"):
+                assert_that(total, equal_to(7))
+                assert_that(context.db.scalar.await_count, equal_to(1))
+                assert_that(jobs[0].id, equal_to(context.row["id"]))
+
+    async def test_cursor_page_skips_the_count_and_seeks_past_the_cursor(self):
+        """Test later pages seek by (created_at, id) and don't re-run COUNT(*)."""
+        with given([prepare_job_repository()]) as context:
+            with when("fetching the page after a cursor"):
+                cursor = (context.row["created_at"], context.row["id"])
+                _, total = await context.repository.get_jobs_by_client(context.row["client_id"], cursor=cursor)
+
+            with then("no count should run and the query should seek past the cursor"):
+                assert_that(total, is_(none()))
+                assert_that(context.db.scalar.await_count, equal_to(0))
+                assert_that(listed_sql(context), contains_string("(jobs.created_at, jobs.id) <"))
+                assert_that(listed_sql(context), not_(contains_string("OFFSET")))
+
+    async def test_offset_is_still_honoured(self):
+        """Test the deprecated offset parameter still pages with OFFSET."""
+        with given([prepare_job_repository()]) as context:
+            with when("fetching a page by offset"):
+                _, total = await context.repository.get_jobs_by_cleaner(uuid4(), offset=20)
+
+            with then("the query should skip the earlier rows and still be counted"):
+                assert_that(listed_sql(context), contains_string("OFFSET"))
+                assert_that(total, equal_to(7))
+
+    async def test_half_supplied_cursor_is_rejected(self):
+        """Test giving only one of the two cursor fields is a 422, not a silent first page."""
+        with given([]):
+            with pytest.raises(HTTPException) as exc_info:
+                with when("listing jobs with only after_created_at"):
+                    await resources.list_jobs(
+                        job_status=None,
+                        limit=50,
+                        offset=None,
+                        after_created_at=datetime.now(timezone.utc),
+                        after_id=None,
+                        current_user=User(id=uuid4(), role=UserRole.CLIENT),
+                        db=AsyncMock(),
+                    )
+
+            with then("the request should be unprocessable"):
+                assert_that(exc_info.value.status_code, equal_to(422))
+
+    async def test_offset_request_gets_the_offset_response(self):
+        """Test old clients sending offset get the response shape they were written against."""
+        with given([prepare_job_service([], 0)]) as context:
+            with when("listing jobs by offset"):
+                response = await resources.list_jobs(
+                    job_status=None,
+                    limit=50,
+                    offset=0,
+                    after_created_at=None,
+                    after_id=None,
+                    current_user=User(id=uuid4(), role=UserRole.CLIENT),
+                    db=AsyncMock(),
+                )
+
+            with then("the response should carry offset rather than next_cursor"):
+                assert_that(response, has_entries(total=0, limit=50, offset=0))
+                assert_that(context.service.get_client_jobs.await_args.kwargs["offset"], equal_to(0))
@@ -0,0 +1,52 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from hamcrest import assert_that, equal_to, has_entries
+
+from app.api.auth.dependencies import get_current_user
+from app.api.auth.models import User, UserRole
+from app.api.jobs import resources
+from app.api.storage.dependencies import get_db
+from app.tests.givenpy import given, then, when
+
+
+def prepare_jobs_app(role):
+    """Mount the jobs router with a signed-in user of ``role`` and no database."""
+
+    def step(context):
+        context.app = FastAPI()
+        context.app.include_router(resources.router)
+        context.app.dependency_overrides[get_current_user] = lambda: User(id=uuid4(), role=role)
+        context.app.dependency_overrides[get_db] = lambda: AsyncMock()
+
+    return step
+
+
+def prepare_job_service():
+    """Patch the routes' JobService with one that has no available jobs."""
+
+    def step(context):
+        context.service = MagicMock()
+        context.service.get_available_jobs = AsyncMock(return_value=[])
+        return patch.object(resources, "JobService", return_value=context.service)
+
+    return step
+
+
+@pytest.mark.asyncio
+class TestJobsRoutes:
+    async def test_available_is_not_routed_as_a_job_id(self):
+        """Test GET /jobs/available reaches the available-jobs listing, not GET /jobs/{job_id}."""
+        with given([prepare_jobs_app(UserRole.CLEANER), prepare_job_service()]) as context:
+            with when("a cleaner lists available jobs"):
+                transport = httpx.ASGITransport(app=context.app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    response = await client.get("/jobs/available", params={"limit": 10})
+
+            with then("the available jobs should be listed"):
+                assert_that(response.status_code, equal_to(200))
+                assert_that(response.json(), has_entries(items=[], limit=10, offset=0))
+                assert_that(context.service.get_available_jobs.await_count, equal_to(1))
@@ -5,12 +5,20 @@ from uuid import uuid4
 import pytest
 from fastapi import HTTPException
 from hamcrest import assert_that, equal_to, is_, not_none
+from sqlalchemy.exc import IntegrityError
 
 from app.api.jobs.models import Job, JobStatus, ScheduleSlot
 from app.api.jobs.service import JobService
 from app.tests.givenpy import given, then, when
 
 
+def unique_violation(constraint_name):
+    """IntegrityError as asyncpg reports a unique violation on ``constraint_name``."""
+    driver_error = Exception(f'duplicate key value violates unique constraint "{constraint_name}"')
+    driver_error.constraint_name = constraint_name
+    return IntegrityError("UPDATE jobs", {}, driver_error)
+
+
 def prepare_job_service():
     """Prepare job service with mocked dependencies."""
 
@@ -99,12 +107,33 @@ def prepare_mock_repository():
                 )
             return None
 
+        async def mock_transition_job(job_id, from_statuses, values, **conditions):
+            job = context.job
+            if job_id != context.job_id or job.status not in from_statuses:
+                return None
+            if any(getattr(job, column) != value for column, value in conditions.items()):
+                return None
+            for column, value in values.items():
+                setattr(job, column, value)
+            return job
+
+        async def mock_accept_slot(job_id, slot_id):
+            if job_id != context.job_id:
+                return None
+            for slot in context.job.schedule_slots or []:
+                if slot.id == slot_id and slot.is_accepted is None:
+                    slot.is_accepted = True
+                    return slot
+            return None
+
         # Assign mocks to repository methods
         context.repository.create_job = mock_create_job
         context.repository.get_job_by_id = mock_get_job_by_id
         context.repository.update_job = mock_update_job
         context.repository.add_schedule_slot = mock_add_schedule_slot
         context.repository.get_slot_by_id = mock_get_slot_by_id
+        context.repository.transition_job = mock_transition_job
+        context.repository.accept_slot = mock_accept_slot
 
     return step
 
@@ -252,6 +281,32 @@ class TestJobService:
                 assert_that(exc_info.value.status_code, equal_to(403))
                 assert_that(exc_info.value.detail, equal_to("Not authorized to start this job"))
 
+    async def test_start_job_while_another_is_active_fails(self):
+        """Test starting a second job for the same cleaner fails."""
+        with given([prepare_job_service(), prepare_job_data(), prepare_mock_repository()]) as context:
+            context.job.status = JobStatus.SCHEDULED
+            context.job.cleaner_id = context.cleaner_id
+            context.repository.transition_job = AsyncMock(
+                side_effect=unique_violation("uq_jobs_one_active_per_cleaner")
+            )
+
+            with pytest.raises(HTTPException) as exc_info:
+                with when("starting a job while the cleaner already has one in progress"):
+                    await context.job_service.start_job(context.job_id, context.cleaner_id)
+
+            with then("a conflict error should be raised"):
+                assert_that(exc_info.value.status_code, equal_to(409))
+                assert_that(exc_info.value.detail, equal_to("Cleaner already has an active job"))
+
+    async def test_start_job_with_other_integrity_error_is_not_a_conflict(self):
+        """Test only the one-active-job index maps to 409; other violations propagate."""
+        with given([prepare_job_service(), prepare_job_data(), prepare_mock_repository()]) as context:
+            context.repository.transition_job = AsyncMock(side_effect=unique_violation("ck_jobs_status"))
+
+            with pytest.raises(IntegrityError):
+                with when("the update violates a different constraint"):
+                    await context.job_service.start_job(context.job_id, context.cleaner_id)
+
     async def test_complete_job_succeeds(self):
         """Test completing a job."""
         with given([prepare_job_service(), prepare_job_data(), prepare_mock_repository()]) as context:
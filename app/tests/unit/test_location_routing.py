@@ -0,0 +1,109 @@
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from hamcrest import assert_that, contains_exactly, equal_to
+
+from app.api.jobs.models import Job, JobStatus
+from app.api.location.core import Coordinates
+from app.api.location.routing import RouteCalculator, haversine_matrix, nearest_neighbor_order
+from app.tests.givenpy import given, then, when
+
+
+def prepare_route_calculator():
+    """Prepare route calculator with mocked dependencies."""
+
+    def step(context):
+        context.db = AsyncMock()
+        context.maps = MagicMock()
+        context.route_calculator = RouteCalculator(context.db, context.maps)
+
+    return step
+
+
+def prepare_stops():
+    """Prepare a start point and three of the user's jobs along a line away from it."""
+
+    def step(context):
+        context.user_id = uuid4()
+        context.start = Coordinates(latitude=-1.2900, longitude=36.8200)
+        context.jobs = [
+            Job(id=uuid4(), client_id=context.user_id, latitude=-1.2900, longitude=longitude)
+            for longitude in (36.8500, 36.8300, 36.8400)
+        ]
+        context.route_calculator._get_jobs = AsyncMock(return_value=context.jobs)
+
+        async def calculate_distance_matrix(origins, destinations):
+            # Every leg is 1km and 60s per origin/destination pair requested
+            return [[{"distance": 1000, "duration": 60} for _ in destinations] for _ in origins]
+
+        context.maps.calculate_distance_matrix = AsyncMock(side_effect=calculate_distance_matrix)
+
+    return step
+
+
+def prepare_jobs():
+    """Prepare jobs owned by two different clients."""
+
+    def step(context):
+        context.user_id = uuid4()
+        context.own_job = Job(id=uuid4(), client_id=context.user_id, status=JobStatus.SCHEDULED)
+        context.other_job = Job(id=uuid4(), client_id=uuid4(), status=JobStatus.SCHEDULED)
+
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [context.own_job, context.other_job]
+        context.db.execute.return_value = result
+
+    return step
+
+
+@pytest.mark.asyncio
+class TestRouteCalculator:
+    async def test_get_jobs_returns_only_the_users_jobs(self):
+        """Test fetching jobs for a route keeps only the user's own jobs."""
+        with given([prepare_route_calculator(), prepare_jobs()]) as context:
+            with when("fetching jobs for a route"):
+                jobs = await context.route_calculator._get_jobs(
+                    [context.own_job.id, context.other_job.id], context.user_id
+                )
+
+            with then("only the user's job should be returned"):
+                assert_that(jobs, contains_exactly(context.own_job))
+                assert_that(context.db.execute.await_count, equal_to(1))
+
+
+@pytest.mark.asyncio
+class TestRouteOptimization:
+    async def test_nearest_neighbor_order_visits_closest_stop_first(self):
+        """Test stops are ordered by straight-line distance from the start."""
+        with given([]):
+            with when("ordering stops along a line away from the start"):
+                points = [
+                    Coordinates(latitude=-1.2900, longitude=36.8200),  # Start
+                    Coordinates(latitude=-1.2900, longitude=36.8500),
+                    Coordinates(latitude=-1.2900, longitude=36.8300),
+                    Coordinates(latitude=-1.2900, longitude=36.8400),
+                ]
+                order = nearest_neighbor_order(haversine_matrix(points))
+
+            with then("the stops should be visited nearest first"):
+                assert_that(order, contains_exactly(2, 3, 1))
+
+    async def test_optimize_route_requests_only_the_legs_it_uses(self):
+        """Test each leg of the chosen order is priced with a 1x1 distance matrix request."""
+        with given([prepare_route_calculator(), prepare_stops()]) as context:
+            with when("optimizing the route"):
+                route = await context.route_calculator.optimize_route(
+                    context.user_id, [job.id for job in context.jobs], context.start
+                )
+
+            with then("stops should come back nearest first"):
+                assert_that(
+                    [stop["job_id"] for stop in route], contains_exactly(*(context.jobs[i].id for i in (1, 2, 0)))
+                )
+
+            with then("Google should be asked for one element per leg"):
+                calls = context.maps.calculate_distance_matrix.await_args_list
+                assert_that(len(calls), equal_to(len(context.jobs)))
+                for call in calls:
+                    assert_that(len(call.kwargs["origins"]) * len(call.kwargs["destinations"]), equal_to(1))
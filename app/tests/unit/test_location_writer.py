@@ -0,0 +1,86 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from hamcrest import assert_that, equal_to
+from sqlalchemy.exc import IntegrityError
+
+from app.api.location import writer
+from app.api.location.writer import LocationWriter
+from app.tests.givenpy import given, then, when
+
+
+def prepare_location_writer(insert):
+    """Prepare a writer whose INSERT + commit is ``insert`` and whose retries don't wait."""
+
+    def step(context):
+        context.insert = AsyncMock(side_effect=insert)
+        context.writer = LocationWriter()
+        context.rows = [
+            {"user_id": 1, "latitude": -1.28, "longitude": 36.82},
+            {"user_id": 2, "latitude": 0, "longitude": 0},
+        ]
+        context.writer._insert = context.insert
+        return patch.object(writer, "LOCATION_RETRY_BASE_DELAY_SECONDS", 0)
+
+    return step
+
+
+async def run_until(context, inserts):
+    """Run the writer on the context's rows until ``inserts`` writes were attempted, then stop it."""
+    for row in context.rows:
+        await context.writer.push(row)
+    task = asyncio.create_task(context.writer.run())
+    for _ in range(100):
+        if context.insert.await_count >= inserts:
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+def inserted_batches(context):
+    return [call.args[0] for call in context.insert.await_args_list]
+
+
+@pytest.mark.asyncio
+class TestLocationWriter:
+    async def test_failed_write_is_retried_with_the_same_rows(self):
+        """Test a batch whose commit fails stays buffered and is written on the next attempt."""
+        with given([prepare_location_writer([ConnectionError("database unavailable"), None])]) as context:
+            with when("the first write fails"):
+                await run_until(context, inserts=2)
+
+            with then("the same rows should be written again, once"):
+                assert_that(inserted_batches(context), equal_to([context.rows, context.rows]))
+                assert_that(context.writer._batch, equal_to([]))
+
+    async def test_batch_cancelled_mid_write_is_flushed_on_shutdown(self):
+        """Test shutting down during a write doesn't lose the batch being written."""
+        never = asyncio.Event()
+
+        async def hang_then_succeed(rows):
+            if context.insert.await_count == 1:
+                await never.wait()
+
+        with given([prepare_location_writer(hang_then_succeed)]) as context:
+            with when("the writer is cancelled while its first commit is in flight"):
+                await run_until(context, inserts=1)
+
+            with then("the shutdown flush should write the batch"):
+                assert_that(inserted_batches(context), equal_to([context.rows, context.rows]))
+                assert_that(context.writer._batch, equal_to([]))
+
+    async def test_rejected_batch_drops_only_the_offending_rows(self):
+        """Test a batch rejected for bad data is retried row by row instead of dropped."""
+
+        async def reject_user_two(rows):
+            if any(row["user_id"] == 2 for row in rows):
+                raise IntegrityError("INSERT INTO locations", {}, Exception("violates foreign key constraint"))
+
+        with given([prepare_location_writer(reject_user_two)]) as context:
+            with when("writing a batch with one bad row"):
+                await context.writer._write(context.rows)
+
+            with then("the good row should still be written on its own"):
+                assert_that(inserted_batches(context)[1:], equal_to([[context.rows[0]], [context.rows[1]]]))
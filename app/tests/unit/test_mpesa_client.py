@@ -0,0 +1,128 @@
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import orjson
+import pytest
+from hamcrest import assert_that, close_to, equal_to, has_entries
+
+from app.api.payments.exceptions import PaymentProcessingError
+from app.api.payments.models import Payment
+from app.api.payments.mpesa import MPESAClient
+from app.tests.givenpy import given, then, when
+
+
+def prepare_mpesa_client():
+    """Prepare an M-PESA client on a mocked Redis whose pipeline answers GET + PTTL."""
+
+    def step(context):
+        context.pipeline = MagicMock()
+        context.pipeline.execute = AsyncMock(return_value=[None, -2])
+        context.redis = MagicMock()
+        context.redis.pipeline.return_value.__aenter__.return_value = context.pipeline
+        context.redis.set = AsyncMock()
+        context.mpesa_client = MPESAClient(redis=context.redis)
+
+    return step
+
+
+def prepare_cached_token(token, ttl_ms):
+    """Make Redis hold a shared access token with ``ttl_ms`` left on its key."""
+
+    def step(context):
+        context.pipeline.execute.return_value = [token, ttl_ms]
+
+    return step
+
+
+def prepare_token_endpoint():
+    """Patch the shared HTTP client so the OAuth endpoint returns a fresh token."""
+
+    def step(context):
+        context.http = MagicMock()
+
+        async def get(*args, **kwargs):
+            # Yield so concurrent callers really overlap on the refresh
+            await asyncio.sleep(0)
+            return MagicMock(status_code=200, content=orjson.dumps({"access_token": "fresh", "expires_in": 3599}))
+
+        context.http.get = AsyncMock(side_effect=get)
+        return patch.object(MPESAClient, "_get_http_client", return_value=context.http)
+
+    return step
+
+
+def prepare_unreachable_safaricom():
+    """Patch the shared HTTP client so every Safaricom request fails to connect."""
+
+    def step(context):
+        context.mpesa_client._get_access_token = AsyncMock(return_value="token")
+        context.http = MagicMock()
+        context.http.post = AsyncMock(side_effect=httpx.ConnectError("connection refused"))
+        return patch.object(MPESAClient, "_get_http_client", return_value=context.http)
+
+    return step
+
+
+@pytest.mark.asyncio
+class TestMPESAClient:
+    async def test_cached_token_expires_with_its_redis_key(self):
+        """Test a token read from Redis is only trusted in memory for the key's remaining TTL."""
+        with given([prepare_mpesa_client(), prepare_cached_token("shared", 1500), prepare_token_endpoint()]) as context:
+            with when("getting an access token"):
+                token = await context.mpesa_client._get_access_token()
+
+            with then("the cached token should be used without calling Safaricom"):
+                assert_that(token, equal_to("shared"))
+                assert_that(context.http.get.await_count, equal_to(0))
+
+            with then("the in-memory expiry should match the key's remaining 1.5 seconds"):
+                remaining = context.mpesa_client._token_expiry - datetime.now(UTC).timestamp()
+                assert_that(remaining, close_to(1.5, 0.5))
+
+    async def test_key_without_expiry_is_treated_as_a_miss(self):
+        """Test a cached token with no TTL is refetched rather than trusted indefinitely."""
+        with given([prepare_mpesa_client(), prepare_cached_token("stale", -1), prepare_token_endpoint()]) as context:
+            with when("getting an access token"):
+                token = await context.mpesa_client._get_access_token()
+
+            with then("a fresh token should be fetched and shared"):
+                assert_that(token, equal_to("fresh"))
+                assert_that(context.http.get.await_count, equal_to(1))
+                assert_that(context.redis.set.await_count, equal_to(1))
+
+    async def test_concurrent_callers_share_one_refresh(self):
+        """Test callers racing on an expired token wait on a single OAuth request."""
+        with given([prepare_mpesa_client(), prepare_token_endpoint()]) as context:
+            with when("several callers ask for a token at once"):
+                tokens = await asyncio.gather(*(context.mpesa_client._get_access_token() for _ in range(5)))
+
+            with then("Safaricom should be asked only once"):
+                assert_that(set(tokens), equal_to({"fresh"}))
+                assert_that(context.http.get.await_count, equal_to(1))
+
+    async def test_stk_push_network_error_names_the_payment(self):
+        """Test a failed STK push reports which payment and phone number it was for."""
+        with given([prepare_mpesa_client(), prepare_unreachable_safaricom()]) as context:
+            payment = Payment(id=7, amount=500, reference="PAY-7", job_id=3)
+
+            with pytest.raises(PaymentProcessingError) as exc_info:
+                with when("initiating an STK push"):
+                    await context.mpesa_client.initiate_stk_push(payment, "0712345678")
+
+            with then("the error details should identify the payment"):
+                assert_that(
+                    exc_info.value.details,
+                    has_entries(error="connection refused", payment_id=7, phone_number="0712345678"),
+                )
+
+    async def test_status_check_network_error_names_the_checkout_request(self):
+        """Test a failed status query reports which checkout request it was for."""
+        with given([prepare_mpesa_client(), prepare_unreachable_safaricom()]) as context:
+            with pytest.raises(PaymentProcessingError) as exc_info:
+                with when("checking a transaction's status"):
+                    await context.mpesa_client.check_transaction_status(checkout_request_id="ws_CO_1")
+
+            with then("the error details should identify the checkout request"):
+                assert_that(exc_info.value.details, has_entries(checkout_request_id="ws_CO_1"))
@@ -0,0 +1,85 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from hamcrest import assert_that, equal_to, only_contains
+
+from app.api.notifications import tasks
+from app.api.notifications.models import NotificationStatus
+from app.api.notifications.service import NotificationService
+from app.api.shared.utils.task_queue import TaskQueue
+from app.tests.givenpy import given, then, when
+
+
+def prepare_task_queue():
+    """Prepare a task queue on a mocked Redis that records the enqueued members."""
+
+    def step(context):
+        context.redis = MagicMock()
+        context.redis.register_script.return_value = AsyncMock()
+        context.redis.zadd = AsyncMock()
+        context.redis.zrem = AsyncMock()
+        context.task_queue = TaskQueue(redis=context.redis)
+        return patch("app.api.notifications.service.get_task_queue", return_value=context.task_queue)
+
+    return step
+
+
+def prepare_recipients(count):
+    """Prepare users that all have a device token, as loaded by the worker's session."""
+
+    def step(context):
+        context.user_ids = [uuid4() for _ in range(count)]
+        context.db = AsyncMock()
+        context.db.add_all = MagicMock()
+        result = MagicMock()
+        result.tuples.return_value.all.return_value = [(user_id, f"token-{user_id}") for user_id in context.user_ids]
+        context.db.execute.return_value = result
+
+        @asynccontextmanager
+        async def session_scope():
+            yield context.db
+
+        return patch.object(tasks, "session_scope", session_scope)
+
+    return step
+
+
+def prepare_firebase():
+    """Prepare an FCM handler that accepts every token."""
+
+    def step(context):
+        context.firebase = MagicMock()
+
+        async def send_multicast_notification(tokens, **kwargs):
+            return [SimpleNamespace(success=True) for _ in tokens]
+
+        context.firebase.send_multicast_notification = AsyncMock(side_effect=send_multicast_notification)
+        return patch("app.api.notifications.service.get_firebase_handler", return_value=context.firebase)
+
+    return step
+
+
+@pytest.mark.asyncio
+class TestSendMultiNotificationTask:
+    async def test_queued_notification_is_delivered_to_uuid_users(self):
+        """Test user IDs survive the JSON round trip through the queue and still match their tokens."""
+        with given([prepare_task_queue(), prepare_recipients(2), prepare_firebase()]) as context:
+            await NotificationService(AsyncMock()).enqueue_multi_notification(
+                context.user_ids, title="Job update", body="Your cleaner is on the way"
+            )
+            member = next(iter(context.redis.zadd.await_args.args[1]))
+
+            with when("the worker runs the queued task"):
+                await context.task_queue._execute(member, tasks.TASKS)
+
+            with then("every notification should be sent to its user's token"):
+                notifications = context.db.add_all.call_args.args[0]
+                assert_that([n.status for n in notifications], only_contains(NotificationStatus.SENT))
+                sent_tokens = context.firebase.send_multicast_notification.await_args.kwargs["tokens"]
+                assert_that(sent_tokens, equal_to([f"token-{user_id}" for user_id in context.user_ids]))
+
+            with then("the task should be removed from the queue"):
+                assert_that(context.redis.zrem.await_count, equal_to(1))
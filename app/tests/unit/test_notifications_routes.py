@@ -0,0 +1,86 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from hamcrest import assert_that, contains_string, equal_to
+from sqlalchemy.dialects import postgresql
+
+from app.api.auth.models import User, UserRole
+from app.api.notifications import routes
+from app.api.notifications import service as notification_service
+from app.tests.givenpy import given, then, when
+
+
+def prepare_notification_service():
+    """Prepare a notification service on a mocked session that lists no rows."""
+
+    def step(context):
+        context.db = AsyncMock()
+        result = MagicMock()
+        result.mappings.return_value = []
+        context.db.execute.return_value = result
+        with patch.object(notification_service, "get_firebase_handler"):
+            context.service = notification_service.NotificationService(context.db)
+
+    return step
+
+
+def prepare_routes_service():
+    """Patch the routes' NotificationService with one returning an empty page."""
+
+    def step(context):
+        context.service = MagicMock()
+        context.service.get_user_notifications = AsyncMock(return_value=[])
+        return patch.object(routes, "NotificationService", return_value=context.service)
+
+    return step
+
+
+def listed_sql(context):
+    """SQL of the page query the service executed."""
+    statement = context.db.execute.await_args.args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+async def list_notifications(skip=None, limit=100, after_created_at=None, after_id=None):
+    return await routes.get_notifications(
+        skip=skip,
+        limit=limit,
+        after_created_at=after_created_at,
+        after_id=after_id,
+        current_user=User(id=uuid4(), role=UserRole.CLIENT),
+        db=AsyncMock(),
+    )
+
+
+@pytest.mark.asyncio
+class TestNotificationListing:
+    async def test_skip_is_still_honoured(self):
+        """Test the deprecated skip parameter still pages with OFFSET."""
+        with given([prepare_notification_service()]) as context:
+            with when("fetching a page by skip"):
+                await context.service.get_user_notifications(1, limit=100, skip=20)
+
+            with then("the query should skip the earlier rows"):
+                assert_that(listed_sql(context), contains_string("OFFSET"))
+
+    async def test_oversized_limit_is_clamped(self):
+        """Test old clients asking for more than a page get a full page instead of a 422."""
+        with given([prepare_routes_service()]) as context:
+            with when("listing with a limit above the page size"):
+                await list_notifications(limit=500)
+
+            with then("the service should be asked for at most one page"):
+                assert_that(context.service.get_user_notifications.await_args.args[1], equal_to(routes.MAX_PAGE_SIZE))
+
+    async def test_half_supplied_cursor_is_rejected(self):
+        """Test giving only one of the two cursor fields is a 422, not a silent first page."""
+        with given([prepare_routes_service()]):
+            with pytest.raises(HTTPException) as exc_info:
+                with when("listing with only after_created_at"):
+                    await list_notifications(after_created_at=datetime.now(timezone.utc))
+
+            with then("the request should be unprocessable"):
+                assert_that(exc_info.value.status_code, equal_to(422))
@@ -0,0 +1,69 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from hamcrest import assert_that, equal_to, has_entries
+
+from app.api.payments import routes
+from app.api.payments.models import Payment, PaymentStatus
+from app.tests.givenpy import given, then, when
+
+CALLBACK = {"CheckoutRequestID": "ws_CO_1", "ResultCode": "0", "TransactionId": "TX1"}
+
+
+def prepare_idempotency_store(first_delivery=True):
+    """Patch Redis so the callback's SET NX reports a first or a repeated delivery."""
+
+    def step(context):
+        context.redis = MagicMock()
+        context.redis.set = AsyncMock(return_value=True if first_delivery else None)
+        context.redis.delete = AsyncMock()
+        return patch.object(routes, "get_async_redis_client", return_value=context.redis)
+
+    return step
+
+
+def prepare_payment_service(payment=None):
+    """Prepare a payment service that finds ``payment`` by its checkout request ID."""
+
+    def step(context):
+        context.payment_service = MagicMock()
+        context.payment_service.get_payment_by_checkout_request_id = AsyncMock(return_value=payment)
+        context.payment_service.update_payment_status = AsyncMock()
+
+    return step
+
+
+@pytest.mark.asyncio
+class TestMpesaCallback:
+    async def test_first_delivery_settles_the_payment(self):
+        """Test the first delivery of a callback claims its key and completes the payment."""
+        payment = Payment(id=1, status=PaymentStatus.PROCESSING)
+        with given([prepare_idempotency_store(), prepare_payment_service(payment)]) as context:
+            with when("Safaricom delivers the callback"):
+                response = await routes.mpesa_callback(CALLBACK, context.payment_service)
+
+            with then("the payment should be completed once"):
+                assert_that(response, equal_to({"status": "success"}))
+                assert_that(context.payment_service.update_payment_status.await_count, equal_to(1))
+                assert_that(context.redis.set.await_args.kwargs, has_entries(nx=True))
+
+    async def test_retried_delivery_has_no_side_effects(self):
+        """Test a callback Safaricom retries is acknowledged without touching the payment again."""
+        with given([prepare_idempotency_store(first_delivery=False), prepare_payment_service()]) as context:
+            with when("the same callback is delivered again"):
+                response = await routes.mpesa_callback(CALLBACK, context.payment_service)
+
+            with then("it should be acknowledged as already processed"):
+                assert_that(response, has_entries(message="Already processed"))
+                assert_that(context.payment_service.get_payment_by_checkout_request_id.await_count, equal_to(0))
+
+    async def test_failed_delivery_releases_the_key(self):
+        """Test a delivery that fails frees its key so Safaricom's retry is processed."""
+        with given([prepare_idempotency_store(), prepare_payment_service(payment=None)]) as context:
+            with pytest.raises(HTTPException):
+                with when("the callback names an unknown payment"):
+                    await routes.mpesa_callback(CALLBACK, context.payment_service)
+
+            with then("the idempotency key should be deleted"):
+                assert_that(context.redis.delete.await_args.args, equal_to(("mpesa:cb:ws_CO_1",)))
@@ -0,0 +1,64 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from hamcrest import assert_that, equal_to, has_key, is_not
+
+from app.api.payments.models import Payment, PaymentStatus
+from app.api.payments.service import PaymentService
+from app.tests.givenpy import given, then, when
+
+
+def prepare_payment_service():
+    """Prepare payment service with a mocked session and M-PESA client."""
+
+    def step(context):
+        context.db = AsyncMock()
+        context.mpesa_client = AsyncMock()
+        context.payment_service = PaymentService(context.db, context.mpesa_client)
+
+    return step
+
+
+def prepare_payment():
+    """Prepare a processing payment returned by UPDATE ... RETURNING."""
+
+    def step(context):
+        context.payment = Payment(
+            id=1, status=PaymentStatus.PROCESSING, provider_metadata={"CheckoutRequestID": "ws_1"}
+        )
+
+        result = MagicMock()
+        result.scalar_one.return_value = context.payment
+        context.db.execute.return_value = result
+
+    return step
+
+
+def update_values(context):
+    """Values of the single UPDATE statement the service executed."""
+    assert_that(context.db.execute.await_count, equal_to(1))
+    statement = context.db.execute.await_args.args[0]
+    return {column.name: value for column, value in statement._values.items()}
+
+
+@pytest.mark.asyncio
+class TestPaymentService:
+    async def test_update_payment_status_sets_completed_at_in_the_same_update(self):
+        """Test settling a payment writes completed_at in the one UPDATE statement."""
+        with given([prepare_payment_service(), prepare_payment()]) as context:
+            with when("marking the payment completed"):
+                await context.payment_service.update_payment_status(context.payment, PaymentStatus.COMPLETED)
+
+            with then("completed_at should be part of the UPDATE"):
+                values = update_values(context)
+                assert_that(values, has_key("completed_at"))
+                assert_that(context.db.commit.await_count, equal_to(1))
+
+    async def test_update_payment_status_leaves_completed_at_for_unsettled_payments(self):
+        """Test non-final statuses don't stamp completed_at."""
+        with given([prepare_payment_service(), prepare_payment()]) as context:
+            with when("moving the payment back to processing"):
+                await context.payment_service.update_payment_status(context.payment, PaymentStatus.PROCESSING)
+
+            with then("completed_at should not be written"):
+                assert_that(update_values(context), is_not(has_key("completed_at")))
@@ -0,0 +1,38 @@
+import pytest
+from hamcrest import assert_that, equal_to
+
+from app.api.shared.utils.phone import normalize_phone_number
+from app.tests.givenpy import given, then, when
+
+
+class TestNormalizePhoneNumber:
+    @pytest.mark.parametrize(
+        "phone_number", ["0712345678", "712345678", "+254712345678", "254712345678", " 0712345678 "]
+    )
+    def test_kenyan_formats_normalize_to_254(self, phone_number):
+        """Test every accepted way of writing a number gives the canonical 254XXXXXXXXX form."""
+        with given([]):
+            with when("normalizing the number"):
+                normalized = normalize_phone_number(phone_number)
+
+            with then("it should be the 12-digit canonical number"):
+                assert_that(normalized, equal_to("254712345678"))
+
+    @pytest.mark.parametrize(
+        "phone_number",
+        [
+            "",
+            "07123456",
+            "07123456789",
+            "+255712345678",
+            "0712-345-678",
+            "254٧١٢٣٤٥٦٧٨",  # Arabic-Indic digits after an ASCII prefix
+            "٠٧١٢٣٤٥٦٧٨",
+        ],
+    )
+    def test_invalid_numbers_are_rejected(self, phone_number):
+        """Test malformed numbers, including non-ASCII digits, raise ValueError."""
+        with given([]):
+            with pytest.raises(ValueError):
+                with when("normalizing the number"):
+                    normalize_phone_number(phone_number)
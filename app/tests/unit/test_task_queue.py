@@ -0,0 +1,118 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+import pytest
+from hamcrest import assert_that, close_to, equal_to, has_entries
+from redis.exceptions import RedisError
+
+from app.api.shared.utils.task_queue import RETRY_BASE_DELAY_SECONDS, TaskQueue
+from app.tests.givenpy import given, then, when
+
+
+def prepare_task_queue():
+    """Prepare a task queue on a mocked Redis, including the retry pipeline."""
+
+    def step(context):
+        context.redis = MagicMock()
+        context.claim = AsyncMock(return_value=[])
+        context.redis.register_script.return_value = context.claim
+        context.redis.zadd = AsyncMock()
+        context.redis.zrem = AsyncMock()
+        context.pipeline = MagicMock()
+        context.pipeline.execute = AsyncMock()
+        context.redis.pipeline.return_value.__aenter__.return_value = context.pipeline
+        context.task_queue = TaskQueue(redis=context.redis)
+
+    return step
+
+
+def prepare_task(name="check_payment_status", attempt=0, max_attempts=5):
+    """Prepare a serialized task as stored in the sorted set."""
+
+    def step(context):
+        context.task = {"id": "t1", "name": name, "kwargs": {"payment_id": 1}, "attempt": attempt}
+        context.task["max_attempts"] = max_attempts
+        context.member = orjson.dumps(context.task)
+
+    return step
+
+
+def prepare_handler(side_effect=None):
+    """Prepare the registered handler for the task."""
+
+    def step(context):
+        context.handler = AsyncMock(side_effect=side_effect)
+        context.handlers = {"check_payment_status": context.handler}
+
+    return step
+
+
+@pytest.mark.asyncio
+class TestTaskQueue:
+    async def test_enqueue_schedules_the_task_after_its_delay(self):
+        """Test enqueue stores the task in the sorted set scored by when it becomes due."""
+        with given([prepare_task_queue()]) as context:
+            with when("enqueuing a deferred task"):
+                task_id = await context.task_queue.enqueue("check_payment_status", defer_by=30, payment_id=1)
+
+            with then("the task should be due 30 seconds from now"):
+                ((member, score),) = context.redis.zadd.await_args.args[1].items()
+                task = orjson.loads(member)
+                assert_that(task, has_entries(id=task_id, name="check_payment_status", attempt=0))
+                assert_that(task["kwargs"], equal_to({"payment_id": 1}))
+                assert_that(score, close_to(time.time() + 30, 1))
+
+    async def test_successful_task_is_removed(self):
+        """Test a task whose handler succeeds is run with its kwargs and removed."""
+        with given([prepare_task_queue(), prepare_task(), prepare_handler()]) as context:
+            with when("executing the task"):
+                await context.task_queue._execute(context.member, context.handlers)
+
+            with then("the handler should run and the task be removed"):
+                context.handler.assert_awaited_once_with(payment_id=1)
+                context.redis.zrem.assert_awaited_once_with(context.task_queue.key, context.member)
+
+    async def test_failed_task_is_rescheduled_with_backoff(self):
+        """Test a failing task is swapped for a copy with one more attempt, due after the backoff."""
+        with given([prepare_task_queue(), prepare_task(), prepare_handler(RuntimeError("still pending"))]) as context:
+            with when("the handler fails"):
+                await context.task_queue._execute(context.member, context.handlers)
+
+            with then("the task should be rescheduled once, after the base delay"):
+                context.pipeline.zrem.assert_called_once_with(context.task_queue.key, context.member)
+                ((member, score),) = context.pipeline.zadd.call_args.args[1].items()
+                assert_that(orjson.loads(member)["attempt"], equal_to(1))
+                assert_that(score, close_to(time.time() + RETRY_BASE_DELAY_SECONDS, 1))
+
+    async def test_task_out_of_attempts_is_dropped(self):
+        """Test a task that fails its last attempt is removed rather than rescheduled."""
+        with given(
+            [prepare_task_queue(), prepare_task(attempt=4), prepare_handler(RuntimeError("still pending"))]
+        ) as context:
+            with when("the last attempt fails"):
+                await context.task_queue._execute(context.member, context.handlers)
+
+            with then("the task should be removed and not rescheduled"):
+                context.redis.zrem.assert_awaited_once_with(context.task_queue.key, context.member)
+                assert_that(context.pipeline.zadd.call_count, equal_to(0))
+
+    async def test_redis_error_settling_one_task_does_not_stop_the_worker(self):
+        """Test a Redis failure while settling a task leaves the other tasks and the worker running."""
+        with given([prepare_task_queue(), prepare_task(), prepare_handler()]) as context:
+            other = orjson.dumps({**context.task, "id": "t2"})
+            context.claim.side_effect = [
+                [context.member, other],
+                RedisError("connection reset"),
+                asyncio.CancelledError,
+            ]
+            context.redis.zrem.side_effect = [RedisError("connection reset"), None]
+
+            with pytest.raises(asyncio.CancelledError):
+                with when("the worker runs until it is cancelled"):
+                    await context.task_queue.run_worker(context.handlers, poll_interval=0)
+
+            with then("both tasks should have run and the worker kept claiming"):
+                assert_that(context.handler.await_count, equal_to(2))
+                assert_that(context.claim.await_count, equal_to(3))
@@ -0,0 +1,38 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from hamcrest import assert_that, equal_to, is_not, has_key
+
+from app.api.shared.middleware.websocket import WebSocketConnectionManager
+from app.tests.givenpy import given, then, when
+
+
+def prepare_connections():
+    """Prepare a group with one healthy client and one whose socket errors on send."""
+
+    def step(context):
+        context.manager = WebSocketConnectionManager()
+        context.healthy = AsyncMock()
+        context.broken = AsyncMock()
+        context.broken.send_text.side_effect = RuntimeError("Cannot call send once a close message has been sent")
+        context.manager.active_connections["jobs"] = {
+            "broken": context.broken,
+            "healthy": context.healthy,
+        }
+
+    return step
+
+
+@pytest.mark.asyncio
+class TestWebSocketConnectionManager:
+    async def test_broadcast_survives_a_failing_client(self):
+        """Test one client's send error neither cancels the others nor keeps its connection."""
+        with given([prepare_connections()]) as context:
+            with when("broadcasting to the group"):
+                await context.manager.broadcast({"event": "job_updated"}, group="jobs")
+
+            with then("the healthy client should still receive the frame"):
+                assert_that(context.healthy.send_text.await_count, equal_to(1))
+
+            with then("the failing client should be dropped from the group"):
+                assert_that(context.manager.active_connections["jobs"], is_not(has_key("broken")))
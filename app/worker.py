@@ -0,0 +1,30 @@
+"""Background task worker, run separately from the API: ``python -m app.worker``."""
+
+import asyncio
+import logging
+
+from app.api.notifications.firebase import FirebaseHandler
+from app.api.notifications.tasks import TASKS as NOTIFICATION_TASKS
+from app.api.payments.mpesa import MPESAClient
+from app.api.payments.tasks import TASKS as PAYMENT_TASKS
+from app.api.shared.utils.task_queue import get_task_queue
+
+TASKS = {**NOTIFICATION_TASKS, **PAYMENT_TASKS}
+
+
+async def run() -> None:
+    try:
+        await get_task_queue().run_worker(TASKS)
+    finally:
+        # Tasks share the FCM and M-PESA HTTP clients; close them as the API lifespan does
+        await FirebaseHandler.aclose()
+        await MPESAClient.aclose()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()